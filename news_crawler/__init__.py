@@ -1,10 +1,11 @@
 """Real-Time Financial News Sentiment Crawler package."""
 
-from importlib import metadata
-
 
 def get_version() -> str:
     """Return the installed package version or ``0.1.0-dev`` when unavailable."""
+    # importlib.metadata is slow to import; keep it off the CLI startup path.
+    from importlib import metadata
+
     try:
         return metadata.version("news_crawler")
     except metadata.PackageNotFoundError:
@@ -1,40 +1,312 @@
-"""CLI entry point for running the news crawler."""
+"""CLI entry point for running the news crawler.
+
+Only ``argparse`` is imported up front; each command imports what it needs
+when it runs, so ``--help`` and the read-only commands (``export``,
+``query``, ``search``, ``stats``) never load aiohttp, the feed parsers or a
+sentiment model. Running without a command is the same as ``crawl``.
+"""
 
 from __future__ import annotations
 
 import argparse
-import json
+import sys
 from pathlib import Path
+from typing import TYPE_CHECKING, Sequence
 
-from .pipeline import run_pipeline
-from .settings import Settings, get_settings
+if TYPE_CHECKING:  # pragma: no cover
+    from datetime import datetime
 
+    from .settings import Settings
 
-def _build_parser() -> argparse.ArgumentParser:
-    parser = argparse.ArgumentParser(description="Run the real-time financial news sentiment crawler")
+
+def _add_database_argument(parser: argparse.ArgumentParser, default: object = None) -> None:
+    parser.add_argument(
+        "--database",
+        type=str,
+        default=default,
+        help="Optional database URL override (e.g. sqlite:///data/news.db)",
+    )
+
+
+def _add_run_arguments(parser: argparse.ArgumentParser, default: object = None) -> None:
+    # The crawl flags are accepted both before and after ``crawl``/``replay``;
+    # the subcommand copy suppresses its defaults so it never clobbers the former.
+    flag = {"action": "store_true", "default": False if default is None else default}
     parser.add_argument(
         "--output",
         type=Path,
+        default=default,
         help="Optional path to override the output JSON location",
     )
+    _add_database_argument(parser, default)
+    parser.add_argument("--quiet", help="Do not echo the new articles to stdout", **flag)
     parser.add_argument(
-        "--database",
-        type=str,
-        help="Optional database URL override (e.g. sqlite:///data/news.db)",
+        "--stats",
+        help="Print per-stage timing and throughput as JSON to stderr after the crawl",
+        **flag,
+    )
+
+
+def _add_crawl_arguments(parser: argparse.ArgumentParser, default: object = None) -> None:
+    _add_run_arguments(parser, default)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=default,
+        help="Split the feeds across this many worker processes (overrides CRAWLER_SHARD_WORKERS)",
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        default=False if default is None else default,
+        help="Keep running and poll every feed on its own interval instead of crawling once",
+    )
+
+
+def _add_filter_arguments(parser: argparse.ArgumentParser) -> None:
+    _add_database_argument(parser, argparse.SUPPRESS)
+    parser.add_argument("--since", help="Only articles published after this (e.g. 24h, 30m, 2024-01-02T00:00:00Z)")
+    parser.add_argument("--until", help="Only articles published before this (same formats as --since)")
+    parser.add_argument("--source", help="Only articles from this source")
+    parser.add_argument("--label", help="Only articles with this sentiment label (e.g. NEGATIVE)")
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m news_crawler",
+        description="Run the real-time financial news sentiment crawler",
+    )
+    _add_crawl_arguments(parser)
+
+    subcommands = parser.add_subparsers(dest="command", title="commands")
+    crawl = subcommands.add_parser("crawl", help="Fetch, score and store new articles (the default)")
+    _add_crawl_arguments(crawl, argparse.SUPPRESS)
+
+    replay = subcommands.add_parser(
+        "replay", help="Parse, score and store archived raw feeds offline (see CRAWLER_ARCHIVE_DIR)"
+    )
+    _add_run_arguments(replay, argparse.SUPPRESS)
+    replay.add_argument("--archive", type=Path, help="Archive directory (overrides CRAWLER_ARCHIVE_DIR)")
+    replay.add_argument("--since", help="Only payloads fetched after this (e.g. 7d, 2024-01-02T00:00:00Z)")
+    replay.add_argument("--until", help="Only payloads fetched before this (same formats as --since)")
+    replay.add_argument(
+        "--source",
+        action="append",
+        dest="sources",
+        help="Only payloads from this feed (repeatable)",
+    )
+
+    export = subcommands.add_parser("export", help="Rewrite the JSON export from stored articles without crawling")
+    _add_filter_arguments(export)
+    export.add_argument("--ticker", help="Only articles tagged with this ticker (e.g. AAPL)")
+    export.add_argument(
+        "--output",
+        type=Path,
+        default=argparse.SUPPRESS,
+        help="Write here instead of CRAWLER_OUTPUT_PATH (.ndjson/.jsonl for newline-delimited JSON)",
+    )
+
+    query = subcommands.add_parser("query", help="Print stored articles as NDJSON, newest first")
+    _add_filter_arguments(query)
+    query.add_argument("--ticker", help="Only articles tagged with this ticker (e.g. AAPL)")
+    query.add_argument("--limit", type=int, default=100, help="Maximum number of articles (default: 100)")
+    query.add_argument(
+        "--all",
+        action="store_true",
+        help="Stream every match page by page instead of stopping at --limit",
+    )
+
+    search = subcommands.add_parser("search", help="Full-text search headlines and summaries, best match first")
+    search.add_argument("text", help="Words that must all appear in the title or summary (e.g. \"rate hike\")")
+    _add_filter_arguments(search)
+    search.add_argument("--limit", type=int, default=50, help="Maximum number of articles (default: 50)")
+    search.add_argument(
+        "--raw",
+        action="store_true",
+        help="Treat TEXT as an FTS5 query (phrases, OR, NOT, prefix*) instead of plain words",
+    )
+
+    stats = subcommands.add_parser("stats", help="Print stored per-source sentiment buckets as NDJSON, oldest first")
+    _add_database_argument(stats, argparse.SUPPRESS)
+    stats.add_argument("--since", default="24h", help="Only buckets starting after this (default: 24h)")
+    stats.add_argument("--source", help="Only buckets for this source")
+    stats.add_argument("--resolution", choices=("minute", "hour"), default="hour", help="Bucket width (default: hour)")
+
+    compact = subcommands.add_parser(
+        "compact", help="Roll old articles into monthly partitions, drop expired partitions and VACUUM"
+    )
+    _add_database_argument(compact, argparse.SUPPRESS)
+    compact.add_argument(
+        "--hot-days",
+        type=float,
+        help="Keep this many days in the live database (overrides CRAWLER_RETENTION_HOT_DAYS)",
+    )
+    compact.add_argument(
+        "--keep-months",
+        type=int,
+        help="Delete partitions older than this many whole months (overrides CRAWLER_RETENTION_MONTHS)",
     )
+    compact.add_argument("--no-vacuum", action="store_true", help="Only roll and drop partitions")
     return parser
 
 
-def main() -> None:
-    parser = _build_parser()
-    args = parser.parse_args()
-    settings = get_settings()
-    if args.output:
-        settings = Settings(**{**settings.model_dump(), "output_path": args.output})
-    if args.database:
-        settings = Settings(**{**settings.model_dump(), "database_url": args.database})
+def _since_until(args: argparse.Namespace) -> tuple[datetime | None, datetime | None]:
+    from .query import parse_since
+
+    since = parse_since(args.since) if args.since else None
+    until = parse_since(args.until) if getattr(args, "until", None) else None
+    return since, until
+
+
+def _run_crawl(args: argparse.Namespace, settings: Settings) -> None:
+    import asyncio
+    import json
+    import logging
+
+    if args.daemon:
+        from .daemon import run_daemon
+
+        logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+        asyncio.run(run_daemon(settings))
+        return
+
+    from .exporter import stream_json
+    from .metrics import get_metrics
+    from .pipeline import run_pipeline
+
     records = run_pipeline(settings)
-    print(json.dumps([record.model_dump(mode="json") for record in records], indent=2))
+    if not args.quiet:
+        stream_json(sys.stdout, (record.model_dump(mode="json") for record in records))
+    if args.stats:
+        json.dump(get_metrics().summary(), sys.stderr, indent=2)
+        sys.stderr.write("\n")
+
+
+def _run_replay(args: argparse.Namespace, settings: Settings) -> None:
+    import json
+
+    from .exporter import stream_json
+    from .metrics import get_metrics
+    from .pipeline import run_replay
+
+    since, until = _since_until(args)
+    records = run_replay(settings, since=since, until=until, sources=args.sources)
+    if not args.quiet:
+        stream_json(sys.stdout, (record.model_dump(mode="json") for record in records))
+    if args.stats:
+        json.dump(get_metrics().summary(), sys.stderr, indent=2)
+        sys.stderr.write("\n")
+
+
+def _run_export(args: argparse.Namespace, settings: Settings) -> None:
+    from datetime import datetime, timedelta, timezone
+
+    from .database import init_db
+    from .exporter import write_json
+    from .query import iter_articles
+
+    since, until = _since_until(args)
+    if since is None and settings.export_window_hours is not None:
+        since = datetime.now(timezone.utc) - timedelta(hours=settings.export_window_hours)
+    with init_db(settings.database_url) as session:
+        items = iter_articles(
+            session, since=since, until=until, source=args.source, label=args.label, ticker=args.ticker
+        )
+        write_json(getattr(args, "output", settings.output_path), items)
+
+
+def _run_query(args: argparse.Namespace, settings: Settings) -> None:
+    from .database import init_db
+    from .exporter import stream_json
+    from .query import iter_articles, recent_articles
+
+    since, until = _since_until(args)
+    with init_db(settings.database_url) as session:
+        if args.all:
+            items = iter_articles(
+                session, since=since, until=until, source=args.source, label=args.label, ticker=args.ticker
+            )
+        else:
+            items = recent_articles(
+                session,
+                since=since,
+                until=until,
+                source=args.source,
+                label=args.label,
+                limit=args.limit,
+                ticker=args.ticker,
+            )
+        stream_json(sys.stdout, (item.to_json() for item in items), ndjson=True)
+
+
+def _run_search(args: argparse.Namespace, settings: Settings) -> None:
+    from .database import init_db
+    from .exporter import stream_json
+    from .query import search_articles
+
+    since, until = _since_until(args)
+    with init_db(settings.database_url) as session:
+        items = search_articles(
+            session,
+            args.text,
+            since=since,
+            until=until,
+            source=args.source,
+            label=args.label,
+            limit=args.limit,
+            raw=args.raw,
+        )
+        stream_json(sys.stdout, (item.to_json() for item in items), ndjson=True)
+
+
+def _run_stats(args: argparse.Namespace, settings: Settings) -> None:
+    from .database import init_db
+    from .exporter import stream_json
+    from .query import sentiment_aggregates
+
+    since, _ = _since_until(args)
+    with init_db(settings.database_url) as session:
+        rows = sentiment_aggregates(session, resolution=args.resolution, since=since, source=args.source)
+    stream_json(sys.stdout, (row.model_dump(mode="json") for row in rows), ndjson=True)
+
+
+def _run_compact(args: argparse.Namespace, settings: Settings) -> None:
+    import json
+
+    from .retention import run_retention
+
+    summary = run_retention(settings, hot_days=args.hot_days, keep_months=args.keep_months, vacuum=not args.no_vacuum)
+    json.dump(summary, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+
+
+_COMMANDS = {
+    "crawl": _run_crawl,
+    "replay": _run_replay,
+    "export": _run_export,
+    "query": _run_query,
+    "search": _run_search,
+    "stats": _run_stats,
+    "compact": _run_compact,
+}
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    args = _build_parser().parse_args(argv)
+
+    from .settings import Settings, get_settings
+
+    settings = get_settings()
+    overrides = {
+        "database_url": getattr(args, "database", None),
+        "shard_workers": getattr(args, "workers", None),
+        "output_path": getattr(args, "output", None) if args.command in (None, "crawl", "replay") else None,
+        "archive_dir": getattr(args, "archive", None),
+    }
+    overrides = {key: value for key, value in overrides.items() if value}
+    if overrides:
+        settings = Settings(**{**settings.model_dump(), **overrides})
+    _COMMANDS[args.command or "crawl"](args, settings)
 
 
 if __name__ == "__main__":  # pragma: no cover
@@ -0,0 +1,181 @@
+"""Append-only archive of raw feed responses.
+
+Every changed feed body is compressed as its own gzip member (or zstd
+frame) and appended to the current segment file; a sidecar ``.idx`` file
+gets one JSON line per payload with its feed, fetch time, offset and
+length. Segments rotate once they reach ``archive_segment_mb`` and are
+named after the writing process, so sharded workers never share a file.
+Because members/frames concatenate, a whole segment also decompresses with
+``zcat``/``zstdcat``. :meth:`FeedArchive.entries` and :meth:`FeedArchive.read`
+serve the replay path.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import threading
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Collection, Iterator
+
+from .dates import to_utc
+from .schemas import FeedConfig
+from .settings import Settings
+
+
+_SUFFIXES = {"gzip": ".seg.gz", "zstd": ".seg.zst"}
+_INDEX_SUFFIX = ".idx"
+
+
+@dataclass(slots=True)
+class ArchiveEntry:
+    """Location of one archived payload."""
+
+    source: str
+    url: str
+    fetched_at: datetime
+    segment: str
+    offset: int
+    length: int
+    size: int
+    status: int | None = None
+
+    def to_json(self) -> dict[str, object]:
+        return {**asdict(self), "fetched_at": self.fetched_at.isoformat()}
+
+    @classmethod
+    def from_json(cls, data: dict[str, object]) -> "ArchiveEntry":
+        return cls(**{**data, "fetched_at": to_utc(datetime.fromisoformat(str(data["fetched_at"])))})
+
+
+def _compress(compression: str, payload: bytes) -> bytes:
+    if compression == "zstd":
+        import zstandard  # optional dependency, only needed for zstd archives
+
+        return zstandard.ZstdCompressor().compress(payload)
+    # mtime=0 keeps identical payloads byte-identical on disk.
+    return gzip.compress(payload, mtime=0)
+
+
+def _decompress(segment: str, data: bytes) -> bytes:
+    if segment.endswith(_SUFFIXES["zstd"]):
+        import zstandard
+
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+class FeedArchive:
+    """Writer and reader for the segment files under ``directory``.
+
+    :meth:`append` is thread-safe, so fetchers can hand it off the event loop.
+    """
+
+    def __init__(self, directory: Path, compression: str = "gzip", segment_bytes: int = 64 * 1024 * 1024) -> None:
+        if compression not in _SUFFIXES:
+            raise ValueError(f"Unknown archive compression {compression!r}; expected one of {sorted(_SUFFIXES)}")
+        self.directory = directory
+        self.compression = compression
+        self.segment_bytes = segment_bytes
+        self._segment: Path | None = None
+        self._sequence = 0
+        self._lock = threading.Lock()
+
+    def _current_segment(self) -> Path:
+        if self._segment is None or self._segment.stat().st_size >= self.segment_bytes:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._sequence += 1
+            stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+            name = f"{stamp}-{os.getpid()}-{self._sequence:04d}{_SUFFIXES[self.compression]}"
+            self._segment = self.directory / name
+            self._segment.touch()
+        return self._segment
+
+    def append(
+        self,
+        feed: FeedConfig,
+        payload: bytes,
+        status: int | None = None,
+        fetched_at: datetime | None = None,
+    ) -> ArchiveEntry:
+        """Compress ``payload`` onto the current segment and index it."""
+
+        data = _compress(self.compression, payload)
+        with self._lock:
+            return self._write(feed, data, len(payload), status, fetched_at)
+
+    def _write(
+        self, feed: FeedConfig, data: bytes, size: int, status: int | None, fetched_at: datetime | None
+    ) -> ArchiveEntry:
+        segment = self._current_segment()
+        with segment.open("ab") as handle:
+            offset = handle.tell()
+            handle.write(data)
+        entry = ArchiveEntry(
+            source=feed.name,
+            url=feed.url,
+            fetched_at=to_utc(fetched_at) if fetched_at is not None else datetime.now(timezone.utc),
+            segment=segment.name,
+            offset=offset,
+            length=len(data),
+            size=size,
+            status=status,
+        )
+        # The index line is written after the payload, so a crash never indexes a torn write.
+        with segment.with_suffix(_INDEX_SUFFIX).open("a", encoding="utf-8") as index:
+            index.write(json.dumps(entry.to_json(), separators=(",", ":")) + "\n")
+        return entry
+
+    def _index_lines(self) -> Iterator[ArchiveEntry]:
+        for path in sorted(self.directory.glob(f"*{_INDEX_SUFFIX}")):
+            with path.open(encoding="utf-8") as index:
+                for line in index:
+                    if line.strip():
+                        yield ArchiveEntry.from_json(json.loads(line))
+
+    def entries(
+        self,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        sources: Collection[str] | None = None,
+    ) -> list[ArchiveEntry]:
+        """Return indexed payloads in fetch order, optionally filtered by time and feed name."""
+
+        if not self.directory.is_dir():
+            return []
+        since = to_utc(since) if since is not None else None
+        until = to_utc(until) if until is not None else None
+        selected = [
+            entry
+            for entry in self._index_lines()
+            if (since is None or entry.fetched_at >= since)
+            and (until is None or entry.fetched_at < until)
+            and (not sources or entry.source in sources)
+        ]
+        return sorted(selected, key=lambda entry: (entry.fetched_at, entry.segment, entry.offset))
+
+    def read(self, entry: ArchiveEntry) -> bytes:
+        """Return the raw payload stored for ``entry``."""
+
+        with (self.directory / entry.segment).open("rb") as handle:
+            handle.seek(entry.offset)
+            return _decompress(entry.segment, handle.read(entry.length))
+
+
+@lru_cache
+def get_archive(directory: Path, compression: str, segment_bytes: int) -> FeedArchive:
+    """Share one writer per archive directory so a process keeps appending to one segment."""
+
+    return FeedArchive(directory, compression, segment_bytes)
+
+
+def open_archive(settings: Settings) -> FeedArchive | None:
+    """Return the archive configured by ``settings``, or ``None`` when archiving is off."""
+
+    if settings.archive_dir is None:
+        return None
+    return get_archive(settings.archive_dir, settings.archive_compression, settings.archive_segment_mb * 1024 * 1024)
@@ -0,0 +1,306 @@
+"""Offline benchmark harness for the crawl hot path.
+
+Generates deterministic synthetic RSS/Atom feeds (optionally with
+malformed items), serves them from a local aiohttp server and times each
+stage at several sizes::
+
+    python -m news_crawler.bench --sizes 1000 10000 100000 --output bench.json
+
+Sentiment uses the deterministic ``stub`` backend unless ``--backend``
+selects a real local model. Results are written as JSON so runs on
+different commits can be compared.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from pathlib import Path
+from typing import Callable, Iterable
+from xml.sax.saxutils import escape
+
+from aiohttp import web
+
+from .database import get_engine, init_db, upsert_articles
+from .exporter import write_json
+from .fetcher import _parse_rss, fetch_feeds
+from .pipeline import _deduplicate
+from .schemas import FeedConfig, NewsItem
+from .sentiment import annotate_sentiment
+from .settings import Settings
+
+
+_SUBJECTS = ("Fed", "ECB", "Apple", "Tesla", "Oil", "Gold", "Treasury yields", "Nvidia", "Bitcoin", "The dollar")
+_VERBS = ("rallies", "slumps", "holds steady", "jumps", "slides", "surges", "edges lower", "rebounds")
+_CONTEXTS = (
+    "after jobs report",
+    "as inflation cools",
+    "on earnings beat",
+    "ahead of rate decision",
+    "amid trade tensions",
+    "on record demand",
+    "as investors weigh outlook",
+)
+
+BENCHMARKS = ("parse", "fetch", "dedup", "sentiment", "upsert", "export")
+
+
+def synthetic_items(
+    count: int, seed: int = 0, duplicate_ratio: float = 0.1, malformed_ratio: float = 0.0
+) -> list[dict[str, str]]:
+    """Return ``count`` deterministic feed entries as plain field dictionaries.
+
+    ``duplicate_ratio`` of the entries reuse an earlier link; ``malformed_ratio``
+    get an unparseable date, an empty link or an unescaped ampersand.
+    """
+
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    items: list[dict[str, str]] = []
+    for index in range(count):
+        if items and rng.random() < duplicate_ratio:
+            items.append(dict(rng.choice(items)))
+            continue
+        title = f"{rng.choice(_SUBJECTS)} {rng.choice(_VERBS)} {rng.choice(_CONTEXTS)} #{index}"
+        item = {
+            "title": escape(title),
+            "link": f"https://bench.example.com/news/{seed}/{index}",
+            "summary": escape(f"Synthetic summary {index} " + " ".join(rng.choice(_CONTEXTS) for _ in range(3))),
+            "published": format_datetime(start + timedelta(seconds=index)),
+            "updated": (start + timedelta(seconds=index)).isoformat(),
+        }
+        if rng.random() < malformed_ratio:
+            damage = rng.randrange(3)
+            if damage == 0:
+                item["published"] = item["updated"] = "not a date"
+            elif damage == 1:
+                item["link"] = ""
+            else:
+                item["title"] = f"{title} & friends"
+        items.append(item)
+    return items
+
+
+def synthetic_feed(items: Iterable[dict[str, str]], fmt: str = "rss") -> bytes:
+    """Render entries from :func:`synthetic_items` as an RSS 2.0 or Atom document."""
+
+    parts: list[str] = []
+    if fmt == "atom":
+        parts.append('<?xml version="1.0" encoding="utf-8"?><feed xmlns="http://www.w3.org/2005/Atom"><title>Bench</title>')
+        for item in items:
+            parts.append(
+                f'<entry><title>{item["title"]}</title><link href="{item["link"]}"/>'
+                f'<summary>{item["summary"]}</summary><updated>{item["updated"]}</updated></entry>'
+            )
+        parts.append("</feed>")
+    else:
+        parts.append('<?xml version="1.0" encoding="utf-8"?><rss version="2.0"><channel><title>Bench</title>')
+        for item in items:
+            parts.append(
+                f'<item><title>{item["title"]}</title><link>{item["link"]}</link>'
+                f'<description>{item["summary"]}</description><pubDate>{item["published"]}</pubDate></item>'
+            )
+        parts.append("</channel></rss>")
+    return "".join(parts).encode("utf-8")
+
+
+def _split(items: list[dict[str, str]], parts: int) -> list[list[dict[str, str]]]:
+    size = -(-len(items) // parts)
+    return [items[start : start + size] for start in range(0, len(items), size)] or [[]]
+
+
+async def _serve(payloads: list[bytes]) -> tuple[web.AppRunner, str]:
+    async def _handle(request: web.Request) -> web.Response:
+        return web.Response(body=payloads[int(request.match_info["index"])], content_type="application/rss+xml")
+
+    app = web.Application()
+    app.router.add_get("/feed/{index}.xml", _handle)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    host, port = runner.addresses[0][:2]
+    return runner, f"http://{host}:{port}"
+
+
+def _upsert(database_url: str, items: list[NewsItem]) -> None:
+    with init_db(database_url) as session:
+        upsert_articles(session, items)
+
+
+async def _fetch_all(settings: Settings, payloads: list[bytes]) -> list[NewsItem]:
+    runner, base_url = await _serve(payloads)
+    feeds = [FeedConfig(name=f"Bench{index}", url=f"{base_url}/feed/{index}.xml") for index in range(len(payloads))]
+    fetch_settings = settings.model_copy(update={"feeds": feeds})
+    try:
+        return await fetch_feeds(fetch_settings)
+    finally:
+        await runner.cleanup()
+
+
+def _time(repeat: int, run: Callable[[], object], setup: Callable[[], object] | None = None) -> list[float]:
+    timings: list[float] = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        started = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def _result(benchmark: str, size: int, timings: list[float], items: int, **extra: object) -> dict[str, object]:
+    median = statistics.median(timings)
+    return {
+        "benchmark": benchmark,
+        "size": size,
+        "items": items,
+        "runs": len(timings),
+        "seconds": [round(value, 6) for value in timings],
+        "min_seconds": round(min(timings), 6),
+        "median_seconds": round(median, 6),
+        "items_per_second": round(items / median, 1) if median else None,
+        **extra,
+    }
+
+
+def run_benchmarks(
+    sizes: Iterable[int],
+    repeat: int = 3,
+    feeds: int = 4,
+    fmt: str = "rss",
+    malformed_ratio: float = 0.0,
+    duplicate_ratio: float = 0.1,
+    backend: str = "stub",
+    only: Iterable[str] = BENCHMARKS,
+    seed: int = 0,
+) -> list[dict[str, object]]:
+    """Time every selected stage at each size and return one result per pair."""
+
+    only = set(only)
+    results: list[dict[str, object]] = []
+    with tempfile.TemporaryDirectory(prefix="news-crawler-bench-") as workdir:
+        base = Settings(
+            sentiment_backend=backend,
+            sentiment_cache_size=0,
+            sentiment_cache_persistent=False,
+            seen_links_capacity=0,
+            database_url=f"sqlite:///{Path(workdir) / 'bench.db'}",
+            output_path=Path(workdir) / "latest.json",
+        )
+        for size in sizes:
+            entries = synthetic_items(size, seed=seed, duplicate_ratio=duplicate_ratio, malformed_ratio=malformed_ratio)
+            payload = synthetic_feed(entries, fmt)
+            items = _parse_rss(payload, "Bench")
+            extra = {"format": fmt, "malformed_ratio": malformed_ratio, "duplicate_ratio": duplicate_ratio}
+
+            if "parse" in only:
+                timings = _time(repeat, lambda: _parse_rss(payload, "Bench"))
+                results.append(_result("parse", size, timings, len(items), bytes=len(payload), **extra))
+            if "fetch" in only:
+                payloads = [synthetic_feed(part, fmt) for part in _split(entries, feeds)]
+                timings = _time(repeat, lambda: asyncio.run(_fetch_all(base, payloads)))
+                results.append(
+                    _result("fetch", size, timings, len(items), feeds=len(payloads), bytes=sum(map(len, payloads)), **extra)
+                )
+            unique = _deduplicate(items)
+            if "dedup" in only:
+                timings = _time(repeat, lambda: _deduplicate(items))
+                results.append(_result("dedup", size, timings, len(items), unique=len(unique), **extra))
+            if "sentiment" in only:
+                timings = _time(repeat, lambda: annotate_sentiment(base, unique))
+                results.append(_result("sentiment", size, timings, len(unique), backend=backend, **extra))
+            else:
+                annotate_sentiment(base.model_copy(update={"sentiment_backend": "stub"}), unique)
+            if "upsert" in only:
+                # Every run inserts into a fresh database whose schema exists before timing starts.
+                databases = iter(f"sqlite:///{Path(workdir) / f'upsert-{size}-{run}.db'}" for run in range(repeat))
+                current: list[str] = []
+
+                def _fresh_database() -> None:
+                    current.append(next(databases))
+                    get_engine(current[-1])
+
+                timings = _time(repeat, lambda: _upsert(current[-1], unique), setup=_fresh_database)
+                results.append(_result("upsert", size, timings, len(unique), **extra))
+            if "export" in only:
+                timings = _time(repeat, lambda: write_json(base.output_path, unique))
+                results.append(
+                    _result("export", size, timings, len(unique), bytes=base.output_path.stat().st_size, **extra)
+                )
+    return results
+
+
+def _git_revision() -> str | None:
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True, cwd=Path(__file__).parent
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return completed.stdout.strip() or None
+
+
+def environment() -> dict[str, object]:
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "git_revision": _git_revision(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+    }
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Benchmark the crawler stages on synthetic feeds")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000], help="Item counts")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per benchmark (default: 3)")
+    parser.add_argument("--feeds", type=int, default=4, help="Feeds the fetch benchmark splits items across")
+    parser.add_argument("--format", choices=("rss", "atom"), default="rss", help="Synthetic feed format")
+    parser.add_argument("--malformed", type=float, default=0.0, help="Fraction of damaged items (0-1)")
+    parser.add_argument("--duplicates", type=float, default=0.1, help="Fraction of repeated links (0-1)")
+    parser.add_argument(
+        "--backend",
+        choices=("stub", "torch", "onnx"),
+        default="stub",
+        help="Sentiment backend; torch/onnx use the locally configured model",
+    )
+    parser.add_argument("--only", nargs="+", choices=BENCHMARKS, default=list(BENCHMARKS), help="Stages to run")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the synthetic data")
+    parser.add_argument("--output", type=Path, help="Write results JSON here instead of stdout")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = _build_parser().parse_args(argv)
+    results = run_benchmarks(
+        args.sizes,
+        repeat=args.repeat,
+        feeds=args.feeds,
+        fmt=args.format,
+        malformed_ratio=args.malformed,
+        duplicate_ratio=args.duplicates,
+        backend=args.backend,
+        only=args.only,
+        seed=args.seed,
+    )
+    report = json.dumps({"environment": environment(), "results": results}, indent=2)
+    if args.output is None:
+        print(report)
+        return
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(report + "\n", encoding="utf-8")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
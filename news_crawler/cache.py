@@ -0,0 +1,65 @@
+"""Small in-process caches used on the crawler's hot path."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Generic, Hashable, Iterable, TypeVar
+
+from .dedup import canonicalize_url
+
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class LRUCache(Generic[K, V]):
+    """Mapping that evicts the least recently used entry beyond ``capacity``."""
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self._data: OrderedDict[K, V] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data
+
+    def get(self, key: K, default: V | None = None) -> V | None:
+        try:
+            self._data.move_to_end(key)
+        except KeyError:
+            return default
+        return self._data[key]
+
+    def put(self, key: K, value: V) -> None:
+        if self.capacity <= 0:
+            return
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.capacity:
+            self._data.popitem(last=False)
+
+
+class SeenLinks(LRUCache[str, None]):
+    """Bounded index of article links already persisted.
+
+    Links are kept in canonical form, so a stored article is recognized again
+    when its feed adds tracking parameters or a trailing slash.
+    """
+
+    def __contains__(self, link: object) -> bool:
+        if not isinstance(link, str):
+            return False
+        key = canonicalize_url(link)
+        if key in self._data:
+            self._data.move_to_end(key)
+            return True
+        return False
+
+    def add(self, link: str) -> None:
+        self.put(canonicalize_url(link), None)
+
+    def update(self, links: Iterable[str]) -> None:
+        for link in links:
+            self.put(canonicalize_url(link), None)
@@ -0,0 +1,190 @@
+"""Long-running crawler that polls every feed on its own schedule."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import signal
+import time
+from typing import Iterable
+
+import aiohttp
+
+from .archive import open_archive
+from .cache import SeenLinks
+from .database import get_async_engine, load_feed_states, run_in_session
+from .dedup import NearDuplicateIndex
+from .feeds import load_feeds
+from .fetcher import FeedResult, FetchLimiter, create_session, fetch_feed
+from .pipeline import (
+    _deduplicate,
+    _persist,
+    _score_articles,
+    export_aggregates,
+    export_articles,
+    load_clusters,
+    load_seen_links,
+    sentiment_executor,
+)
+from .metrics import get_metrics, serve_metrics
+from .schemas import FeedConfig, FeedValidators, NewsItem
+from .sentiment import load_sentiment_backend
+from .settings import Settings
+
+
+logger = logging.getLogger(__name__)
+
+
+def _next_delay(settings: Settings, failures: int, interval: float | None = None) -> float:
+    """Return the sleep before the next poll, with backoff after ``failures``."""
+
+    interval = interval or settings.poll_interval_seconds
+    if failures:
+        delay = min(interval * 2**failures, settings.poll_max_backoff_seconds)
+    else:
+        delay = interval
+    return delay + random.uniform(0, settings.poll_jitter_seconds)
+
+
+class CrawlerDaemon:
+    """Keep the HTTP session, model and engine alive across poll cycles."""
+
+    def __init__(self, settings: Settings) -> None:
+        self.settings = settings
+        self._stop = asyncio.Event()
+        self._executor = sentiment_executor()
+        self._latest: dict[str, list[NewsItem]] = {}
+        self._feed_states: dict[str, FeedValidators] = {}
+        self._seen = SeenLinks(0)
+        self._metrics = get_metrics()
+        self._archive = open_archive(settings)
+        self._clusters = NearDuplicateIndex(settings.dedup_window_hours * 3600, settings.dedup_max_distance)
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    async def run(self, feeds: Iterable[FeedConfig] | None = None) -> None:
+        try:
+            await self._run(feeds)
+        finally:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            await get_async_engine(self.settings.database_url).dispose()
+
+    async def _run(self, feeds: Iterable[FeedConfig] | None) -> None:
+        feeds = list(feeds if feeds is not None else load_feeds(self.settings))
+        limiter = FetchLimiter.from_settings(self.settings)
+        self._feed_states = await run_in_session(self.settings.database_url, load_feed_states)
+        self._seen = load_seen_links(self.settings)
+        self._clusters = load_clusters(self.settings)
+        # Load the model up front so the first headline does not pay for it.
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, load_sentiment_backend, self.settings)
+        metrics_server = None
+        if self.settings.metrics_port is not None:
+            metrics_server = await serve_metrics(self.settings.metrics_host, self.settings.metrics_port, self._metrics)
+            logger.info("Serving metrics on http://%s:%d/metrics", self.settings.metrics_host, self.settings.metrics_port)
+        try:
+            await self._poll_all(feeds, limiter)
+        finally:
+            if metrics_server is not None:
+                await metrics_server.cleanup()
+
+    async def _poll_all(self, feeds: list[FeedConfig], limiter: FetchLimiter) -> None:
+        async with create_session(self.settings) as session:
+            pollers = [
+                asyncio.create_task(self._poll_feed(session, feed, limiter), name=f"poll:{feed.name}")
+                for feed in feeds
+            ]
+            if self.settings.export_window_hours is not None:
+                pollers.append(asyncio.create_task(self._refresh_window_export(), name="export-window"))
+            try:
+                # Pollers finish their current cycle and exit once the stop event is set.
+                await asyncio.gather(*pollers)
+            finally:
+                for poller in pollers:
+                    poller.cancel()
+
+    async def _poll_feed(
+        self,
+        session: aiohttp.ClientSession,
+        feed: FeedConfig,
+        limiter: FetchLimiter,
+    ) -> None:
+        failures = 0
+        while not self._stop.is_set():
+            try:
+                result = await fetch_feed(
+                    session, feed, self._feed_states.get(feed.url), limiter, self._seen, archive=self._archive
+                )
+                if result.error is not None:
+                    failures += 1
+                else:
+                    failures = 0
+                    if result.changed:
+                        await self._process(result)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # noqa: BLE001 - a poller must never die
+                failures += 1
+                logger.warning("Processing feed %s (%s) failed: %s", feed.name, feed.url, exc)
+            try:
+                await asyncio.wait_for(
+                    self._stop.wait(),
+                    timeout=_next_delay(self.settings, failures, feed.interval_seconds),
+                )
+            except asyncio.TimeoutError:
+                pass
+
+    async def _refresh_window_export(self) -> None:
+        # Articles must age out of a rolling window export even while no feed brings anything new.
+        while not self._stop.is_set():
+            try:
+                await asyncio.wait_for(self._stop.wait(), timeout=self.settings.poll_interval_seconds)
+            except asyncio.TimeoutError:
+                try:
+                    await asyncio.to_thread(export_articles, self.settings, [])
+                except Exception as exc:  # noqa: BLE001 - retried on the next tick
+                    logger.warning("Refreshing the export window failed: %s", exc)
+
+    async def _process(self, result: FeedResult) -> None:
+        records: list[NewsItem] = []
+        # Clustering runs on the loop, so polls of different feeds see one index.
+        dedup_started = time.perf_counter()
+        leaders, duplicates = self._clusters.partition(_deduplicate(result.articles))
+        self._metrics.observe_dedup(len(result.articles), len(leaders), time.perf_counter() - dedup_started)
+        if leaders:
+            # Inference runs on the single sentiment thread so polling never blocks on it.
+            records = await asyncio.get_running_loop().run_in_executor(
+                self._executor, _score_articles, self.settings, leaders
+            )
+        states = [result.validators] if result.validators is not None else []
+        inserted = await _persist(self.settings, records, duplicates, states)
+        if result.validators is not None:
+            self._feed_states[result.feed.url] = result.validators
+        self._seen.update(record.link for record in records)
+        self._seen.update(item.link for item in duplicates)
+        if not inserted:
+            return
+        new_links = set(inserted)
+        new_items = [record for record in records if record.link in new_links]
+        self._latest[result.feed.url] = new_items
+        snapshot = [item for feed_items in self._latest.values() for item in feed_items]
+        await asyncio.to_thread(export_articles, self.settings, new_items, snapshot)
+        await asyncio.to_thread(export_aggregates, self.settings)
+        logger.info(
+            "Stored %d of %d articles from feed %s", len(inserted), len(records), result.feed.name
+        )
+
+
+async def run_daemon(settings: Settings) -> None:
+    """Run the crawler until SIGINT/SIGTERM is received."""
+
+    daemon = CrawlerDaemon(settings)
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(signum, daemon.stop)
+        except (NotImplementedError, RuntimeError):  # pragma: no cover - Windows event loops
+            pass
+    await daemon.run()
@@ -2,13 +2,22 @@
 
 from __future__ import annotations
 
-from datetime import datetime
-from typing import Iterable
+import re
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Iterable, TypeVar
 
-from sqlalchemy import Column, DateTime, Float, String, create_engine
-from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column
+from sqlalchemy import DateTime, Float, ForeignKey, Index, Integer, String, create_engine, event, exists, insert, select
+from sqlalchemy.engine import Connection, Engine, make_url
+from sqlalchemy.orm import DeclarativeBase, InstrumentedAttribute, Mapped, Session, mapped_column
 
-from .schemas import ArticleRecord
+from .dates import to_utc
+from .schemas import FeedValidators, NewsItem
+
+if TYPE_CHECKING:  # pragma: no cover
+    from sqlalchemy.ext.asyncio import AsyncEngine
 
 
 class Base(DeclarativeBase):
@@ -29,31 +38,657 @@ class Article(Base):
     sentiment_label: Mapped[str] = mapped_column(String(32))
     sentiment_score: Mapped[float] = mapped_column(Float)
 
+    __table_args__ = (
+        Index("ix_articles_source_published_at", "source", "published_at"),
+        Index("ix_articles_sentiment_label_published_at", "sentiment_label", "published_at"),
+    )
 
-def init_db(database_url: str) -> Session:
-    """Create engine, ensure tables exist, and return a session."""
+
+class SentimentCacheEntry(Base):
+    """Sentiment computed for a normalized headline by a given model."""
+
+    __tablename__ = "sentiment_cache"
+
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    label: Mapped[str] = mapped_column(String(32))
+    score: Mapped[float] = mapped_column(Float)
+
+
+class ArticleTicker(Base):
+    """Instrument mentioned by a stored article; the primary key serves per-ticker lookups."""
+
+    __tablename__ = "article_tickers"
+
+    ticker: Mapped[str] = mapped_column(String(32), primary_key=True)
+    link: Mapped[str] = mapped_column(String(1024), ForeignKey("articles.link"), primary_key=True, index=True)
+
+
+class SentimentAggregate(Base):
+    """Running sentiment statistics for one source and time bucket.
+
+    Maintained incrementally as articles are inserted; ``ewma`` is the
+    exponentially weighted signed score of the source's stream after the
+    last article that landed in this bucket.
+    """
+
+    __tablename__ = "sentiment_aggregates"
+
+    source: Mapped[str] = mapped_column(String(64), primary_key=True)
+    resolution: Mapped[str] = mapped_column(String(16), primary_key=True)
+    bucket_start: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+    count: Mapped[int] = mapped_column(Integer, default=0)
+    score_sum: Mapped[float] = mapped_column(Float, default=0.0)
+    positive: Mapped[int] = mapped_column(Integer, default=0)
+    negative: Mapped[int] = mapped_column(Integer, default=0)
+    ewma: Mapped[float] = mapped_column(Float, default=0.0)
+
+    __table_args__ = (Index("ix_sentiment_aggregates_resolution_bucket", "resolution", "bucket_start"),)
+
+
+class ArticleCluster(Base):
+    """Story cluster membership for stored articles and their near-duplicates.
+
+    Near-duplicates are only recorded here, not in ``articles``, so one story
+    is scored and counted once.
+    """
+
+    __tablename__ = "article_clusters"
+
+    link: Mapped[str] = mapped_column(String(1024), primary_key=True)
+    cluster_id: Mapped[str] = mapped_column(String(1024), index=True)
+    source: Mapped[str] = mapped_column(String(64))
+    title: Mapped[str] = mapped_column(String(512))
+    published_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+
+
+class ArticleLease(Base):
+    """Claim on a link by one crawler worker, so it is scored and stored once."""
+
+    __tablename__ = "article_leases"
+
+    link: Mapped[str] = mapped_column(String(1024), primary_key=True)
+    owner: Mapped[str] = mapped_column(String(128))
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), index=True)
+
+
+class FeedState(Base):
+    """Conditional-request validators persisted per feed URL."""
+
+    __tablename__ = "feed_states"
+
+    url: Mapped[str] = mapped_column(String(512), primary_key=True)
+    etag: Mapped[str | None] = mapped_column(String(256))
+    last_modified: Mapped[str | None] = mapped_column(String(64))
+    content_hash: Mapped[str | None] = mapped_column(String(64))
+
+
+T = TypeVar("T")
+
+_SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-20000",
+    "PRAGMA busy_timeout=5000",
+)
+_ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+
+
+def _tune_sqlite(dbapi_connection, _record) -> None:
+    # WAL lets the export/query readers run while the crawler writes.
+    cursor = dbapi_connection.cursor()
+    for pragma in _SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
+
+def _prepare_sqlite(database_url: str, engine: Engine) -> None:
+    url = make_url(database_url)
+    if url.get_backend_name() != "sqlite":
+        return
+    if url.database and url.database != ":memory:":
+        Path(url.database).parent.mkdir(parents=True, exist_ok=True)
+    event.listen(engine, "connect", _tune_sqlite)
+
+
+FTS_TABLE = "articles_fts"
+
+# External-content FTS5 index over articles; triggers keep it in step with every
+# insert path, including the executemany ``ON CONFLICT DO NOTHING`` upserts.
+_FTS_DDL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    "title, summary, content='articles', content_rowid='id', tokenize='porter unicode61')",
+    f"CREATE TRIGGER IF NOT EXISTS articles_fts_insert AFTER INSERT ON articles BEGIN "
+    f"INSERT INTO {FTS_TABLE}(rowid, title, summary) VALUES (new.id, new.title, new.summary); END",
+    f"CREATE TRIGGER IF NOT EXISTS articles_fts_delete AFTER DELETE ON articles BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, summary) "
+    "VALUES ('delete', old.id, old.title, old.summary); END",
+    f"CREATE TRIGGER IF NOT EXISTS articles_fts_update AFTER UPDATE OF title, summary ON articles BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, summary) "
+    "VALUES ('delete', old.id, old.title, old.summary); "
+    f"INSERT INTO {FTS_TABLE}(rowid, title, summary) VALUES (new.id, new.title, new.summary); END",
+)
+
+
+def _ensure_fts(connection: Connection) -> None:
+    exists = connection.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (FTS_TABLE,)
+    ).first()
+    for statement in _FTS_DDL:
+        connection.exec_driver_sql(statement)
+    if exists is None:
+        # Backfill articles stored before the index existed.
+        connection.exec_driver_sql(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def _ensure_schema(connection: Connection) -> None:
+    Base.metadata.create_all(connection)
+    # create_all skips existing tables entirely, so add indexes introduced later.
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(connection, checkfirst=True)
+    if connection.dialect.name == "sqlite":
+        _ensure_fts(connection)
+
+
+@lru_cache
+def get_engine(database_url: str) -> Engine:
+    """Create the engine once per URL and ensure tables exist."""
 
     engine = create_engine(database_url, future=True)
-    Base.metadata.create_all(engine)
-    return Session(engine)
+    _prepare_sqlite(database_url, engine)
+    with engine.begin() as connection:
+        _ensure_schema(connection)
+    return engine
+
+
+def ensure_schema(database_url: str) -> Engine:
+    """Return the cached engine for ``database_url``, re-checking the schema.
+
+    For files that may have been deleted and recreated since the engine was
+    cached, such as retention partitions.
+    """
+
+    engine = get_engine(database_url)
+    with engine.begin() as connection:
+        _ensure_schema(connection)
+    return engine
+
+
+def async_database_url(database_url: str) -> str:
+    """Swap the default sync driver for its asyncio counterpart (aiosqlite/asyncpg)."""
+
+    url = make_url(database_url)
+    if url.drivername in _ASYNC_DRIVERS:
+        url = url.set(drivername=_ASYNC_DRIVERS[url.drivername])
+    return url.render_as_string(hide_password=False)
+
+
+@lru_cache
+def get_async_engine(database_url: str) -> AsyncEngine:
+    """Process-wide pooled async engine for ``database_url``.
+
+    The schema is checked once, through the sync engine. Pooled connections
+    belong to the event loop that opened them, so callers that run several
+    loops (``asyncio.run`` per crawl) dispose the pool before their loop ends.
+    """
+
+    from sqlalchemy.ext.asyncio import create_async_engine  # read-only CLI commands never need it
+
+    get_engine(database_url)
+    engine = create_async_engine(async_database_url(database_url))
+    _prepare_sqlite(database_url, engine.sync_engine)
+    return engine
+
+
+async def run_in_session(database_url: str, work: Callable[..., T], *args: object) -> T:
+    """Run a sync session helper (e.g. :func:`upsert_articles`) on the async engine."""
+
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    async with AsyncSession(get_async_engine(database_url)) as session:
+        return await session.run_sync(work, *args)
+
+
+def init_db(database_url: str) -> Session:
+    """Return a session bound to the cached engine for ``database_url``."""
+
+    return Session(get_engine(database_url))
+
+
+_PARTITION_SUFFIX = re.compile(r"-(\d{4}-\d{2})")
+
+
+@dataclass(frozen=True, slots=True)
+class Partition:
+    """Monthly SQLite file holding articles published in ``[start, end)``."""
+
+    month: str
+    path: Path
+    start: datetime
+    end: datetime
+
+    @property
+    def url(self) -> str:
+        return f"sqlite:///{self.path}"
+
+
+def sqlite_path(database_url: str) -> Path | None:
+    """Return the file behind a SQLite URL, or ``None`` for other databases and ``:memory:``."""
+
+    url = make_url(database_url)
+    if url.get_backend_name() != "sqlite" or not url.database or url.database == ":memory:":
+        return None
+    return Path(url.database)
+
+
+def month_bounds(month: str) -> tuple[datetime, datetime]:
+    """UTC start and end of a ``YYYY-MM`` month."""
+
+    start = datetime.strptime(month, "%Y-%m").replace(tzinfo=timezone.utc)
+    end = start.replace(year=start.year + 1, month=1) if start.month == 12 else start.replace(month=start.month + 1)
+    return start, end
+
 
+def partition_for(database_path: Path, month: str) -> Partition:
+    """Partition ``month`` of ``database_path``: ``data/news.db`` -> ``data/news-2024-01.db``."""
 
-def upsert_articles(session: Session, records: Iterable[ArticleRecord]) -> None:
-    """Insert new articles, skipping existing links."""
+    start, end = month_bounds(month)
+    return Partition(month, database_path.with_name(f"{database_path.stem}-{month}{database_path.suffix}"), start, end)
 
+
+def list_partitions(
+    database_url: str, since: datetime | None = None, until: datetime | None = None
+) -> list[Partition]:
+    """Monthly partitions of ``database_url`` overlapping ``[since, until)``, newest first."""
+
+    path = sqlite_path(database_url)
+    if path is None or not path.parent.is_dir():
+        return []
+    partitions = []
+    for candidate in path.parent.glob(f"{path.stem}-*{path.suffix}"):
+        match = _PARTITION_SUFFIX.fullmatch(candidate.stem[len(path.stem) :])
+        try:
+            partition = partition_for(path, match[1]) if match is not None else None
+        except ValueError:  # e.g. news-2024-13.db
+            partition = None
+        if partition is None:
+            continue
+        if (since is None or partition.end > to_utc(since)) and (until is None or partition.start < to_utc(until)):
+            partitions.append(partition)
+    return sorted(partitions, key=lambda partition: partition.start, reverse=True)
+
+
+_INSERT_CHUNK_SIZE = 500
+
+
+def _article_rows(records: Iterable[NewsItem]) -> list[dict[str, object]]:
+    rows: dict[str, dict[str, object]] = {}
+    for record in records:
+        link = str(record.link)
+        rows.setdefault(
+            link,
+            {
+                "source": record.source,
+                "title": record.title,
+                "link": link,
+                "summary": record.summary,
+                "published_at": record.published_at,
+                "sentiment_label": record.sentiment_label,
+                "sentiment_score": record.sentiment_score,
+            },
+        )
+    return list(rows.values())
+
+
+def _conflict_insert(session: Session):
+    """Return the dialect ``insert`` supporting ``ON CONFLICT``, or ``None``."""
+
+    dialect = session.get_bind().dialect.name
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    elif dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        return None
+    return dialect_insert
+
+
+def _insert_ignoring_conflicts(session: Session, rows: list[dict[str, object]]) -> list[str]:
+    dialect_insert = _conflict_insert(session)
+    if dialect_insert is None:
+        existing = set(session.scalars(select(Article.link).where(Article.link.in_([row["link"] for row in rows]))))
+        new_rows = [row for row in rows if row["link"] not in existing]
+        if new_rows:
+            session.execute(insert(Article), new_rows)
+        return [str(row["link"]) for row in new_rows]
+
+    statement = (
+        dialect_insert(Article)
+        .on_conflict_do_nothing(index_elements=[Article.link])
+        .returning(Article.link)
+    )
+    return list(session.scalars(statement, rows))
+
+
+AGGREGATE_RESOLUTIONS: dict[str, int] = {"minute": 60, "hour": 3600}
+EWMA_ALPHA = 0.2
+
+
+def signed_score(label: str | None, score: float | None) -> float:
+    """Map a label/confidence pair onto [-1, 1]: positive up, negative down."""
+
+    label = (label or "").upper()
+    if label.startswith("POS"):
+        return float(score or 0.0)
+    if label.startswith("NEG"):
+        return -float(score or 0.0)
+    return 0.0
+
+
+def bucket_start(moment: datetime, resolution: str) -> datetime:
+    seconds = AGGREGATE_RESOLUTIONS[resolution]
+    timestamp = to_utc(moment).timestamp()
+    return datetime.fromtimestamp(timestamp - timestamp % seconds, tz=timezone.utc)
+
+
+def _latest_ewma(session: Session, source: str, resolution: str) -> float | None:
+    return session.scalar(
+        select(SentimentAggregate.ewma)
+        .where(SentimentAggregate.source == source, SentimentAggregate.resolution == resolution)
+        .order_by(SentimentAggregate.bucket_start.desc())
+        .limit(1)
+    )
+
+
+def update_aggregates(session: Session, records: Iterable[NewsItem]) -> None:
+    """Fold newly inserted records into the per-source bucket aggregates.
+
+    Does not commit, so callers can keep it in the insert's transaction.
+    Undated records are bucketed by the time they were ingested.
+    """
+
+    now = datetime.now(timezone.utc)
+    ordered = sorted(records, key=lambda record: to_utc(record.published_at) if record.published_at else now)
+    buckets: dict[tuple[str, str, datetime], SentimentAggregate] = {}
+    ewma: dict[tuple[str, str], float | None] = {}
+    for record in ordered:
+        value = signed_score(record.sentiment_label, record.sentiment_score)
+        for resolution in AGGREGATE_RESOLUTIONS:
+            series = (record.source, resolution)
+            if series not in ewma:
+                # Seed before adding rows so autoflush cannot surface a fresh bucket.
+                ewma[series] = _latest_ewma(session, *series)
+            start = bucket_start(record.published_at or now, resolution)
+            key = (record.source, resolution, start)
+            aggregate = buckets.get(key)
+            if aggregate is None:
+                aggregate = session.get(SentimentAggregate, key)
+                if aggregate is None:
+                    aggregate = SentimentAggregate(
+                        source=record.source,
+                        resolution=resolution,
+                        bucket_start=start,
+                        count=0,
+                        score_sum=0.0,
+                        positive=0,
+                        negative=0,
+                        ewma=0.0,
+                    )
+                    session.add(aggregate)
+                buckets[key] = aggregate
+            previous = ewma[series]
+            ewma[series] = value if previous is None else EWMA_ALPHA * value + (1 - EWMA_ALPHA) * previous
+            aggregate.count += 1
+            aggregate.score_sum += value
+            aggregate.positive += value > 0
+            aggregate.negative += value < 0
+            aggregate.ewma = ewma[series]
+
+
+def _rolled_links(session: Session, records: list[NewsItem], column: InstrumentedAttribute[str]) -> set[str]:
+    """Links of ``records`` already moved into their month's partition (see :mod:`.retention`)."""
+
+    by_month: dict[str, list[str]] = {}
     for record in records:
-        existing = session.query(Article).filter(Article.link == str(record.link)).first()
-        if existing:
+        if record.published_at is not None:
+            by_month.setdefault(to_utc(record.published_at).strftime("%Y-%m"), []).append(record.link)
+    if not by_month:
+        return set()
+    database_url = session.get_bind().url.render_as_string(hide_password=False)
+    partitions = {partition.month: partition for partition in list_partitions(database_url)}
+    rolled: set[str] = set()
+    for month, links in by_month.items():
+        partition = partitions.get(month)
+        if partition is None:
+            continue
+        with init_db(partition.url) as part:
+            for start in range(0, len(links), _INSERT_CHUNK_SIZE):
+                chunk = links[start : start + _INSERT_CHUNK_SIZE]
+                rolled.update(part.scalars(select(column).where(column.in_(chunk))))
+    return rolled
+
+
+def upsert_articles(session: Session, records: Iterable[NewsItem]) -> list[str]:
+    """Insert new articles, skipping existing links.
+
+    Uses ``INSERT ... ON CONFLICT (link) DO NOTHING`` in chunks on SQLite and
+    PostgreSQL, and updates the sentiment aggregates for the inserted rows in
+    the same transaction. Links already rolled into the partition of their
+    month are skipped too. Returns the links that were actually inserted.
+    """
+
+    records = list(records)
+    rolled = _rolled_links(session, records, Article.link)
+    if rolled:
+        records = [record for record in records if record.link not in rolled]
+    rows = _article_rows(records)
+    inserted: list[str] = []
+    for start in range(0, len(rows), _INSERT_CHUNK_SIZE):
+        inserted.extend(_insert_ignoring_conflicts(session, rows[start : start + _INSERT_CHUNK_SIZE]))
+    if inserted:
+        new_links = set(inserted)
+        first_seen: dict[str, NewsItem] = {}
+        for record in records:
+            if record.link in new_links:
+                first_seen.setdefault(str(record.link), record)
+        update_aggregates(session, first_seen.values())
+        _insert_cluster_rows(session, [record for record in first_seen.values() if record.cluster_id])
+        ticker_rows = [
+            {"ticker": ticker, "link": link}
+            for link, record in first_seen.items()
+            for ticker in dict.fromkeys(record.tickers)
+        ]
+        for start in range(0, len(ticker_rows), _INSERT_CHUNK_SIZE):
+            session.execute(insert(ArticleTicker), ticker_rows[start : start + _INSERT_CHUNK_SIZE])
+    session.commit()
+    return inserted
+
+
+def _insert_cluster_rows(session: Session, records: Iterable[NewsItem]) -> None:
+    rows = [
+        {
+            "link": str(record.link),
+            "cluster_id": record.cluster_id,
+            "source": record.source,
+            "title": record.title,
+            "published_at": record.published_at,
+        }
+        for record in records
+    ]
+    dialect_insert = _conflict_insert(session)
+    for start in range(0, len(rows), _INSERT_CHUNK_SIZE):
+        chunk = rows[start : start + _INSERT_CHUNK_SIZE]
+        if dialect_insert is not None:
+            session.execute(dialect_insert(ArticleCluster).on_conflict_do_nothing(), chunk)
             continue
-        session.add(
-            Article(
-                source=record.source,
-                title=record.title,
-                link=str(record.link),
-                summary=record.summary,
-                published_at=record.published_at,
-                sentiment_label=record.sentiment_label,
-                sentiment_score=record.sentiment_score,
+        links = [row["link"] for row in chunk]
+        existing = set(session.scalars(select(ArticleCluster.link).where(ArticleCluster.link.in_(links))))
+        new_rows = [row for row in chunk if row["link"] not in existing]
+        if new_rows:
+            session.execute(insert(ArticleCluster), new_rows)
+
+
+def store_batch(
+    session: Session,
+    records: Iterable[NewsItem],
+    duplicates: Iterable[NewsItem] = (),
+    states: Iterable[FeedValidators] = (),
+) -> list[str]:
+    """Store scored articles, near-duplicates and feed validators; return inserted links."""
+
+    inserted = upsert_articles(session, records)
+    store_duplicates(session, duplicates)
+    states = list(states)
+    if states:
+        save_feed_states(session, states)
+    return inserted
+
+
+def store_duplicates(session: Session, records: Iterable[NewsItem]) -> None:
+    """Record near-duplicates against their cluster without storing them as articles."""
+
+    records = list(records)
+    rolled = _rolled_links(session, records, ArticleCluster.link)
+    _insert_cluster_rows(session, [record for record in records if record.link not in rolled])
+    session.commit()
+
+
+def load_recent_clusters(session: Session, since: datetime) -> list[tuple[NewsItem, str]]:
+    """Return ``(item, cluster_id)`` for articles published since ``since``.
+
+    Articles stored before clustering existed form their own cluster.
+    """
+
+    rows = session.execute(
+        select(Article.source, Article.title, Article.link, Article.published_at, ArticleCluster.cluster_id)
+        .outerjoin(ArticleCluster, ArticleCluster.link == Article.link)
+        .where(Article.published_at >= since)
+        .order_by(Article.published_at)
+    )
+    return [
+        (NewsItem(source=source, title=title, link=link, published_at=published_at), cluster_id or link)
+        for source, title, link, published_at, cluster_id in rows
+    ]
+
+
+def claim_links(session: Session, links: Iterable[str], owner: str, ttl_seconds: float) -> list[str]:
+    """Lease the links nobody has stored or claimed yet and return them.
+
+    Leases of workers that died expire after ``ttl_seconds``; links already in
+    ``articles`` are never handed out again.
+    """
+
+    now = datetime.now(timezone.utc)
+    session.execute(ArticleLease.__table__.delete().where(ArticleLease.expires_at < now))
+    links = list(dict.fromkeys(links))
+    claimed: list[str] = []
+    dialect_insert = _conflict_insert(session)
+    for start in range(0, len(links), _INSERT_CHUNK_SIZE):
+        chunk = links[start : start + _INSERT_CHUNK_SIZE]
+        stored = set(session.scalars(select(Article.link).where(Article.link.in_(chunk))))
+        rows = [
+            {"link": link, "owner": owner, "expires_at": now + timedelta(seconds=ttl_seconds)}
+            for link in chunk
+            if link not in stored
+        ]
+        if not rows:
+            continue
+        if dialect_insert is not None:
+            statement = (
+                dialect_insert(ArticleLease)
+                .on_conflict_do_nothing(index_elements=[ArticleLease.link])
+                .returning(ArticleLease.link)
             )
+            claimed.extend(session.scalars(statement, rows))
+            continue
+        leased = set(session.scalars(select(ArticleLease.link).where(ArticleLease.link.in_(chunk))))
+        new_rows = [row for row in rows if row["link"] not in leased]
+        if new_rows:
+            session.execute(insert(ArticleLease), new_rows)
+        claimed.extend(str(row["link"]) for row in new_rows)
+    session.commit()
+    return claimed
+
+
+def load_feed_states(session: Session) -> dict[str, FeedValidators]:
+    """Return stored validators keyed by feed URL."""
+
+    return {
+        state.url: FeedValidators(
+            url=state.url,
+            etag=state.etag,
+            last_modified=state.last_modified,
+            content_hash=state.content_hash,
         )
+        for state in session.query(FeedState)
+    }
+
+
+def save_feed_states(session: Session, states: Iterable[FeedValidators]) -> None:
+    """Insert or refresh validators for the given feeds."""
+
+    for state in states:
+        session.merge(
+            FeedState(
+                url=state.url,
+                etag=state.etag,
+                last_modified=state.last_modified,
+                content_hash=state.content_hash,
+            )
+        )
+    session.commit()
+
+
+def load_recent_links(session: Session, limit: int) -> list[str]:
+    """Return up to ``limit`` stored links and ``limit`` near-duplicate links, oldest first.
+
+    Near-duplicates only live in ``article_clusters``; including them keeps a
+    copy still carried by its feed from being stored once the dedup window
+    has moved past its story.
+    """
+
+    duplicates = (
+        session.query(ArticleCluster.link)
+        .where(~exists().where(Article.link == ArticleCluster.link))
+        .order_by(ArticleCluster.published_at.desc())
+        .limit(limit)
+        .all()
+    )
+    rows = session.query(Article.link).order_by(Article.id.desc()).limit(limit).all()
+    return [link for (link,) in reversed(duplicates)] + [link for (link,) in reversed(rows)]
+
+
+def load_cached_sentiments(session: Session, keys: Iterable[str]) -> dict[str, tuple[str, float]]:
+    """Return ``(label, score)`` for the cache keys that are stored."""
+
+    keys = list(keys)
+    found: dict[str, tuple[str, float]] = {}
+    for start in range(0, len(keys), _INSERT_CHUNK_SIZE):
+        chunk = keys[start : start + _INSERT_CHUNK_SIZE]
+        rows = session.execute(
+            select(SentimentCacheEntry.key, SentimentCacheEntry.label, SentimentCacheEntry.score).where(
+                SentimentCacheEntry.key.in_(chunk)
+            )
+        )
+        found.update((key, (label, score)) for key, label, score in rows)
+    return found
+
+
+def store_cached_sentiments(session: Session, entries: dict[str, tuple[str, float]]) -> None:
+    """Persist sentiment cache entries, keeping any that already exist."""
+
+    rows = [{"key": key, "label": label, "score": score} for key, (label, score) in entries.items()]
+    if not rows:
+        return
+    dialect_insert = _conflict_insert(session)
+    for start in range(0, len(rows), _INSERT_CHUNK_SIZE):
+        chunk = rows[start : start + _INSERT_CHUNK_SIZE]
+        if dialect_insert is not None:
+            session.execute(dialect_insert(SentimentCacheEntry).on_conflict_do_nothing(), chunk)
+            continue
+        existing = set(load_cached_sentiments(session, [row["key"] for row in chunk]))
+        new_rows = [row for row in chunk if row["key"] not in existing]
+        if new_rows:
+            session.execute(insert(SentimentCacheEntry), new_rows)
     session.commit()
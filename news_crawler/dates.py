@@ -0,0 +1,108 @@
+"""Publication date parsing for feed items."""
+
+from __future__ import annotations
+
+import logging
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Optional
+
+
+logger = logging.getLogger(__name__)
+
+_MISS_LOG_INTERVAL_SECONDS = 60.0
+
+
+def _rfc822(value: str) -> datetime:
+    parsed = parsedate_to_datetime(value)
+    if parsed is None:  # pragma: no cover - older Pythons return None instead of raising
+        raise ValueError(value)
+    return parsed
+
+
+def _iso(value: str) -> datetime:
+    if value.endswith(("Z", "z")):
+        value = f"{value[:-1]}+00:00"
+    return datetime.fromisoformat(value)
+
+
+def _strptime(fmt: str) -> Callable[[str], datetime]:
+    def _parse(value: str) -> datetime:
+        return datetime.strptime(value, fmt)
+
+    return _parse
+
+
+_PARSERS: dict[str, Callable[[str], datetime]] = {
+    "rfc822": _rfc822,
+    "iso": _iso,
+    # Variants the fast paths reject, e.g. ISO with a space and an offset without colon.
+    "%Y-%m-%d %H:%M:%S%z": _strptime("%Y-%m-%d %H:%M:%S%z"),
+    "%a, %d %b %Y %H:%M:%S %Z": _strptime("%a, %d %b %Y %H:%M:%S %Z"),
+    "%d %b %Y %H:%M:%S %z": _strptime("%d %b %Y %H:%M:%S %z"),
+}
+
+_winning_parser: dict[str, str] = {}
+_misses: dict[str, tuple[float, int]] = {}
+
+
+def to_utc(value: datetime) -> datetime:
+    """Return ``value`` as an aware UTC datetime; naive values are taken as UTC."""
+
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _log_miss(source: str | None, value: str) -> None:
+    key = source or ""
+    now = time.monotonic()
+    last_logged, suppressed = _misses.get(key, (float("-inf"), 0))
+    if now - last_logged < _MISS_LOG_INTERVAL_SECONDS:
+        _misses[key] = (last_logged, suppressed + 1)
+        return
+    _misses[key] = (now, 0)
+    logger.warning(
+        "Could not parse date %r from %s (%d similar misses suppressed)",
+        value,
+        source or "unknown source",
+        suppressed,
+    )
+
+
+def parse_datetime(value: str | datetime | None, source: str | None = None) -> Optional[datetime]:
+    """Parse a feed date into an aware UTC datetime, or ``None`` when unparsable.
+
+    The parser that last succeeded for ``source`` is tried first, so a feed with
+    a consistent format costs a single attempt per item.
+    """
+
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return to_utc(value)
+    text = value.strip()
+    if not text:
+        return None
+
+    preferred = _winning_parser.get(source) if source is not None else None
+    if preferred is not None:
+        try:
+            return to_utc(_PARSERS[preferred](text))
+        except (TypeError, ValueError):
+            pass
+
+    for name, parser in _PARSERS.items():
+        if name == preferred:
+            continue
+        try:
+            parsed = parser(text)
+        except (TypeError, ValueError):
+            continue
+        if source is not None:
+            _winning_parser[source] = name
+        return to_utc(parsed)
+
+    _log_miss(source, text)
+    return None
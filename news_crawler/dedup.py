@@ -0,0 +1,261 @@
+"""Near-duplicate detection for headlines carried by several feeds.
+
+Links are canonicalized (tracking parameters, fragments and host case
+dropped) and titles are fingerprinted with a 64-bit SimHash. A trailing
+attribution (" - Reuters") is cut off first, but only when it names the
+item's source or a well-known publisher; anything else after a dash may
+be the news itself ("... - stocks slump"). Fingerprints are banded
+into an in-memory LSH table, so a lookup only compares against articles
+sharing at least one band; with ``max_distance + 1`` bands, any two
+fingerprints within ``max_distance`` bits are guaranteed to collide.
+SimHash alone is noisy on short headlines ("Fed surges on earnings beat"
+vs "Fed slumps on earnings beat"), so a fuzzy match also needs enough words
+and a high word overlap. Entries expire after a sliding time window.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import heapq
+import re
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Iterable
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from .schemas import NewsItem
+
+
+_TRACKING_PARAMS = frozenset(
+    {"fbclid", "gclid", "dclid", "msclkid", "mc_cid", "mc_eid", "cmpid", "ref", "ref_src", "taid", "yptr", "__source"}
+)
+_TRACKING_PREFIXES = ("utm_", "mkt_", "at_")
+_DEFAULT_PORTS = {"http": "80", "https": "443"}
+_WORD = re.compile(r"\w+")
+# The last " - ..." / " | ..." segment of a title; stripped only if it names a publisher.
+_ATTRIBUTION = re.compile(r"\s+[-|\u2013\u2014]\s+([^-|\u2013\u2014]+?)\s*$")
+# Publishers syndicated headlines are commonly attributed to, case-folded.
+_PUBLISHERS = frozenset(
+    {
+        "ap",
+        "associated press",
+        "axios",
+        "barron's",
+        "bbc",
+        "bbc news",
+        "benzinga",
+        "bloomberg",
+        "business insider",
+        "cnbc",
+        "cnn",
+        "cnn business",
+        "financial times",
+        "forbes",
+        "fortune",
+        "fox business",
+        "ft",
+        "investing.com",
+        "marketwatch",
+        "nasdaq",
+        "nikkei asia",
+        "reuters",
+        "seeking alpha",
+        "the economist",
+        "the guardian",
+        "the motley fool",
+        "the new york times",
+        "the wall street journal",
+        "wsj",
+        "yahoo finance",
+    }
+)
+_FINGERPRINT_BITS = 64
+# Titles shorter than this only match on their canonical link.
+_MIN_FUZZY_WORDS = 4
+# Smallest word-set Jaccard similarity that confirms a fingerprint match.
+_MIN_OVERLAP = 0.8
+
+
+@lru_cache(maxsize=65536)
+def canonicalize_url(url: str) -> str:
+    """Drop tracking parameters, fragments and default ports; lower-case scheme and host.
+
+    Links that do not parse (e.g. a non-numeric port) are returned unchanged,
+    so they still compare verbatim.
+    """
+
+    parts = urlsplit(url.strip())
+    try:
+        port = parts.port
+    except ValueError:
+        return url
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if port is not None and str(port) != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{port}"
+    query = [
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in _TRACKING_PARAMS and not key.lower().startswith(_TRACKING_PREFIXES)
+    ]
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((scheme, host, path, urlencode(sorted(query)), ""))
+
+
+def _strip_attribution(title: str, source: str | None) -> str:
+    match = _ATTRIBUTION.search(title)
+    if match is not None:
+        suffix = match.group(1).casefold()
+        if suffix in _PUBLISHERS or (source is not None and suffix == source.casefold()):
+            return title[: match.start()]
+    return title
+
+
+def _words(title: str, source: str | None = None) -> list[str]:
+    return _WORD.findall(_strip_attribution(title, source).casefold())
+
+
+def _features(words: list[str]) -> list[str]:
+    # Bigrams keep word order significant without making single-word edits fatal.
+    return words + [f"{first} {second}" for first, second in zip(words, words[1:])]
+
+
+def simhash(title: str, source: str | None = None) -> int:
+    """Return a 64-bit SimHash of the title's words and word bigrams."""
+
+    return _fingerprint(_words(title, source))
+
+
+def _fingerprint(words: list[str]) -> int:
+    weights = [0] * _FINGERPRINT_BITS
+    for feature in _features(words):
+        value = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big")
+        for bit in range(_FINGERPRINT_BITS):
+            weights[bit] += 1 if value >> bit & 1 else -1
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def _overlap(first: frozenset[str], second: frozenset[str]) -> float:
+    union = len(first | second)
+    return len(first & second) / union if union else 0.0
+
+
+@dataclass(slots=True)
+class _Entry:
+    cluster_id: str
+    canonical_link: str
+    fingerprint: int
+    words: frozenset[str]
+    seen_at: float
+
+
+class NearDuplicateIndex:
+    """Sliding-window LSH index assigning each article to a story cluster.
+
+    Links are compared in canonical form but stored as published. The first
+    article of a story starts a cluster whose id is its canonical link;
+    later articles with the same canonical link join that cluster, as do
+    titles of at least four words whose fingerprint is within
+    ``max_distance`` bits and whose word sets overlap by 80% or more.
+    ``clock`` supplies "now" for the window (archive replays pass the
+    archived fetch time).
+    """
+
+    def __init__(
+        self, window_seconds: float, max_distance: int = 3, clock: Callable[[], float] = time.time
+    ) -> None:
+        self.window_seconds = window_seconds
+        self.max_distance = max_distance
+        self._clock = clock
+        bands = max_distance + 1
+        self._band_bits = _FINGERPRINT_BITS // bands
+        self._bands = bands
+        self._buckets: dict[tuple[int, int], list[_Entry]] = {}
+        self._links: dict[str, _Entry] = {}
+        self._expiry: list[tuple[float, int, _Entry]] = []
+        self._counter = 0
+
+    def __len__(self) -> int:
+        return len(self._links)
+
+    def _band_keys(self, fingerprint: int) -> list[tuple[int, int]]:
+        mask = (1 << self._band_bits) - 1
+        return [(band, fingerprint >> (band * self._band_bits) & mask) for band in range(self._bands)]
+
+    def _expire(self, now: float) -> None:
+        cutoff = now - self.window_seconds
+        while self._expiry and self._expiry[0][0] < cutoff:
+            _, _, entry = heapq.heappop(self._expiry)
+            if self._links.get(entry.canonical_link) is entry:
+                del self._links[entry.canonical_link]
+            for key in self._band_keys(entry.fingerprint):
+                bucket = self._buckets.get(key)
+                if bucket is not None:
+                    bucket[:] = [other for other in bucket if other is not entry]
+                    if not bucket:
+                        del self._buckets[key]
+
+    def _match(self, canonical_link: str, fingerprint: int, words: frozenset[str]) -> _Entry | None:
+        entry = self._links.get(canonical_link)
+        if entry is not None:
+            return entry
+        if len(words) < _MIN_FUZZY_WORDS:
+            return None
+        best: _Entry | None = None
+        best_distance = self.max_distance + 1
+        for key in self._band_keys(fingerprint):
+            for candidate in self._buckets.get(key, ()):
+                distance = (candidate.fingerprint ^ fingerprint).bit_count()
+                if distance < best_distance and _overlap(candidate.words, words) >= _MIN_OVERLAP:
+                    best, best_distance = candidate, distance
+        return best
+
+    def _insert(self, entry: _Entry) -> None:
+        self._links.setdefault(entry.canonical_link, entry)
+        for key in self._band_keys(entry.fingerprint):
+            self._buckets.setdefault(key, []).append(entry)
+        self._counter += 1
+        heapq.heappush(self._expiry, (entry.seen_at, self._counter, entry))
+
+    def assign(self, item: NewsItem, cluster_id: str | None = None, now: float | None = None) -> bool:
+        """Set ``item.cluster_id`` and index the item under its canonical link.
+
+        Returns ``True`` when the item joined an existing cluster. Pass
+        ``cluster_id`` to restore a known membership (e.g. when warming up).
+        """
+
+        now = self._clock() if now is None else now
+        self._expire(now)
+        canonical_link = canonicalize_url(item.link)
+        words = _words(item.title, item.source)
+        fingerprint = _fingerprint(words)
+        word_set = frozenset(words)
+        match = self._match(canonical_link, fingerprint, word_set) if cluster_id is None else None
+        item.cluster_id = match.cluster_id if match is not None else cluster_id or canonical_link
+        seen_at = item.published_at.timestamp() if item.published_at is not None else now
+        if seen_at >= now - self.window_seconds:
+            self._insert(_Entry(item.cluster_id, canonical_link, fingerprint, word_set, min(seen_at, now)))
+        return match is not None
+
+    def partition(self, items: Iterable[NewsItem]) -> tuple[list[NewsItem], list[NewsItem]]:
+        """Split ``items`` into cluster leaders (to score) and near-duplicates."""
+
+        now = self._clock()
+        leaders: list[NewsItem] = []
+        duplicates: list[NewsItem] = []
+        for item in items:
+            (duplicates if self.assign(item, now=now) else leaders).append(item)
+        return leaders, duplicates
+
+    def warm(self, members: Iterable[tuple[NewsItem, str]]) -> None:
+        """Seed the index with already stored ``(item, cluster_id)`` pairs."""
+
+        now = self._clock()
+        for item, cluster_id in members:
+            self.assign(item, cluster_id=cluster_id, now=now)
+
@@ -1,16 +1,94 @@
-"""JSON export helpers."""
+"""JSON export helpers.
+
+Exports are streamed record by record. Paths ending in ``.ndjson``/``.jsonl``
+get newline-delimited JSON, anything else a compact JSON array. Full rewrites
+go to a temporary file that atomically replaces the target, so readers never
+see a half-written export.
+"""
 
 from __future__ import annotations
 
 import json
+import os
+import tempfile
 from pathlib import Path
-from typing import Iterable
+from typing import IO, Iterable, Mapping
+
+from .schemas import NewsItem
+
+
+NDJSON_SUFFIXES = frozenset({".ndjson", ".jsonl"})
+
+
+def is_ndjson(path: Path) -> bool:
+    return path.suffix.lower() in NDJSON_SUFFIXES
+
+
+def _dumps(payload: Mapping[str, object]) -> str:
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
+
+
+def stream_json(handle: IO[str], payloads: Iterable[Mapping[str, object]], ndjson: bool = False) -> int:
+    """Write ``payloads`` one at a time and return how many were written."""
+
+    count = 0
+    if ndjson:
+        for payload in payloads:
+            handle.write(_dumps(payload))
+            handle.write("\n")
+            count += 1
+        return count
+    handle.write("[")
+    for payload in payloads:
+        if count:
+            handle.write(",\n")
+        handle.write(_dumps(payload))
+        count += 1
+    handle.write("]\n")
+    return count
+
+
+def write_json(path: Path, records: Iterable[NewsItem]) -> int:
+    """Atomically replace ``path`` with ``records``; returns the record count."""
+
+    return write_payloads(path, (record.to_json() for record in records))
+
+
+def write_payloads(path: Path, payloads: Iterable[Mapping[str, object]]) -> int:
+    """Atomically replace ``path`` with already-serialisable ``payloads``."""
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    handle = tempfile.NamedTemporaryFile(
+        "w",
+        encoding="utf-8",
+        dir=path.parent,
+        prefix=f".{path.name}.",
+        suffix=".tmp",
+        delete=False,
+    )
+    try:
+        with handle:
+            count = stream_json(handle, payloads, is_ndjson(path))
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(handle.name, path)
+    except BaseException:
+        Path(handle.name).unlink(missing_ok=True)
+        raise
+    return count
 
-from .schemas import ArticleRecord
 
+def append_json(path: Path, records: Iterable[NewsItem]) -> int:
+    """Append ``records`` to an NDJSON export in a single write; returns the count."""
 
-def write_json(path: Path, records: Iterable[ArticleRecord]) -> None:
+    if not is_ndjson(path):
+        raise ValueError(f"Appending requires an NDJSON export path, got {path}")
+    lines = "".join(f"{_dumps(record.to_json())}\n" for record in records)
+    if not lines:
+        return 0
     path.parent.mkdir(parents=True, exist_ok=True)
-    payload = [record.model_dump(mode="json") for record in records]
-    with path.open("w", encoding="utf-8") as handle:
-        json.dump(payload, handle, indent=2)
+    with path.open("a", encoding="utf-8") as handle:
+        handle.write(lines)
+        handle.flush()
+        os.fsync(handle.fileno())
+    return lines.count("\n")
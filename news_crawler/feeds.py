@@ -0,0 +1,42 @@
+"""Feed registry loading."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from pydantic import TypeAdapter
+
+from .schemas import FeedConfig
+from .settings import Settings
+
+
+_FEED_LIST = TypeAdapter(list[FeedConfig])
+
+
+def read_feeds_file(path: Path) -> list[FeedConfig]:
+    """Parse a JSON file containing a list of feed entries."""
+
+    return _FEED_LIST.validate_python(json.loads(path.read_text(encoding="utf-8")))
+
+
+def load_feeds(settings: Settings) -> list[FeedConfig]:
+    """Return enabled feeds from the file and settings, de-duplicated by URL.
+
+    Falls back to the Reuters and CNBC URLs when no registry is configured.
+    """
+
+    feeds = list(settings.feeds)
+    if settings.feeds_file is not None:
+        feeds.extend(read_feeds_file(settings.feeds_file))
+    if not feeds:
+        feeds = [
+            FeedConfig(name="Reuters", url=settings.reuters_feed_url),
+            FeedConfig(name="CNBC", url=settings.cnbc_feed_url),
+        ]
+
+    registry: dict[str, FeedConfig] = {}
+    for feed in feeds:
+        if feed.enabled and feed.url not in registry:
+            registry[feed.url] = feed
+    return list(registry.values())
@@ -3,135 +3,279 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import logging
-from typing import Iterable, List
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import AsyncIterator, Callable, List
+from urllib.parse import urlsplit
 
 import aiohttp
-from bs4 import BeautifulSoup, FeatureNotFound
 
-
-try:  # pragma: no cover - optional dependency for fallback parsing
-    import xml.etree.ElementTree as ET
-except ImportError:  # pragma: no cover
-    ET = None
-
-from .schemas import RawArticle
+from .archive import FeedArchive, open_archive
+from .feeds import load_feeds
+from .cache import SeenLinks
+from .metrics import get_metrics
+from .parser import StreamingFeedParser, parse_feed
+from .schemas import FeedConfig, FeedValidators, NewsItem
 from .settings import Settings
 
 
 logger = logging.getLogger(__name__)
 
+ArticleSink = Callable[[list[NewsItem]], object]
+
+
+@dataclass
+class FeedResult:
+    """Outcome of polling one feed, including what is needed for reporting."""
+
+    feed: FeedConfig
+    articles: list[NewsItem] = field(default_factory=list)
+    validators: FeedValidators | None = None
+    status: int | None = None
+    changed: bool = False
+    elapsed_seconds: float = 0.0
+    bytes_read: int = 0
+    parse_seconds: float = 0.0
+    error: str | None = None
+
+    def report(self) -> dict[str, object]:
+        return {
+            "source": self.feed.name,
+            "url": self.feed.url,
+            "status": self.status,
+            "changed": self.changed,
+            "articles": len(self.articles),
+            "elapsed_seconds": round(self.elapsed_seconds, 4),
+            "bytes": self.bytes_read,
+            "parse_seconds": round(self.parse_seconds, 4),
+            "error": self.error,
+        }
+
+
+class FetchLimiter:
+    """Bound in-flight requests globally and per host."""
+
+    def __init__(self, max_concurrent: int, max_per_host: int) -> None:
+        self._global = asyncio.Semaphore(max_concurrent)
+        self._per_host: defaultdict[str, asyncio.Semaphore] = defaultdict(
+            lambda: asyncio.Semaphore(max_per_host)
+        )
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "FetchLimiter":
+        return cls(settings.max_concurrent_fetches, settings.max_fetches_per_host)
+
+    @asynccontextmanager
+    async def slot(self, url: str) -> AsyncIterator[None]:
+        # Take the host slot first so a busy host never parks a global slot.
+        async with self._per_host[urlsplit(url).hostname or ""]:
+            async with self._global:
+                yield
 
-async def _fetch(session: aiohttp.ClientSession, url: str) -> str:
-    async with session.get(url) as response:
+
+_CHUNK_SIZE = 64 * 1024
+
+
+async def _fetch(
+    session: aiohttp.ClientSession,
+    url: str,
+    validators: FeedValidators | None,
+    sink: Callable[[bytes], object],
+) -> tuple[bool, FeedValidators | None, int]:
+    """Conditionally download ``url``, handing body chunks to ``sink`` as they arrive.
+
+    Returns ``(changed, validators, status)``. ``changed`` is false when the server
+    answers 304 (nothing is streamed) or when the body hashes to the same digest as
+    the previous poll, in which case callers should discard what ``sink`` received.
+    """
+
+    headers: dict[str, str] = {}
+    if validators is not None:
+        if validators.etag:
+            headers["If-None-Match"] = validators.etag
+        if validators.last_modified:
+            headers["If-Modified-Since"] = validators.last_modified
+    digest = hashlib.sha256()
+    async with session.get(url, headers=headers) as response:
+        if response.status == 304 and validators is not None:
+            return False, validators, response.status
         response.raise_for_status()
-        return await response.text()
+        async for chunk in response.content.iter_chunked(_CHUNK_SIZE):
+            digest.update(chunk)
+            sink(chunk)
+        updated = FeedValidators(
+            url=url,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+            content_hash=digest.hexdigest(),
+        )
+    changed = validators is None or validators.content_hash != updated.content_hash
+    return changed, updated, response.status
 
 
-def _parse_rss(xml: str, source: str) -> List[RawArticle]:
-    items = []
+def _parse_rss(xml: str | bytes, source: str) -> List[NewsItem]:
+    return parse_feed(xml, source)
+
+
+def create_session(settings: Settings) -> aiohttp.ClientSession:
+    """Build the HTTP session shared by every feed request."""
+
+    timeout = aiohttp.ClientTimeout(total=settings.http_timeout_seconds)
+    connector = aiohttp.TCPConnector(
+        ssl=False,
+        limit=settings.max_concurrent_fetches,
+        limit_per_host=settings.max_fetches_per_host,
+        use_dns_cache=True,
+        ttl_dns_cache=settings.dns_cache_ttl_seconds,
+        keepalive_timeout=settings.keepalive_timeout_seconds,
+    )
+    headers = {"User-Agent": settings.user_agent}
+    return aiohttp.ClientSession(timeout=timeout, connector=connector, headers=headers)
+
+
+async def fetch_feed(
+    session: aiohttp.ClientSession,
+    feed: FeedConfig,
+    validators: FeedValidators | None = None,
+    limiter: FetchLimiter | None = None,
+    seen: SeenLinks | None = None,
+    on_articles: ArticleSink | None = None,
+    archive: FeedArchive | None = None,
+) -> FeedResult:
+    """Fetch and parse a single feed.
+
+    The body is parsed incrementally while it downloads and items whose link is
+    in ``seen`` are skipped. ``on_articles`` receives each parsed group of
+    articles as soon as it is available, except for feeds whose previous poll
+    left only a content hash to compare against: those are handed over once
+    the whole body is known to differ. Changed bodies are appended to
+    ``archive`` when one is given. Failures are captured on the result rather than
+    raised so one broken feed cannot sink a crawl.
+    """
+
+    result = FeedResult(feed=feed, validators=validators)
+    parser = StreamingFeedParser(feed.name, seen)
+    body: list[bytes] = []
+    # Without an ETag or Last-Modified the server cannot answer 304, and an identical
+    # body is only recognized by its hash after the last chunk.
+    deferred = validators is not None and not (validators.etag or validators.last_modified)
+
+    def _emit(articles: list[NewsItem]) -> None:
+        if articles:
+            result.articles.extend(articles)
+            if on_articles is not None and not deferred:
+                on_articles(articles)
+
+    def _parse(step: Callable[[], list[NewsItem]]) -> None:
+        parse_started = time.perf_counter()
+        articles = step()
+        result.parse_seconds += time.perf_counter() - parse_started
+        _emit(articles)
+
+    def _sink(chunk: bytes) -> None:
+        result.bytes_read += len(chunk)
+        if archive is not None:
+            body.append(chunk)
+        _parse(lambda: parser.feed(chunk))
+
+    fetched_at = datetime.now(timezone.utc)
+    started = time.perf_counter()
     try:
-        soup = BeautifulSoup(xml, "xml")
-        items = soup.find_all("item") or soup.find_all("entry")
-    except FeatureNotFound:
-        soup = None
-
-    if not items and ET is not None:
-        try:
-            root = ET.fromstring(xml)
-            items = root.findall(".//item") or root.findall(".//entry")
-
-            def _get_text(element, name: str) -> str | None:
-                child = element.find(name)
-                if child is None:
-                    return None
-                text = child.text or ""
-                return text.strip() or None
-
-            records: list[RawArticle] = []
-            for item in items:
-                title = _get_text(item, "title")
-                link_element = item.find("link")
-                link = None
-                if link_element is not None:
-                    link = link_element.attrib.get("href") or (link_element.text or "").strip() or None
-                summary = _get_text(item, "description") or _get_text(item, "summary")
-                published = (
-                    _get_text(item, "pubDate")
-                    or _get_text(item, "published")
-                    or _get_text(item, "updated")
+        if limiter is not None:
+            async with limiter.slot(feed.url):
+                started = time.perf_counter()
+                result.changed, result.validators, result.status = await _fetch(
+                    session, feed.url, validators, _sink
                 )
-                if not title or not link:
-                    continue
-                records.append(
-                    RawArticle(
-                        source=source,
-                        title=title,
-                        link=link,
-                        summary=summary,
-                        published_at=published,
-                    )
-                )
-            if records:
-                return records
-        except ET.ParseError:
-            pass
-
-    if soup is None:
-        soup = BeautifulSoup(xml, "html.parser")
-        items = soup.find_all("item") or soup.find_all("entry")
-
-    articles: list[RawArticle] = []
-    for item in items:
-        title_tag = item.find("title")
-        link_tag = item.find("link")
-        summary_tag = item.find("description") or item.find("summary")
-        published_tag = (
-            item.find("pubDate")
-            or item.find("published")
-            or item.find("updated")
+        else:
+            result.changed, result.validators, result.status = await _fetch(
+                session, feed.url, validators, _sink
+            )
+        if result.changed:
+            _parse(parser.close)
+            if deferred and on_articles is not None and result.articles:
+                on_articles(list(result.articles))
+            if archive is not None:
+                # Compression and disk writes would otherwise stall every other in-flight feed.
+                await asyncio.to_thread(archive.append, feed, b"".join(body), result.status, fetched_at)
+        else:
+            # Identical bodies are only detected once fully streamed; drop what was parsed.
+            # Only a server that sent validators and still answered 200 gets here with
+            # articles already handed to on_articles; the seen index drops the stored ones.
+            result.articles = []
+    except Exception as exc:  # noqa: BLE001 - reported per feed
+        result.error = str(exc) or type(exc).__name__
+        if isinstance(exc, aiohttp.ClientResponseError):
+            result.status = exc.status
+    result.elapsed_seconds = time.perf_counter() - started
+    metrics = get_metrics()
+    metrics.observe("fetch", result.elapsed_seconds, len(result.articles), result.bytes_read, feed=feed.name)
+    metrics.observe("parse", result.parse_seconds, len(result.articles))
+
+    if result.error is not None:
+        logger.warning("Failed to fetch feed %s (%s): %s", feed.name, feed.url, result.error)
+    else:
+        logger.info(
+            "Fetched feed %s: status=%s changed=%s articles=%d bytes=%d in %.3fs (parse %.3fs)",
+            feed.name,
+            result.status,
+            result.changed,
+            len(result.articles),
+            result.bytes_read,
+            result.elapsed_seconds,
+            result.parse_seconds,
+            extra={"feed_result": result.report()},
         )
-        link = None
-        if link_tag:
-            link = link_tag.get_text(strip=True) or None
-            if hasattr(link_tag, "attrs"):
-                link = link or link_tag.attrs.get("href")
-        if link_tag and link_tag.has_attr("href"):
-            link = link_tag["href"]
-        if not title_tag or not link:
-            continue
-        articles.append(
-            RawArticle(
-                source=source,
-                title=title_tag.get_text(strip=True),
-                link=link,
-                summary=summary_tag.get_text(strip=True) if summary_tag else None,
-                published_at=published_tag.get_text(strip=True) if published_tag else None,
+    return result
+
+
+async def crawl_feeds(
+    settings: Settings,
+    feed_states: dict[str, FeedValidators] | None = None,
+    seen: SeenLinks | None = None,
+    on_articles: ArticleSink | None = None,
+) -> list[FeedResult]:
+    """Fetch every registered feed with bounded concurrency.
+
+    When ``feed_states`` is given it is used for conditional requests and updated
+    in place with the validators returned by each feed.
+    """
+
+    feeds = load_feeds(settings)
+    states = feed_states if feed_states is not None else {}
+    limiter = FetchLimiter.from_settings(settings)
+    archive = open_archive(settings)
+
+    async with create_session(settings) as session:
+        results = await asyncio.gather(
+            *(
+                fetch_feed(session, feed, states.get(feed.url), limiter, seen, on_articles, archive)
+                for feed in feeds
             )
         )
-    return articles
 
+    for result in results:
+        if result.error is None and result.validators is not None:
+            states[result.feed.url] = result.validators
+    return list(results)
 
-async def fetch_feeds(settings: Settings) -> list[RawArticle]:
-    feeds: Iterable[tuple[str, str]] = (
-        ("Reuters", settings.reuters_feed_url),
-        ("CNBC", settings.cnbc_feed_url),
-    )
-    timeout = aiohttp.ClientTimeout(total=settings.http_timeout_seconds)
-    connector = aiohttp.TCPConnector(ssl=False)
-    headers = {"User-Agent": settings.user_agent}
 
-    async with aiohttp.ClientSession(timeout=timeout, connector=connector, headers=headers) as session:
-        tasks = [
-            asyncio.create_task(_fetch(session, url))
-            for _, url in feeds
-        ]
-        xml_payloads = await asyncio.gather(*tasks, return_exceptions=True)
-
-    articles: list[RawArticle] = []
-    for (source, url), payload in zip(feeds, xml_payloads, strict=False):
-        if isinstance(payload, Exception):
-            logger.warning("Failed to fetch feed %s (%s): %s", source, url, payload)
-            continue
-        articles.extend(_parse_rss(payload, source))
-    return articles
+async def fetch_feeds(
+    settings: Settings,
+    feed_states: dict[str, FeedValidators] | None = None,
+    seen: SeenLinks | None = None,
+    on_articles: ArticleSink | None = None,
+) -> list[NewsItem]:
+    """Fetch every registered feed and return the parsed articles.
+
+    Pass ``on_articles`` to also receive articles incrementally while feeds are
+    still downloading.
+    """
+
+    results = await crawl_feeds(settings, feed_states, seen, on_articles)
+    return [article for result in results for article in result.articles]
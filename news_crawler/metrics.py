@@ -0,0 +1,208 @@
+"""In-process timing and throughput counters for the crawl stages.
+
+Every observation is logged as a structured record on the
+``news_crawler.metrics`` logger (the numbers ride along in ``extra``) and
+accumulated into :class:`Metrics`, which renders a JSON summary for
+``--stats`` and Prometheus text for the daemon's metrics endpoint.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING, Iterator
+
+if TYPE_CHECKING:  # pragma: no cover
+    from aiohttp import web
+
+
+logger = logging.getLogger(__name__)
+
+STAGES = ("fetch", "parse", "dedup", "tagging", "sentiment", "store", "export")
+
+
+@dataclass(slots=True)
+class StageStats:
+    """Running totals for one stage (or one feed's fetches)."""
+
+    calls: int = 0
+    seconds: float = 0.0
+    max_seconds: float = 0.0
+    items: int = 0
+    bytes: int = 0
+
+    def add(self, seconds: float, items: int, size: int) -> None:
+        self.calls += 1
+        self.seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        self.items += items
+        self.bytes += size
+
+    def merge(self, summary: dict[str, float | int]) -> None:
+        self.calls += int(summary["calls"])
+        self.seconds += float(summary["seconds"])
+        self.max_seconds = max(self.max_seconds, float(summary["max_seconds"]))
+        self.items += int(summary["items"])
+        self.bytes += int(summary["bytes"])
+
+    def summary(self) -> dict[str, float | int]:
+        return {
+            "calls": self.calls,
+            "seconds": round(self.seconds, 6),
+            "max_seconds": round(self.max_seconds, 6),
+            "items": self.items,
+            "bytes": self.bytes,
+            "items_per_second": round(self.items / self.seconds, 2) if self.seconds else 0.0,
+        }
+
+
+class Span:
+    """Handle yielded by :meth:`Metrics.timed`; set ``items``/``bytes`` before it closes."""
+
+    __slots__ = ("items", "bytes")
+
+    def __init__(self) -> None:
+        self.items = 0
+        self.bytes = 0
+
+
+class Metrics:
+    """Thread-safe per-stage counters; the sentiment worker records from its own thread."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.started = time.perf_counter()
+            self.stages: dict[str, StageStats] = {stage: StageStats() for stage in STAGES}
+            self.feeds: dict[str, StageStats] = {}
+            self.dedup_hits = 0
+
+    def observe(self, stage: str, seconds: float, items: int = 0, size: int = 0, feed: str | None = None) -> None:
+        with self._lock:
+            self.stages.setdefault(stage, StageStats()).add(seconds, items, size)
+            if feed is not None:
+                self.feeds.setdefault(feed, StageStats()).add(seconds, items, size)
+        logger.debug(
+            "stage=%s seconds=%.6f items=%d bytes=%d",
+            stage,
+            seconds,
+            items,
+            size,
+            extra={"stage": stage, "seconds": seconds, "items": items, "bytes": size, "feed": feed},
+        )
+
+    def observe_dedup(self, seen: int, kept: int, seconds: float) -> None:
+        with self._lock:
+            self.dedup_hits += seen - kept
+        self.observe("dedup", seconds, seen)
+
+    def merge(self, summary: dict[str, object]) -> None:
+        """Add a :meth:`summary` from another process (e.g. a shard worker)."""
+
+        with self._lock:
+            for stage, stats in summary["stages"].items():
+                self.stages.setdefault(stage, StageStats()).merge(stats)
+            for feed, stats in summary["feeds"].items():
+                self.feeds.setdefault(feed, StageStats()).merge(stats)
+            self.dedup_hits += int(summary["dedup"]["duplicates"])
+
+    @contextmanager
+    def timed(self, stage: str) -> Iterator[Span]:
+        span = Span()
+        started = time.perf_counter()
+        try:
+            yield span
+        finally:
+            self.observe(stage, time.perf_counter() - started, span.items, span.bytes)
+
+    def summary(self) -> dict[str, object]:
+        """JSON-ready snapshot of every counter."""
+
+        with self._lock:
+            dedup_seen = self.stages["dedup"].items
+            return {
+                "elapsed_seconds": round(time.perf_counter() - self.started, 6),
+                "stages": {stage: stats.summary() for stage, stats in self.stages.items()},
+                "feeds": {feed: stats.summary() for feed, stats in sorted(self.feeds.items())},
+                "dedup": {
+                    "seen": dedup_seen,
+                    "duplicates": self.dedup_hits,
+                    "hit_rate": round(self.dedup_hits / dedup_seen, 4) if dedup_seen else 0.0,
+                },
+            }
+
+    def prometheus(self) -> str:
+        """Render the counters in the Prometheus text exposition format."""
+
+        lines: list[str] = []
+
+        def _family(name: str, kind: str, help_text: str, samples: list[tuple[str, float]]) -> None:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.extend(f"{name}{labels} {value:g}" for labels, value in samples)
+
+        with self._lock:
+            stages = sorted(self.stages.items())
+            feeds = sorted(self.feeds.items())
+            dedup_hits = self.dedup_hits
+        for field, help_text in (
+            ("calls", "Completed stage invocations."),
+            ("seconds", "Wall time spent in the stage."),
+            ("items", "Items handled by the stage."),
+            ("bytes", "Bytes handled by the stage."),
+        ):
+            _family(
+                f"news_crawler_stage_{field}_total",
+                "counter",
+                help_text,
+                [(f'{{stage="{stage}"}}', getattr(stats, field)) for stage, stats in stages],
+            )
+        for field, help_text in (
+            ("seconds", "Wall time spent fetching the feed."),
+            ("bytes", "Bytes downloaded from the feed."),
+            ("items", "Articles parsed from the feed."),
+        ):
+            _family(
+                f"news_crawler_feed_{field}_total",
+                "counter",
+                help_text,
+                [(f'{{feed="{_escape(feed)}"}}', getattr(stats, field)) for feed, stats in feeds],
+            )
+        _family("news_crawler_dedup_hits_total", "counter", "Articles dropped as duplicates.", [("", dedup_hits)])
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+@lru_cache
+def get_metrics() -> Metrics:
+    """Process-wide metrics registry."""
+
+    return Metrics()
+
+
+async def serve_metrics(host: str, port: int, metrics: Metrics | None = None) -> web.AppRunner:
+    """Serve ``GET /metrics`` in Prometheus text format; call ``cleanup()`` on the runner to stop."""
+
+    from aiohttp import web
+
+    metrics = metrics or get_metrics()
+
+    async def _handle(_request: web.Request) -> web.Response:
+        return web.Response(text=metrics.prometheus(), content_type="text/plain", charset="utf-8")
+
+    app = web.Application()
+    app.router.add_get("/metrics", _handle)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    return runner
@@ -0,0 +1,204 @@
+"""Incremental RSS/Atom parsing."""
+
+from __future__ import annotations
+
+import logging
+import xml.etree.ElementTree as ET
+from typing import Container, List
+
+from pydantic import HttpUrl, TypeAdapter, ValidationError
+
+from .dates import parse_datetime
+from .schemas import NewsItem
+
+
+logger = logging.getLogger(__name__)
+
+_ITEM_TAGS = frozenset({"item", "entry"})
+_SUMMARY_TAGS = ("description", "summary")
+_PUBLISHED_TAGS = ("pubDate", "published", "updated")
+# The same rules ArticleRecord.link enforces, so every parsed article can be exported.
+_HTTP_URL = TypeAdapter(HttpUrl)
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _is_http_url(link: str) -> bool:
+    # Only unseen items get here, so the validator's few microseconds are not on the hot path.
+    try:
+        _HTTP_URL.validate_python(link)
+    except ValidationError:
+        return False
+    return True
+
+
+def _build_article(
+    source: str,
+    title: str | None,
+    link: str | None,
+    summary: str | None,
+    published: str | None,
+) -> NewsItem | None:
+    if not title or not link:
+        return None
+    if not _is_http_url(link):
+        logger.debug("Skipping %s item with invalid link %r", source, link)
+        return None
+    return NewsItem(
+        source=source,
+        title=title,
+        link=link,
+        summary=summary,
+        published_at=parse_datetime(published, source),
+    )
+
+
+def _element_link(fields: dict[str, ET.Element]) -> str | None:
+    link_element = fields.get("link")
+    if link_element is None:
+        return None
+    return link_element.attrib.get("href") or (link_element.text or "").strip() or None
+
+
+def _element_article(fields: dict[str, ET.Element], link: str | None, source: str) -> NewsItem | None:
+    def _text(*names: str) -> str | None:
+        for name in names:
+            child = fields.get(name)
+            if child is not None:
+                text = "".join(child.itertext()).strip()
+                if text:
+                    return text
+        return None
+
+    return _build_article(
+        source,
+        _text("title"),
+        link,
+        _text(*_SUMMARY_TAGS),
+        _text(*_PUBLISHED_TAGS),
+    )
+
+
+def _parse_lenient(payload: bytes, source: str, seen: Container[str] | None = None) -> List[NewsItem]:
+    """Parse malformed feeds with BeautifulSoup's forgiving HTML parser."""
+
+    from bs4 import BeautifulSoup  # only needed for broken feeds
+
+    soup = BeautifulSoup(payload, "html.parser")
+    articles: list[NewsItem] = []
+    for item in soup.find_all("item") or soup.find_all("entry"):
+        title_tag = item.find("title")
+        link_tag = item.find("link")
+        summary_tag = item.find("description") or item.find("summary")
+        # html.parser lower-cases tag names.
+        published_tag = item.find("pubdate") or item.find("published") or item.find("updated")
+        link = None
+        if link_tag:
+            link = link_tag.get("href") or link_tag.get_text(strip=True) or None
+            if link is None and link_tag.next_sibling is not None:
+                # <link> is a void element in HTML, so the URL ends up as its sibling.
+                link = str(link_tag.next_sibling).strip() or None
+        if seen is not None and link in seen:
+            continue
+        article = _build_article(
+            source,
+            title_tag.get_text(strip=True) if title_tag else None,
+            link,
+            summary_tag.get_text(strip=True) if summary_tag else None,
+            published_tag.get_text(strip=True) if published_tag else None,
+        )
+        if article is not None:
+            articles.append(article)
+    return articles
+
+
+class StreamingFeedParser:
+    """Parse a feed chunk by chunk, emitting articles as each item closes.
+
+    Well-formed feeds never build a full document tree, and items become plain
+    :class:`NewsItem` records once their link passes the ``HttpUrl`` rules. If
+    the XML turns out to be malformed, the buffered payload is re-parsed
+    leniently on :meth:`close` and only articles not already emitted are
+    returned. Items whose link is in
+    ``seen`` are dropped before any other work happens.
+    """
+
+    def __init__(self, source: str, seen: Container[str] | None = None) -> None:
+        self.source = source
+        self.seen = seen
+        self.skipped = 0
+        self._parser = ET.XMLPullParser(events=("end",))
+        self._buffer = bytearray()
+        self._emitted: set[str] = set()
+        self._started = False
+        self._malformed = False
+
+    def feed(self, chunk: bytes | str) -> List[NewsItem]:
+        if isinstance(chunk, str):
+            chunk = chunk.encode("utf-8")
+        if not self._started:
+            # Leading whitespace before an XML declaration is a parse error.
+            chunk = chunk.lstrip()
+            self._started = bool(chunk)
+        self._buffer += chunk
+        if self._malformed or not chunk:
+            return []
+        try:
+            self._parser.feed(chunk)
+        except ET.ParseError:
+            self._malformed = True
+            return []
+        return self._drain()
+
+    def close(self) -> List[NewsItem]:
+        articles: list[NewsItem] = []
+        if not self._malformed:
+            try:
+                self._parser.close()
+                articles = self._drain()
+            except ET.ParseError:
+                self._malformed = True
+        if self._malformed:
+            logger.debug("Feed %s is not well-formed XML, using lenient parser", self.source)
+            articles.extend(
+                article
+                for article in _parse_lenient(bytes(self._buffer), self.source, self.seen)
+                if article.link not in self._emitted
+            )
+        self._buffer.clear()
+        return articles
+
+    def _drain(self) -> List[NewsItem]:
+        articles: list[NewsItem] = []
+        try:
+            # Syntax errors are queued by the pull parser and raised from here.
+            for _event, element in self._parser.read_events():
+                if _local_name(element.tag) not in _ITEM_TAGS:
+                    continue
+                fields: dict[str, ET.Element] = {}
+                for child in element:
+                    fields.setdefault(_local_name(child.tag), child)
+                link = _element_link(fields)
+                if self.seen is not None and link in self.seen:
+                    self.skipped += 1
+                    article = None
+                else:
+                    article = _element_article(fields, link, self.source)
+                element.clear()
+                if article is not None:
+                    self._emitted.add(article.link)
+                    articles.append(article)
+        except ET.ParseError:
+            self._malformed = True
+        return articles
+
+
+def parse_feed(payload: bytes | str, source: str, seen: Container[str] | None = None) -> List[NewsItem]:
+    """Parse a complete feed document."""
+
+    parser = StreamingFeedParser(source, seen)
+    articles = parser.feed(payload)
+    articles.extend(parser.close())
+    return articles
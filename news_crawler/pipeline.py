@@ -3,24 +3,52 @@
 from __future__ import annotations
 
 import asyncio
-from pathlib import Path
-from typing import Iterable, List
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Collection, Iterable, List
 
-from sqlalchemy.orm import Session
-
-from .database import init_db, upsert_articles
-from .exporter import write_json
+from .archive import ArchiveEntry, FeedArchive, open_archive
+from .cache import SeenLinks
+from .database import (
+    AGGREGATE_RESOLUTIONS,
+    claim_links,
+    get_async_engine,
+    init_db,
+    load_feed_states,
+    load_recent_clusters,
+    load_recent_links,
+    run_in_session,
+    save_feed_states,
+    store_batch,
+)
+from .dedup import NearDuplicateIndex
+from .exporter import append_json, write_json, write_payloads
+from .feeds import load_feeds
 from .fetcher import fetch_feeds
-from .schemas import ArticleRecord, RawArticle
+from .metrics import get_metrics
+from .parser import parse_feed
+from .query import iter_articles, sentiment_aggregates
+from .schemas import ArticleRecord, FeedValidators, NewsItem
 from .sentiment import annotate_sentiment
 from .settings import Settings, get_settings
+from .tickers import tag_tickers
 
 
-def _deduplicate(articles: Iterable[RawArticle]) -> List[RawArticle]:
-    seen_links: set[str] = set()
-    deduped: list[RawArticle] = []
+logger = logging.getLogger(__name__)
+
+# Parsed archive payloads buffered ahead of the sentiment worker during a replay.
+_REPLAY_BACKLOG = 64
+
+
+def _deduplicate(articles: Iterable[NewsItem], seen_links: set[str] | None = None) -> List[NewsItem]:
+    """Drop repeated links; pass ``seen_links`` to deduplicate across calls."""
+
+    seen_links = seen_links if seen_links is not None else set()
+    deduped: list[NewsItem] = []
     for article in articles:
-        link = str(article.link)
+        link = article.link
         if link in seen_links:
             continue
         seen_links.add(link)
@@ -28,43 +56,343 @@ def _deduplicate(articles: Iterable[RawArticle]) -> List[RawArticle]:
     return deduped
 
 
-async def _run_async(settings: Settings) -> list[ArticleRecord]:
-    raw_articles = await fetch_feeds(settings)
-    deduped = _deduplicate(raw_articles)
-    annotated = annotate_sentiment(settings, deduped)
-    records = [
-        ArticleRecord(
-            source=raw.source,
-            title=raw.title,
-            link=raw.link,
-            summary=raw.summary,
-            published_at=raw.published_at,
-            sentiment_label=sentiment.label,
-            sentiment_score=sentiment.score,
-        )
-        for raw, sentiment in annotated
-    ]
+def _score_articles(settings: Settings, articles: Iterable[NewsItem]) -> list[NewsItem]:
+    """Deduplicate articles, tag their tickers and fill in their sentiment."""
+
+    metrics = get_metrics()
+    articles = _deduplicate(articles)
+    if settings.tickers_file is not None:
+        with metrics.timed("tagging") as span:
+            span.items = len(tag_tickers(settings, articles))
+    with metrics.timed("sentiment") as span:
+        scored = annotate_sentiment(settings, articles)
+        span.items = len(scored)
+    return scored
+
+
+def sentiment_executor() -> ThreadPoolExecutor:
+    """Single worker thread for inference; the transformers pipeline is not thread-safe."""
+
+    return ThreadPoolExecutor(max_workers=1, thread_name_prefix="sentiment")
+
+
+async def _annotate_from_queue(
+    settings: Settings,
+    queue: asyncio.Queue[list[NewsItem] | None],
+    executor: ThreadPoolExecutor,
+    clusters: NearDuplicateIndex,
+    lease_owner: str | None = None,
+) -> tuple[list[NewsItem], list[NewsItem]]:
+    """Consume parsed articles in micro-batches, score them off the loop and store them.
+
+    Everything queued while the previous batch was being scored is taken at once
+    (up to ``sentiment_micro_batch_size``), so batches grow under load. Near-
+    duplicates of a story already seen are set aside unscored. Each batch is
+    written while the next one is fetched and scored (writes stay serialized,
+    which SQLite needs); returns the newly stored records and the duplicates.
+    With ``lease_owner`` (sharded crawls) only links this worker manages to
+    lease in ``article_leases`` are scored.
+    """
+
+    loop = asyncio.get_running_loop()
+    metrics = get_metrics()
+    seen_links: set[str] = set()
+    records: list[NewsItem] = []
+    duplicates: list[NewsItem] = []
+    pending: asyncio.Task[list[NewsItem]] | None = None
+    done = False
+    while not done:
+        batch: list[NewsItem] = []
+        item = await queue.get()
+        while True:
+            if item is None:
+                done = True
+                break
+            batch.extend(item)
+            if len(batch) >= settings.sentiment_micro_batch_size or queue.empty():
+                break
+            item = queue.get_nowait()
+        dedup_started = time.perf_counter()
+        fresh, repeated = clusters.partition(_deduplicate(batch, seen_links))
+        if lease_owner is not None and fresh:
+            claimed = set(
+                await run_in_session(
+                    settings.database_url,
+                    claim_links,
+                    [item.link for item in fresh],
+                    lease_owner,
+                    settings.lease_ttl_seconds,
+                )
+            )
+            fresh = [item for item in fresh if item.link in claimed]
+        metrics.observe_dedup(len(batch), len(fresh), time.perf_counter() - dedup_started)
+        duplicates.extend(repeated)
+        if not fresh and not repeated:
+            continue
+        scored = await loop.run_in_executor(executor, _score_articles, settings, fresh) if fresh else []
+        if pending is not None:
+            records.extend(await pending)
+        pending = asyncio.create_task(_store(settings, scored, repeated))
+    if pending is not None:
+        records.extend(await pending)
+    return records, duplicates
+
+
+async def _store(settings: Settings, records: list[NewsItem], duplicates: list[NewsItem]) -> list[NewsItem]:
+    inserted = set(await _persist(settings, records, duplicates))
+    return [record for record in records if record.link in inserted]
+
+
+async def _run_async(
+    settings: Settings,
+    feed_states: dict[str, FeedValidators],
+    seen: SeenLinks,
+    clusters: NearDuplicateIndex,
+    lease_owner: str | None = None,
+) -> tuple[list[NewsItem], list[NewsItem]]:
+    """Fetch and score concurrently: fetch tasks feed a queue drained by the sentiment worker."""
+
+    async def _fetch(queue: asyncio.Queue[list[NewsItem] | None]) -> None:
+        await fetch_feeds(settings, feed_states, seen, on_articles=queue.put_nowait)
+
+    return await _drain(settings, _fetch, clusters, lease_owner)
+
+
+async def _drain(
+    settings: Settings,
+    produce: Callable[[asyncio.Queue[list[NewsItem] | None]], Awaitable[None]],
+    clusters: NearDuplicateIndex,
+    lease_owner: str | None = None,
+    backlog: int = 0,
+) -> tuple[list[NewsItem], list[NewsItem]]:
+    """Run ``produce`` against a queue drained by :func:`_annotate_from_queue` (``backlog`` bounds it)."""
+
+    queue: asyncio.Queue[list[NewsItem] | None] = asyncio.Queue(backlog)
+
+    async def _produce() -> None:
+        try:
+            await produce(queue)
+        finally:
+            await queue.put(None)
+
+    with sentiment_executor() as executor:
+        producer = asyncio.create_task(_produce())
+        try:
+            records = await _annotate_from_queue(settings, queue, executor, clusters, lease_owner)
+        except BaseException:
+            producer.cancel()
+            raise
+        finally:
+            # The pool's connections are bound to this loop; the next asyncio.run gets fresh ones.
+            await get_async_engine(settings.database_url).dispose()
+        await producer
     return records
 
 
 def run_pipeline(settings: Settings | None = None) -> list[ArticleRecord]:
-    """Execute crawler pipeline and return article records."""
+    """Execute crawler pipeline and return records for newly stored articles.
+
+    Unchanged feeds and known links are skipped before parsing/validation, and
+    the export is left untouched when nothing new was stored, except that a
+    rolling ``export_window_hours`` export is always rebuilt so aged-out
+    articles leave it. Internally
+    articles travel as :class:`NewsItem`; they are validated into records only
+    on the way out. Near-duplicates of stories seen within the dedup window
+    are linked to their cluster but neither scored nor stored as articles.
+    """
 
     settings = settings or get_settings()
-    records = asyncio.run(_run_async(settings))
-    _persist(settings, records)
-    write_json(settings.output_path, records)
-    return records
+    metrics = get_metrics()
+    metrics.reset()
+    if settings.shard_workers > 1:
+        from .sharding import run_sharded
+
+        items = run_sharded(settings)
+    else:
+        items = crawl_once(settings)
+    if items:
+        export_articles(settings, items)
+        export_aggregates(settings)
+    elif settings.export_window_hours is not None:
+        export_articles(settings, items)
+    logger.info("Pipeline run finished: %d new articles", len(items), extra={"stats": metrics.summary()})
+    return [item.to_record() for item in items]
+
+
+def crawl_once(settings: Settings, lease_owner: str | None = None) -> list[NewsItem]:
+    """Fetch, score and store one round of the configured feeds without exporting."""
+
+    feed_states = _load_feed_states(settings)
+    seen = load_seen_links(settings)
+    clusters = load_clusters(settings)
+    items, _duplicates = asyncio.run(_run_async(settings, feed_states, seen, clusters, lease_owner))
+    _save_feed_states(settings, feed_states)
+    return items
+
+
+def run_replay(
+    settings: Settings,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    sources: Collection[str] | None = None,
+) -> list[ArticleRecord]:
+    """Replay archived payloads like :func:`run_pipeline`, without the network.
+
+    Articles already in the database are skipped, so replaying into a fresh
+    ``database_url`` reproduces a past crawl and replaying into the live one
+    backfills whatever it is missing.
+    """
+
+    metrics = get_metrics()
+    metrics.reset()
+    items = replay_archive(settings, since, until, sources)
+    if items:
+        export_articles(settings, items)
+        export_aggregates(settings)
+    elif settings.export_window_hours is not None:
+        export_articles(settings, items)
+    logger.info("Replay finished: %d new articles", len(items), extra={"stats": metrics.summary()})
+    return [item.to_record() for item in items]
+
+
+def replay_archive(
+    settings: Settings,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    sources: Collection[str] | None = None,
+) -> list[NewsItem]:
+    """Parse, score and store archived payloads fetched in ``[since, until)`` without exporting."""
+
+    archive = open_archive(settings)
+    if archive is None:
+        raise ValueError("Replay needs an archive; set CRAWLER_ARCHIVE_DIR")
+    entries = archive.entries(since, until, sources)
+    logger.info("Replaying %d archived payloads from %s", len(entries), archive.directory)
+    seen = load_seen_links(settings)
+    items, _duplicates = asyncio.run(_replay_async(settings, archive, entries, seen))
+    return items
+
+
+async def _replay_async(
+    settings: Settings,
+    archive: FeedArchive,
+    entries: list[ArchiveEntry],
+    seen: SeenLinks,
+) -> tuple[list[NewsItem], list[NewsItem]]:
+    metrics = get_metrics()
+    # The dedup window follows archive time, not wall-clock time.
+    replayed_at = [entries[0].fetched_at.timestamp() if entries else time.time()]
+    clusters = NearDuplicateIndex(
+        settings.dedup_window_hours * 3600, settings.dedup_max_distance, clock=lambda: replayed_at[0]
+    )
+
+    def _load(entry: ArchiveEntry) -> list[NewsItem]:
+        started = time.perf_counter()
+        articles = parse_feed(archive.read(entry), entry.source, seen)
+        metrics.observe("parse", time.perf_counter() - started, len(articles), entry.size)
+        return articles
+
+    async def _read(queue: asyncio.Queue[list[NewsItem] | None]) -> None:
+        for entry in entries:
+            # Decompression and parsing run off the loop, overlapping with scoring.
+            articles = await asyncio.to_thread(_load, entry)
+            replayed_at[0] = entry.fetched_at.timestamp()
+            if articles:
+                await queue.put(articles)
+
+    return await _drain(settings, _read, clusters, backlog=_REPLAY_BACKLOG)
+
+
+def export_articles(
+    settings: Settings,
+    new_items: Iterable[NewsItem],
+    snapshot: Iterable[NewsItem] | None = None,
+) -> int:
+    """Write the configured export and return how many records it received.
+
+    With ``export_window_hours`` the export is rebuilt from the database; in
+    ``append`` mode only ``new_items`` are appended; otherwise the file is
+    replaced by ``snapshot`` (defaulting to ``new_items``).
+    """
+
+    with get_metrics().timed("export") as span:
+        span.items = _export_articles(settings, new_items, snapshot)
+    return span.items
+
+
+def _export_articles(
+    settings: Settings,
+    new_items: Iterable[NewsItem],
+    snapshot: Iterable[NewsItem] | None,
+) -> int:
+    path = settings.output_path
+    if settings.export_window_hours is not None:
+        since = datetime.now(timezone.utc) - timedelta(hours=settings.export_window_hours)
+        with init_db(settings.database_url) as session:
+            return write_json(path, iter_articles(session, since=since))
+    if settings.export_mode == "append":
+        return append_json(path, new_items)
+    return write_json(path, snapshot if snapshot is not None else new_items)
+
+
+def export_aggregates(settings: Settings) -> int:
+    """Write recent per-source sentiment buckets next to the article export."""
+
+    path = settings.aggregates_path or settings.output_path.with_name("aggregates.json")
+    since = datetime.now(timezone.utc) - timedelta(hours=settings.aggregates_window_hours)
+    with get_metrics().timed("export") as span:
+        with init_db(settings.database_url) as session:
+            rows = [
+                row
+                for resolution in AGGREGATE_RESOLUTIONS
+                for row in sentiment_aggregates(session, resolution=resolution, since=since)
+            ]
+        span.items = write_payloads(path, (row.model_dump(mode="json") for row in rows))
+    return span.items
+
+
+def load_seen_links(settings: Settings) -> SeenLinks:
+    """Warm the seen-link index from the most recently stored articles."""
+
+    seen = SeenLinks(settings.seen_links_capacity)
+    if settings.seen_links_capacity:
+        with init_db(settings.database_url) as session:
+            seen.update(load_recent_links(session, settings.seen_links_capacity))
+    return seen
+
+
+def load_clusters(settings: Settings) -> NearDuplicateIndex:
+    """Build the near-duplicate index, warmed with stories inside the window."""
+
+    clusters = NearDuplicateIndex(settings.dedup_window_hours * 3600, settings.dedup_max_distance)
+    since = datetime.now(timezone.utc) - timedelta(hours=settings.dedup_window_hours)
+    with init_db(settings.database_url) as session:
+        clusters.warm(load_recent_clusters(session, since))
+    return clusters
+
+
+async def _persist(
+    settings: Settings,
+    records: Iterable[NewsItem],
+    duplicates: Iterable[NewsItem] = (),
+    states: Iterable[FeedValidators] = (),
+) -> list[str]:
+    with get_metrics().timed("store") as span:
+        inserted = await run_in_session(
+            settings.database_url, store_batch, list(records), list(duplicates), list(states)
+        )
+        span.items = len(inserted)
+    return inserted
+
 
+def _load_feed_states(settings: Settings) -> dict[str, FeedValidators]:
+    # Only this crawl's feeds, so a shard never writes back another shard's stale validators.
+    urls = {feed.url for feed in load_feeds(settings)}
+    with init_db(settings.database_url) as session:
+        return {url: state for url, state in load_feed_states(session).items() if url in urls}
 
-def _persist(settings: Settings, records: Iterable[ArticleRecord]) -> None:
-    if settings.database_url.startswith("sqlite:///"):
-        db_path = Path(settings.database_url.replace("sqlite:///", ""))
-        if db_path.parent:
-            db_path.parent.mkdir(parents=True, exist_ok=True)
-    session: Session = init_db(settings.database_url)
-    try:
-        upsert_articles(session, records)
-    finally:
-        session.close()
 
+def _save_feed_states(settings: Settings, feed_states: dict[str, FeedValidators]) -> None:
+    # Validators are saved only after persistence so a failed run re-processes the feed.
+    with init_db(settings.database_url) as session:
+        save_feed_states(session, feed_states.values())
@@ -0,0 +1,311 @@
+"""Read-side queries over stored articles.
+
+Article queries transparently include the monthly partitions that
+:mod:`.retention` rolls old articles into, opening only those whose month
+overlaps the requested time range.
+"""
+
+from __future__ import annotations
+
+import heapq
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Iterator
+
+from sqlalchemy import Select, and_, column, func, literal, literal_column, or_, select, table
+from sqlalchemy.orm import Session
+
+from .database import (
+    AGGREGATE_RESOLUTIONS,
+    FTS_TABLE,
+    Article,
+    ArticleCluster,
+    ArticleTicker,
+    Partition,
+    SentimentAggregate,
+    init_db,
+    list_partitions,
+)
+from .dates import parse_datetime, to_utc
+from .schemas import NewsItem, SentimentAggregateRecord
+
+
+_DURATION = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([smhdw])\s*$", re.IGNORECASE)
+_DURATION_UNITS = {"s": "seconds", "m": "minutes", "h": "hours", "d": "days", "w": "weeks"}
+_FTS = table(FTS_TABLE, column("rowid"), column(FTS_TABLE))
+# Title hits weigh twice as much as summary hits in the bm25 rank.
+_FTS_WEIGHTS = (2.0, 1.0)
+# Links per IN (...) lookup when loading tickers and clusters for a page of articles.
+_LOAD_CHUNK_SIZE = 500
+
+
+def parse_since(value: str, now: datetime | None = None) -> datetime:
+    """Parse ``24h``/``30m``/``7d``-style durations or an absolute timestamp into UTC."""
+
+    match = _DURATION.match(value)
+    if match:
+        amount, unit = match.groups()
+        delta = timedelta(**{_DURATION_UNITS[unit.lower()]: float(amount)})
+        return (now or datetime.now(timezone.utc)) - delta
+    parsed = parse_datetime(value)
+    if parsed is None:
+        raise ValueError(f"Expected a duration like '24h' or a timestamp, got {value!r}")
+    return parsed
+
+
+def article_to_item(article: Article) -> NewsItem:
+    return NewsItem(
+        source=article.source,
+        title=article.title,
+        link=article.link,
+        summary=article.summary,
+        # SQLite hands back naive datetimes; everything is stored as UTC.
+        published_at=to_utc(article.published_at) if article.published_at else None,
+        sentiment_label=article.sentiment_label,
+        sentiment_score=article.sentiment_score,
+    )
+
+
+def _load_items(session: Session, articles: Iterable[Article]) -> list[NewsItem]:
+    """Convert ``articles`` and fill in their stored tickers and cluster ids.
+
+    Both are batch-loaded from ``session`` (which must be the one the rows came
+    from), so DB-backed output has the same shape as the crawl-time export.
+    Tickers come back in symbol order.
+    """
+
+    items = [article_to_item(article) for article in articles]
+    by_link = {item.link: item for item in items}
+    links = list(by_link)
+    for start in range(0, len(links), _LOAD_CHUNK_SIZE):
+        chunk = links[start : start + _LOAD_CHUNK_SIZE]
+        tickers = select(ArticleTicker.link, ArticleTicker.ticker).where(ArticleTicker.link.in_(chunk))
+        for link, ticker in session.execute(tickers.order_by(ArticleTicker.ticker)):
+            by_link[link].tickers.append(ticker)
+        clusters = select(ArticleCluster.link, ArticleCluster.cluster_id).where(ArticleCluster.link.in_(chunk))
+        for link, cluster_id in session.execute(clusters):
+            by_link[link].cluster_id = cluster_id
+    return items
+
+
+def _partitions(session: Session, since: datetime | None, until: datetime | None) -> list[Partition]:
+    return list_partitions(session.get_bind().url.render_as_string(hide_password=False), since, until)
+
+
+def _newest_first(item: NewsItem) -> datetime:
+    return item.published_at
+
+
+def _where(
+    statement: Select[tuple[Article]],
+    since: datetime | None,
+    until: datetime | None,
+    source: str | None,
+    label: str | None,
+) -> Select[tuple[Article]]:
+    if source is not None:
+        statement = statement.where(Article.source == source)
+    if label is not None:
+        statement = statement.where(Article.sentiment_label == label)
+    if since is not None:
+        statement = statement.where(Article.published_at >= since)
+    if until is not None:
+        statement = statement.where(Article.published_at < until)
+    return statement
+
+
+def _filtered(
+    since: datetime | None,
+    until: datetime | None,
+    source: str | None,
+    label: str | None,
+    ticker: str | None = None,
+) -> Select[tuple[Article]]:
+    statement = select(Article).where(Article.published_at.is_not(None))
+    if ticker is not None:
+        statement = statement.join(ArticleTicker, ArticleTicker.link == Article.link).where(
+            ArticleTicker.ticker == ticker.upper()
+        )
+    statement = _where(statement, since, until, source, label)
+    return statement.order_by(Article.published_at.desc(), Article.id.desc())
+
+
+def recent_articles(
+    session: Session,
+    since: datetime | None = None,
+    source: str | None = None,
+    label: str | None = None,
+    limit: int = 100,
+    until: datetime | None = None,
+    ticker: str | None = None,
+) -> list[NewsItem]:
+    """Return the newest articles matching the filters.
+
+    Served by the ``(source, published_at)`` or ``(sentiment_label,
+    published_at)`` index depending on the filter given; ``ticker`` goes
+    through the ``article_tickers`` primary key. Partitions are read newest
+    first and only until ``limit`` articles newer than the next one are found.
+    """
+
+    statement = _filtered(since, until, source, label, ticker).limit(limit)
+    items = _load_items(session, session.scalars(statement))
+    for partition in _partitions(session, since, until):
+        if len(items) >= limit and items[limit - 1].published_at >= partition.end:
+            break
+        with init_db(partition.url) as part:
+            items.extend(_load_items(part, part.scalars(statement)))
+        items.sort(key=_newest_first, reverse=True)
+        del items[limit:]
+    return items
+
+
+def iter_articles(
+    session: Session,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    source: str | None = None,
+    label: str | None = None,
+    page_size: int = 500,
+    ticker: str | None = None,
+) -> Iterator[NewsItem]:
+    """Yield matching articles newest first using keyset pagination.
+
+    Each page resumes after the last ``(published_at, id)`` seen instead of
+    using ``OFFSET``, so deep pages cost the same as the first one. Articles
+    without a publication date are not returned. Overlapping partitions are
+    paged the same way and merged in.
+    """
+
+    pages = _iter_pages(session, since, until, source, label, page_size, ticker)
+    partitions = _partitions(session, since, until)
+    if not partitions:
+        yield from pages
+        return
+    others = (_iter_partition(partition, since, until, source, label, page_size, ticker) for partition in partitions)
+    yield from heapq.merge(pages, *others, key=_newest_first, reverse=True)
+
+
+def _iter_partition(partition: Partition, *filters: object) -> Iterator[NewsItem]:
+    with init_db(partition.url) as session:
+        yield from _iter_pages(session, *filters)
+
+
+def _iter_pages(
+    session: Session,
+    since: datetime | None,
+    until: datetime | None,
+    source: str | None,
+    label: str | None,
+    page_size: int,
+    ticker: str | None,
+) -> Iterator[NewsItem]:
+    cursor: tuple[datetime, int] | None = None
+    while True:
+        statement = _filtered(since, until, source, label, ticker)
+        if cursor is not None:
+            published_at, article_id = cursor
+            statement = statement.where(
+                or_(
+                    Article.published_at < published_at,
+                    and_(Article.published_at == published_at, Article.id < article_id),
+                )
+            )
+        page = list(session.scalars(statement.limit(page_size)))
+        yield from _load_items(session, page)
+        if len(page) < page_size:
+            return
+        cursor = (page[-1].published_at, page[-1].id)
+
+
+def fts_query(text: str) -> str:
+    """Quote every word of ``text`` as an FTS5 phrase so all must match.
+
+    Punctuation and FTS operators in user input are taken literally instead
+    of raising a syntax error.
+    """
+
+    return " ".join('"{}"'.format(word.replace('"', '""')) for word in text.split())
+
+
+def search_articles(
+    session: Session,
+    text: str,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    source: str | None = None,
+    label: str | None = None,
+    limit: int = 50,
+    raw: bool = False,
+) -> list[NewsItem]:
+    """Return articles whose title or summary match ``text``, best match first.
+
+    On SQLite this is a ``MATCH`` against the ``articles_fts`` index ranked by
+    bm25; ``raw`` passes ``text`` through as FTS5 query syntax (``"rate hike"
+    OR cut``, ``fed*``). Other databases fall back to a case-insensitive
+    substring match on every word, newest first. Matches from overlapping
+    partitions are merged by their (per-file) bm25 rank.
+    """
+
+    if not text.strip():
+        return []
+    if session.get_bind().dialect.name == "sqlite":
+        match = text if raw else fts_query(text)
+        rank = func.bm25(literal_column(FTS_TABLE), *_FTS_WEIGHTS)
+        statement = (
+            select(Article, rank)
+            .join(_FTS, _FTS.c.rowid == Article.id)
+            .where(_FTS.c[FTS_TABLE].match(match))
+            .order_by(rank, Article.published_at.desc())
+        )
+    else:
+        statement = select(Article, literal(0))
+        for word in text.split():
+            pattern = f"%{word}%"
+            statement = statement.where(or_(Article.title.ilike(pattern), Article.summary.ilike(pattern)))
+        statement = statement.order_by(Article.published_at.desc(), Article.id.desc())
+    statement = _where(statement, since, until, source, label).limit(limit)
+    ranked = _ranked_items(session, statement)
+    partitions = _partitions(session, since, until)
+    for partition in partitions:
+        with init_db(partition.url) as part:
+            ranked.extend(_ranked_items(part, statement))
+    if partitions:
+        ranked.sort(key=lambda pair: pair[1])
+    return [item for item, _rank in ranked[:limit]]
+
+
+def _ranked_items(session: Session, statement: Select[tuple[Article, float]]) -> list[tuple[NewsItem, float]]:
+    rows = list(session.execute(statement))
+    items = _load_items(session, (article for article, _rank in rows))
+    return [(item, rank) for item, (_article, rank) in zip(items, rows)]
+
+
+def sentiment_aggregates(
+    session: Session,
+    resolution: str = "minute",
+    since: datetime | None = None,
+    source: str | None = None,
+) -> list[SentimentAggregateRecord]:
+    """Return stored sentiment buckets, oldest first, without touching ``articles``."""
+
+    if resolution not in AGGREGATE_RESOLUTIONS:
+        raise ValueError(f"Unknown resolution {resolution!r}; expected one of {sorted(AGGREGATE_RESOLUTIONS)}")
+    query = select(SentimentAggregate).where(SentimentAggregate.resolution == resolution)
+    if since is not None:
+        query = query.where(SentimentAggregate.bucket_start >= to_utc(since))
+    if source is not None:
+        query = query.where(SentimentAggregate.source == source)
+    query = query.order_by(SentimentAggregate.bucket_start, SentimentAggregate.source)
+    return [
+        SentimentAggregateRecord(
+            source=row.source,
+            resolution=row.resolution,
+            bucket_start=to_utc(row.bucket_start),
+            count=row.count,
+            mean_score=row.score_sum / row.count if row.count else 0.0,
+            positive_ratio=row.positive / row.count if row.count else 0.0,
+            negative_ratio=row.negative / row.count if row.count else 0.0,
+            ewma=row.ewma,
+        )
+        for row in session.scalars(query)
+    ]
@@ -0,0 +1,220 @@
+"""Retention for the SQLite article store: monthly partitions and compaction.
+
+Articles published before the hot window are moved out of the live
+database into one SQLite file per month (``data/news.db`` ->
+``data/news-2024-01.db``) with the same schema, full-text index included.
+The live database, its ``link`` index and every write therefore stay
+the size of the hot window, while the read queries in :mod:`.query` merge
+in whichever partitions overlap the requested time range.
+
+Each month is copied and committed before the originals are deleted, so
+an interrupted roll leaves duplicates that the next run cleans up rather
+than losing rows. The other per-headline tables are pruned in place:
+minute-resolution sentiment buckets older than the hot window are deleted
+(hour buckets stay as the long-term series), and so are persistent
+sentiment cache entries whose headline no longer appears in the live
+database.
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import MetaData, Select, Table, and_, delete, func, insert, select
+from sqlalchemy.engine import Connection
+
+from .database import (
+    FTS_TABLE,
+    Article,
+    ArticleCluster,
+    ArticleTicker,
+    SentimentAggregate,
+    SentimentCacheEntry,
+    ensure_schema,
+    get_engine,
+    list_partitions,
+    month_bounds,
+    partition_for,
+    sqlite_path,
+)
+from .settings import Settings
+
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = "part"
+_PARTITION = MetaData()
+_ARTICLES = Article.__table__.to_metadata(_PARTITION, schema=_SCHEMA)
+_TICKERS = ArticleTicker.__table__.to_metadata(_PARTITION, schema=_SCHEMA)
+_CLUSTERS = ArticleCluster.__table__.to_metadata(_PARTITION, schema=_SCHEMA)
+
+
+def _copy(connection: Connection, target: Table, rows: Select) -> None:
+    columns = [column.name for column in rows.selected_columns]
+    connection.execute(insert(target).prefix_with("OR IGNORE").from_select(columns, rows))
+
+
+def _move_month(connection: Connection, start: datetime, end: datetime) -> int:
+    articles, tickers, clusters = Article.__table__, ArticleTicker.__table__, ArticleCluster.__table__
+    window = and_(articles.c.published_at >= start, articles.c.published_at < end)
+    cluster_window = and_(clusters.c.published_at >= start, clusters.c.published_at < end)
+
+    connection.exec_driver_sql("BEGIN IMMEDIATE")
+    # Partitions assign their own ids; everything else is copied verbatim.
+    _copy(connection, _ARTICLES, select(*(column for column in articles.c if column.name != "id")).where(window))
+    _copy(connection, _TICKERS, select(tickers).join(articles, articles.c.link == tickers.c.link).where(window))
+    _copy(connection, _CLUSTERS, select(clusters).where(cluster_window))
+    connection.exec_driver_sql("COMMIT")
+
+    moved = select(_ARTICLES.c.link)
+    connection.exec_driver_sql("BEGIN IMMEDIATE")
+    connection.execute(
+        delete(tickers).where(tickers.c.link.in_(select(articles.c.link).where(window, articles.c.link.in_(moved))))
+    )
+    count = connection.execute(delete(articles).where(window, articles.c.link.in_(moved))).rowcount
+    connection.execute(delete(clusters).where(cluster_window, clusters.c.link.in_(select(_CLUSTERS.c.link))))
+    connection.exec_driver_sql("COMMIT")
+    return count
+
+
+def roll_partitions(database_url: str, before: datetime) -> dict[str, int]:
+    """Move articles published before ``before`` into monthly partitions.
+
+    Returns the number of articles moved per ``YYYY-MM``. Only SQLite files
+    are partitioned; other databases are left alone.
+    """
+
+    path = sqlite_path(database_url)
+    if path is None:
+        return {}
+    engine = get_engine(database_url)
+    articles = Article.__table__
+    with engine.connect() as connection:
+        months = connection.scalars(
+            select(func.strftime("%Y-%m", articles.c.published_at)).where(articles.c.published_at < before).distinct()
+        ).all()
+
+    moved: dict[str, int] = {}
+    # ATTACH/DETACH and VACUUM cannot run inside a transaction, so manage them by hand.
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        for month in sorted(months):
+            partition = partition_for(path, month)
+            ensure_schema(partition.url)  # the partition gets the full schema, FTS included
+            start, end = month_bounds(month)
+            connection.exec_driver_sql(f"ATTACH DATABASE ? AS {_SCHEMA}", (str(partition.path),))
+            try:
+                moved[month] = _move_month(connection, start, min(end, before))
+            except BaseException:
+                if connection.connection.dbapi_connection.in_transaction:
+                    connection.exec_driver_sql("ROLLBACK")
+                raise
+            finally:
+                connection.exec_driver_sql(f"DETACH DATABASE {_SCHEMA}")
+            logger.info("Rolled %d articles into %s", moved[month], partition.path)
+    return moved
+
+
+def prune_live(settings: Settings, before: datetime) -> dict[str, int]:
+    """Delete minute sentiment buckets before ``before`` and cache entries of rolled-out headlines.
+
+    The cache is keyed by a hash of model and headline, so entries are kept
+    for the titles still in the live database under the current model and
+    everything else goes. Returns how many rows each table lost.
+    """
+
+    if sqlite_path(settings.database_url) is None:
+        return {}
+    engine = get_engine(settings.database_url)
+    aggregates = SentimentAggregate.__table__
+    with engine.begin() as connection:
+        buckets = connection.execute(
+            delete(aggregates).where(aggregates.c.resolution == "minute", aggregates.c.bucket_start < before)
+        ).rowcount
+    pruned = {SentimentAggregate.__tablename__: buckets}
+    if not settings.sentiment_cache_persistent:
+        return pruned
+
+    from .sentiment import _cache_for
+
+    cache = _cache_for(settings)
+    with engine.begin() as connection:
+        keep = {cache.key(title) for title in connection.scalars(select(Article.title).distinct())}
+        connection.exec_driver_sql("CREATE TEMP TABLE keep_keys (key TEXT PRIMARY KEY)")
+        try:
+            if keep:
+                connection.exec_driver_sql("INSERT INTO keep_keys (key) VALUES (?)", [(key,) for key in keep])
+            pruned[SentimentCacheEntry.__tablename__] = connection.exec_driver_sql(
+                f"DELETE FROM {SentimentCacheEntry.__tablename__} WHERE key NOT IN (SELECT key FROM temp.keep_keys)"
+            ).rowcount
+        finally:
+            connection.exec_driver_sql("DROP TABLE temp.keep_keys")
+    return pruned
+
+
+def drop_partitions(database_url: str, before: datetime) -> list[str]:
+    """Delete partitions whose whole month ends before ``before``; returns their months."""
+
+    dropped: list[str] = []
+    for partition in list_partitions(database_url, until=before):
+        if partition.end > before:
+            continue
+        get_engine(partition.url).dispose()
+        for suffix in ("", "-wal", "-shm"):
+            partition.path.with_name(partition.path.name + suffix).unlink(missing_ok=True)
+        dropped.append(partition.month)
+        logger.info("Dropped partition %s", partition.path)
+    return dropped
+
+
+def compact(database_url: str) -> bool:
+    """Merge the full-text index segments, refresh planner statistics and VACUUM.
+
+    Returns ``False`` for databases other than SQLite, which are left alone.
+    """
+
+    engine = get_engine(database_url)
+    if engine.dialect.name != "sqlite":
+        return False
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        connection.exec_driver_sql(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')")
+        connection.exec_driver_sql("PRAGMA optimize")
+        connection.exec_driver_sql("VACUUM")
+        connection.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+    return True
+
+
+def run_retention(
+    settings: Settings,
+    hot_days: float | None = None,
+    keep_months: int | None = None,
+    vacuum: bool = True,
+    now: datetime | None = None,
+) -> dict[str, object]:
+    """Roll, drop and compact per ``settings`` (or the overrides) and summarize what was done."""
+
+    now = now or datetime.now(timezone.utc)
+    hot_days = hot_days if hot_days is not None else settings.retention_hot_days
+    keep_months = keep_months if keep_months is not None else settings.retention_months
+    database_url = settings.database_url
+
+    rolled: dict[str, int] = {}
+    pruned: dict[str, int] = {}
+    if hot_days is not None:
+        before = now - timedelta(days=hot_days)
+        rolled = roll_partitions(database_url, before)
+        pruned = prune_live(settings, before)
+    dropped: list[str] = []
+    if keep_months is not None:
+        oldest_kept = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        for _ in range(keep_months):
+            oldest_kept = (oldest_kept - timedelta(days=1)).replace(day=1)
+        dropped = drop_partitions(database_url, oldest_kept)
+    compacted: list[str] = []
+    if vacuum:
+        # The live database always; partitions only when this run wrote to them and kept them.
+        kept = [month for month in rolled if month not in dropped]
+        for url in [database_url, *(partition_for(sqlite_path(database_url), month).url for month in kept)]:
+            if compact(url):
+                compacted.append(url)
+    return {"rolled": rolled, "pruned": pruned, "dropped": dropped, "compacted": compacted}
@@ -1,13 +1,21 @@
-"""Pydantic schemas for structured crawler data."""
+"""Data contracts for structured crawler data.
+
+Pydantic models validate data at the package boundaries; :class:`NewsItem` is
+the compact record passed between the internal fetch, sentiment, persistence
+and export stages.
+"""
 
 from __future__ import annotations
 
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional
 
-from pydantic import BaseModel, HttpUrl, field_validator
+from pydantic import BaseModel, Field, HttpUrl, ValidationInfo, field_validator
 from pydantic.config import ConfigDict
 
+from .dates import parse_datetime
+
 
 class RawArticle(BaseModel):
     """Intermediate representation parsed from RSS feeds."""
@@ -20,46 +28,19 @@ class RawArticle(BaseModel):
 
     @field_validator("published_at", mode="before")
     @classmethod
-    def _parse_datetime(cls, value: Optional[str]) -> Optional[datetime]:
-        if value is None or isinstance(value, datetime):
-            return value
-            
-        # Common RSS date formats to try
-        formats = [
-            # Standard RSS format with timezone
-            "%a, %d %b %Y %H:%M:%S %z",
-            # ISO 8601 with timezone
-            "%Y-%m-%dT%H:%M:%S%z",
-            # ISO 8601 with Zulu time
-            "%Y-%m-%dT%H:%M:%SZ",
-            # Date only
-            "%Y-%m-%d",
-            # Common web format
-            "%Y-%m-%d %H:%M:%S",
-            # With timezone offset without colon
-            "%Y-%m-%d %H:%M:%S%z",
-            # RFC 822/1123 format
-            "%a, %d %b %Y %H:%M:%S %Z",
-            # CNBC format (if different)
-            "%a, %d %b %Y %H:%M:%S %z",
-            # Fallback for dates like '2023-04-15T12:34:56.789Z'
-            "%Y-%m-%dT%H:%M:%S.%fZ",
-        ]
-        
-        for fmt in formats:
-            try:
-                # Try with the format as-is
-                return datetime.strptime(value, fmt)
-            except ValueError:
-                # Try stripping whitespace and trying again
-                try:
-                    return datetime.strptime(value.strip(), fmt)
-                except (ValueError, AttributeError):
-                    continue
-        
-        # If we get here, log the unparsable date for debugging
-        print(f"Warning: Could not parse date: {value}")
-        return None
+    def _parse_datetime(cls, value: Optional[str], info: ValidationInfo) -> Optional[datetime]:
+        return parse_datetime(value, info.data.get("source"))
+
+    def to_item(self) -> NewsItem:
+        """Convert validated external input into the internal record type."""
+
+        return NewsItem(
+            source=self.source,
+            title=self.title,
+            link=str(self.link),
+            summary=self.summary,
+            published_at=self.published_at,
+        )
 
 
 class ArticleSentiment(BaseModel):
@@ -79,5 +60,91 @@ class ArticleRecord(BaseModel):
     published_at: Optional[datetime]
     sentiment_label: str
     sentiment_score: float
+    cluster_id: Optional[str] = None
+    tickers: list[str] = Field(default_factory=list)
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class SentimentAggregateRecord(BaseModel):
+    """Sentiment statistics for one source over one time bucket."""
+
+    source: str
+    resolution: str
+    bucket_start: datetime
+    count: int
+    mean_score: float
+    positive_ratio: float
+    negative_ratio: float
+    ewma: float
+
+
+@dataclass(slots=True)
+class NewsItem:
+    """Article on the hot path: built once by the parser and enriched in place."""
+
+    source: str
+    title: str
+    link: str
+    summary: Optional[str] = None
+    published_at: Optional[datetime] = None
+    sentiment_label: Optional[str] = None
+    sentiment_score: Optional[float] = None
+    cluster_id: Optional[str] = None
+    tickers: list[str] = field(default_factory=list)
+
+    def to_json(self) -> dict[str, object]:
+        """Return a JSON-ready mapping shaped like ``ArticleRecord.model_dump(mode="json")``."""
+
+        published_at = self.published_at
+        return {
+            "source": self.source,
+            "title": self.title,
+            "link": self.link,
+            "summary": self.summary,
+            "published_at": published_at.isoformat().replace("+00:00", "Z") if published_at else None,
+            "sentiment_label": self.sentiment_label,
+            "sentiment_score": self.sentiment_score,
+            "cluster_id": self.cluster_id,
+            "tickers": list(self.tickers),
+        }
+
+    def to_record(self) -> ArticleRecord:
+        """Validate into the public :class:`ArticleRecord` contract."""
+
+        return ArticleRecord(
+            source=self.source,
+            title=self.title,
+            link=self.link,
+            summary=self.summary,
+            published_at=self.published_at,
+            sentiment_label=self.sentiment_label,
+            sentiment_score=self.sentiment_score,
+            cluster_id=self.cluster_id,
+            tickers=list(self.tickers),
+        )
+
+
+class FeedConfig(BaseModel):
+    """A feed entry in the crawler's registry."""
+
+    name: str
+    url: str
+    interval_seconds: Optional[float] = Field(default=None, gt=0)
+    enabled: bool = True
+
+
+class TickerConfig(BaseModel):
+    """An instrument in the tagging universe and the names it goes by."""
+
+    symbol: str = Field(min_length=1)
+    aliases: list[str] = Field(default_factory=list)
+
+
+class FeedValidators(BaseModel):
+    """HTTP cache validators remembered for a feed between polls."""
+
+    url: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    content_hash: Optional[str] = None
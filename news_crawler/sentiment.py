@@ -2,43 +2,275 @@
 
 from __future__ import annotations
 
+import contextlib
+import hashlib
+import sys
 from functools import lru_cache
+from pathlib import Path
 from typing import Iterable, List, TYPE_CHECKING
 
 if TYPE_CHECKING:  # pragma: no cover
     from transformers.pipelines import TextClassificationPipeline
 
-from .schemas import ArticleSentiment, RawArticle
+from .cache import LRUCache
+from .database import init_db, load_cached_sentiments, store_cached_sentiments
+from .schemas import NewsItem
 from .settings import Settings
 
 
 @lru_cache
-def get_sentiment_pipeline(model_name: str, device) -> "TextClassificationPipeline":
+def get_sentiment_pipeline(model_name: str, device, num_threads: int | None = None) -> "TextClassificationPipeline":
     """Cache the pipeline by model/device."""
 
     from transformers import pipeline  # local import to keep optional dependency lazy
 
+    if num_threads:
+        import torch
+
+        torch.set_num_threads(num_threads)
     return pipeline("sentiment-analysis", model=model_name, device=device)
 
 
-def annotate_sentiment(settings: Settings, articles: Iterable[RawArticle]) -> List[tuple[RawArticle, ArticleSentiment]]:
-    pipe = get_sentiment_pipeline(
+class OnnxSentimentPipeline:
+    """Text-classification pipeline running an exported model on ONNX Runtime.
+
+    ``model_dir`` is the output of ``optimum-cli export onnx --task
+    text-classification``: ``model.onnx`` next to the tokenizer and config files.
+    Only the tokenizer is taken from transformers, so torch is never imported.
+    """
+
+    def __init__(self, model_dir: Path, quantize: bool = False, num_threads: int | None = None) -> None:
+        import onnxruntime
+        from transformers import AutoConfig, AutoTokenizer
+
+        model_path = model_dir / "model.onnx"
+        if quantize:
+            model_path = _quantized_copy(model_path)
+        options = onnxruntime.SessionOptions()
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        self.session = onnxruntime.InferenceSession(
+            str(model_path), options, providers=["CPUExecutionProvider"]
+        )
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        self.id2label = AutoConfig.from_pretrained(model_dir).id2label
+        self._input_names = [model_input.name for model_input in self.session.get_inputs()]
+
+    def __call__(self, texts, batch_size=None, truncation=True, max_length=None) -> list[dict]:
+        import numpy as np
+
+        encoded = self.tokenizer(
+            list(texts),
+            padding=True,
+            truncation=truncation,
+            max_length=max_length,
+            return_tensors="np",
+        )
+        inputs = {name: encoded[name].astype(np.int64) for name in self._input_names if name in encoded}
+        logits = self.session.run(None, inputs)[0]
+        exp = np.exp(logits - logits.max(axis=-1, keepdims=True))
+        probabilities = exp / exp.sum(axis=-1, keepdims=True)
+        best = probabilities.argmax(axis=-1)
+        return [
+            {"label": self.id2label[int(index)], "score": float(row[index])}
+            for row, index in zip(probabilities, best)
+        ]
+
+
+def _quantized_copy(model_path: Path) -> Path:
+    """Return an int8 dynamically quantized copy of ``model_path``, creating it once."""
+
+    quantized = model_path.with_name(f"{model_path.stem}.int8.onnx")
+    if not quantized.exists():
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        quantize_dynamic(str(model_path), str(quantized), weight_type=QuantType.QInt8)
+    return quantized
+
+
+@lru_cache
+def get_onnx_pipeline(model_dir: Path, quantize: bool = False, num_threads: int | None = None) -> OnnxSentimentPipeline:
+    """Cache the ONNX pipeline by exported model directory."""
+
+    return OnnxSentimentPipeline(model_dir, quantize=quantize, num_threads=num_threads)
+
+
+class StubSentimentPipeline:
+    """Deterministic model-free stand-in for benchmarks and offline runs.
+
+    Labels and scores are derived from a hash of the text, so repeated runs
+    score identically without loading transformers.
+    """
+
+    _LABELS = ("NEGATIVE", "NEUTRAL", "POSITIVE")
+
+    def __call__(self, texts, batch_size=None, truncation=True, max_length=None) -> list[dict]:
+        results: list[dict] = []
+        for text in texts:
+            digest = hashlib.blake2b(text.encode("utf-8"), digest_size=4).digest()
+            results.append(
+                {"label": self._LABELS[digest[0] % len(self._LABELS)], "score": 0.5 + digest[1] / 510}
+            )
+        return results
+
+
+def load_sentiment_backend(settings: Settings):
+    """Return the (cached) inference pipeline selected by ``settings.sentiment_backend``."""
+
+    if settings.sentiment_backend == "stub":
+        return StubSentimentPipeline()
+    if settings.sentiment_backend == "onnx":
+        return get_onnx_pipeline(
+            settings.sentiment_onnx_path,
+            quantize=settings.sentiment_onnx_quantize,
+            num_threads=settings.sentiment_num_threads,
+        )
+    return get_sentiment_pipeline(
         model_name=settings.sentiment_model_name,
         device=settings.sentiment_device,
+        num_threads=settings.sentiment_num_threads,
     )
-    titles = [article.title for article in articles]
-    if not titles:
-        return []
-    results = pipe(titles)
-    annotated: list[tuple[RawArticle, ArticleSentiment]] = []
-    for article, result in zip(articles, results):
-        annotated.append(
-            (
-                article,
-                ArticleSentiment(
-                    label=result["label"],
-                    score=float(result["score"]),
-                ),
+
+
+def _inference_context() -> contextlib.AbstractContextManager:
+    # Only torch-backed pipelines have imported torch; never import it for ONNX.
+    torch = sys.modules.get("torch")
+    if torch is None:
+        return contextlib.nullcontext()
+    return torch.inference_mode()
+
+
+def _token_lengths(pipe, texts: list[str], max_length: int) -> list[int]:
+    tokenizer = getattr(pipe, "tokenizer", None)
+    if tokenizer is None:
+        return [len(text) for text in texts]
+    encoded = tokenizer(texts, truncation=True, max_length=max_length)
+    return [len(ids) for ids in encoded["input_ids"]]
+
+
+def run_batched(pipe, texts: list[str], batch_size: int, max_length: int) -> list[dict]:
+    """Run ``pipe`` over ``texts`` in length-sorted batches, preserving input order.
+
+    Sorting by token length keeps similarly sized inputs together so each batch
+    pads to a short maximum instead of the longest title in the whole run.
+    """
+
+    lengths = _token_lengths(pipe, texts, max_length)
+    order = sorted(range(len(texts)), key=lengths.__getitem__)
+    results: list[dict] = [{}] * len(texts)
+    with _inference_context():
+        for start in range(0, len(order), batch_size):
+            indices = order[start : start + batch_size]
+            outputs = pipe(
+                [texts[index] for index in indices],
+                batch_size=len(indices),
+                truncation=True,
+                max_length=max_length,
             )
+            for index, output in zip(indices, outputs):
+                results[index] = output
+    return results
+
+
+def normalize_text(text: str) -> str:
+    """Case-fold and collapse whitespace so trivially different headlines match."""
+
+    return " ".join(text.casefold().split())
+
+
+Sentiment = tuple[str, float]
+
+
+class SentimentCache:
+    """Two-level sentiment cache: in-memory LRU in front of a database table.
+
+    Keys are a SHA-256 of the model name and the normalized text, so switching
+    models never serves stale labels. Values are ``(label, score)`` tuples.
+    """
+
+    def __init__(self, model_name: str, database_url: str | None = None, capacity: int = 50_000) -> None:
+        self.model_name = model_name
+        self.database_url = database_url
+        self._memory: LRUCache[str, Sentiment] = LRUCache(capacity)
+
+    def key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.model_name}\0{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, Sentiment]:
+        found: dict[str, Sentiment] = {}
+        missing: list[str] = []
+        for key in set(keys):
+            cached = self._memory.get(key)
+            if cached is None:
+                missing.append(key)
+            else:
+                found[key] = cached
+        if missing and self.database_url is not None:
+            with init_db(self.database_url) as session:
+                stored = load_cached_sentiments(session, missing)
+            for key, sentiment in stored.items():
+                self._memory.put(key, sentiment)
+                found[key] = sentiment
+        return found
+
+    def put_many(self, entries: dict[str, Sentiment]) -> None:
+        for key, sentiment in entries.items():
+            self._memory.put(key, sentiment)
+        if entries and self.database_url is not None:
+            with init_db(self.database_url) as session:
+                store_cached_sentiments(session, entries)
+
+
+@lru_cache
+def get_sentiment_cache(model_name: str, database_url: str | None, capacity: int) -> SentimentCache:
+    """Share one cache per model/backing store across pipeline runs."""
+
+    return SentimentCache(model_name, database_url, capacity)
+
+
+def _cache_for(settings: Settings) -> SentimentCache | None:
+    database_url = settings.database_url if settings.sentiment_cache_persistent else None
+    if database_url is None and settings.sentiment_cache_size <= 0:
+        return None
+    model_id = settings.sentiment_model_name
+    if settings.sentiment_backend == "onnx":
+        # The exported directory, not sentiment_model_name, decides which model runs.
+        model_id = f"onnx:{settings.sentiment_onnx_path.resolve()}"
+        if settings.sentiment_onnx_quantize:
+            # Quantized scores differ slightly, so they must not mix with fp32 entries.
+            model_id = f"{model_id}+int8"
+    elif settings.sentiment_backend == "stub":
+        model_id = "stub"
+    return get_sentiment_cache(model_id, database_url, settings.sentiment_cache_size)
+
+
+def annotate_sentiment(settings: Settings, articles: Iterable[NewsItem]) -> List[NewsItem]:
+    """Fill in sentiment on each article in place, running the model only on cache misses."""
+
+    articles = list(articles)
+    if not articles:
+        return []
+    cache = _cache_for(settings)
+    keys = [cache.key(article.title) if cache else article.title for article in articles]
+    known = cache.get_many(keys) if cache else {}
+
+    # Identical (normalized) titles within a batch are scored once.
+    misses: dict[str, str] = {}
+    for key, article in zip(keys, articles):
+        if key not in known:
+            misses.setdefault(key, article.title)
+    if misses:
+        pipe = load_sentiment_backend(settings)
+        results = run_batched(
+            pipe,
+            list(misses.values()),
+            batch_size=settings.sentiment_batch_size,
+            max_length=settings.sentiment_max_length,
         )
-    return annotated
+        computed = {key: (result["label"], float(result["score"])) for key, result in zip(misses, results)}
+        if cache:
+            cache.put_many(computed)
+        known.update(computed)
+    for key, article in zip(keys, articles):
+        article.sentiment_label, article.sentiment_score = known[key]
+    return articles
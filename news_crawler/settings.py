@@ -6,9 +6,11 @@ from functools import lru_cache
 from pathlib import Path
 from typing import Literal
 
-from pydantic import Field
+from pydantic import Field, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from .schemas import FeedConfig
+
 
 class Settings(BaseSettings):
     """Runtime configuration loaded from environment variables or defaults."""
@@ -21,8 +23,44 @@ class Settings(BaseSettings):
         default="https://www.cnbc.com/id/100003114/device/rss/rss.html",
         description="CNBC RSS feed offering top business news.",
     )
+    feeds: list[FeedConfig] = Field(
+        default_factory=list,
+        description="Feed registry; when empty (and no feeds_file) the Reuters/CNBC URLs are used.",
+    )
+    feeds_file: Path | None = Field(
+        default=None,
+        description="JSON file holding a list of feed entries merged into the registry.",
+    )
+    tickers_file: Path | None = Field(
+        default=None,
+        description="JSON list of {symbol, aliases} entries; enables ticker tagging when set.",
+    )
+    tickers_cache_dir: Path | None = Field(
+        default=Path("data/cache"),
+        description="Where the compiled ticker automaton is cached (None disables the disk cache).",
+    )
+    max_concurrent_fetches: int = Field(default=32, ge=1, description="Global cap on in-flight feed requests.")
+    max_fetches_per_host: int = Field(default=4, ge=1, description="Cap on in-flight requests to a single host.")
+    dns_cache_ttl_seconds: int = Field(default=300, ge=0)
+    keepalive_timeout_seconds: float = Field(default=30.0, ge=0)
     http_timeout_seconds: int = Field(default=15, ge=5, le=60)
     user_agent: str = Field(default="RealTimeFinancialNewsCrawler/0.1")
+    seen_links_capacity: int = Field(
+        default=100_000,
+        ge=0,
+        description="Size of the in-process index of stored links skipped before validation (0 disables).",
+    )
+    dedup_window_hours: float = Field(
+        default=24,
+        gt=0,
+        description="How long headlines stay in the near-duplicate index.",
+    )
+    dedup_max_distance: int = Field(
+        default=3,
+        ge=0,
+        le=15,
+        description="Largest SimHash bit distance at which two headlines may count as the same story.",
+    )
     sentiment_model_name: str = Field(
         default="distilbert-base-uncased-finetuned-sst-2-english",
         description="Hugging Face sentiment analysis model name.",
@@ -31,8 +69,128 @@ class Settings(BaseSettings):
         default=None,
         description="Device identifier passed to transformers pipeline.",
     )
+    sentiment_backend: Literal["torch", "onnx", "stub"] = Field(
+        default="torch",
+        description="Inference backend: PyTorch transformers pipeline, ONNX Runtime, or a deterministic stub.",
+    )
+    sentiment_onnx_path: Path | None = Field(
+        default=None,
+        description="Directory holding model.onnx plus tokenizer/config files exported from the model.",
+    )
+    sentiment_onnx_quantize: bool = Field(
+        default=False,
+        description="Use an int8 dynamically quantized copy of the ONNX model (created on first use).",
+    )
+    sentiment_batch_size: int = Field(
+        default=32,
+        ge=1,
+        description="Titles per inference batch after sorting by token length.",
+    )
+    sentiment_micro_batch_size: int = Field(
+        default=256,
+        ge=1,
+        description="Most queued articles handed to the sentiment worker at once while feeds stream in.",
+    )
+    sentiment_max_length: int = Field(
+        default=128,
+        ge=8,
+        le=512,
+        description="Token limit applied to every title (longer titles are truncated).",
+    )
+    sentiment_num_threads: int | None = Field(
+        default=None,
+        ge=1,
+        description="Intra-op thread count for torch on CPU; unset keeps torch's default.",
+    )
+    sentiment_cache_size: int = Field(
+        default=50_000,
+        ge=0,
+        description="Entries kept in the in-memory sentiment cache (0 disables the memory layer).",
+    )
+    sentiment_cache_persistent: bool = Field(
+        default=True,
+        description="Also persist sentiment results in the database's sentiment_cache table.",
+    )
     database_url: str = Field(default="sqlite:///data/news.db")
+    poll_interval_seconds: float = Field(
+        default=60.0,
+        gt=0,
+        description="Delay between successful polls of the same feed in daemon mode.",
+    )
+    poll_jitter_seconds: float = Field(
+        default=5.0,
+        ge=0,
+        description="Upper bound of the random delay added to every poll to spread requests.",
+    )
+    poll_max_backoff_seconds: float = Field(
+        default=900.0,
+        gt=0,
+        description="Ceiling for the exponential backoff applied after failed polls.",
+    )
+    shard_workers: int = Field(
+        default=1,
+        ge=1,
+        description="Worker processes a one-shot crawl splits the feed list across.",
+    )
+    lease_ttl_seconds: float = Field(
+        default=600.0,
+        gt=0,
+        description="How long a sharded worker's claim on an article link lasts before others may take it.",
+    )
+    metrics_host: str = Field(default="127.0.0.1", description="Interface for the daemon's metrics endpoint.")
+    metrics_port: int | None = Field(
+        default=None,
+        ge=0,
+        le=65535,
+        description="Serve Prometheus text metrics at /metrics on this port in daemon mode.",
+    )
+    retention_hot_days: float | None = Field(
+        default=None,
+        gt=0,
+        description="Roll articles published more than N days ago into monthly partition files (None keeps them live).",
+    )
+    retention_months: int | None = Field(
+        default=None,
+        ge=1,
+        description="Delete monthly partitions older than N whole months (None keeps them forever).",
+    )
+    archive_dir: Path | None = Field(
+        default=None,
+        description="Append every changed raw feed body to compressed segments here (None disables the archive).",
+    )
+    archive_compression: Literal["gzip", "zstd"] = Field(
+        default="gzip",
+        description="Codec for archive segments; zstd needs the optional zstandard package.",
+    )
+    archive_segment_mb: int = Field(default=64, ge=1, description="Size at which archive segments rotate.")
     output_path: Path = Field(default=Path("output/latest.json"))
+    export_mode: Literal["replace", "append"] = Field(
+        default="replace",
+        description="Rewrite the export each run, or append only newly stored articles (NDJSON paths only).",
+    )
+    export_window_hours: float | None = Field(
+        default=None,
+        gt=0,
+        description="When set, rebuild the export from the database with articles published in the last N hours.",
+    )
+
+    aggregates_path: Path | None = Field(
+        default=None,
+        description="Sentiment aggregates export; defaults to aggregates.json next to output_path.",
+    )
+    aggregates_window_hours: float = Field(
+        default=24,
+        gt=0,
+        description="How many hours of sentiment aggregates to export.",
+    )
+
+    @model_validator(mode="after")
+    def _check_combinations(self) -> "Settings":
+        if self.sentiment_backend == "onnx" and self.sentiment_onnx_path is None:
+            raise ValueError("sentiment_onnx_path is required when sentiment_backend is 'onnx'")
+        if self.export_mode == "append" and self.output_path.suffix.lower() not in (".ndjson", ".jsonl"):
+            raise ValueError("export_mode 'append' requires an .ndjson or .jsonl output_path")
+        return self
 
     model_config = SettingsConfigDict(
         env_prefix="CRAWLER_",
@@ -0,0 +1,150 @@
+"""Ticker/company tagging with a precompiled Aho-Corasick automaton.
+
+The symbol file is a JSON list of ``{"symbol": "AAPL", "aliases": ["Apple"]}``
+entries. Every symbol matches as a ``$AAPL`` cashtag; aliases match
+case-insensitively on word boundaries (list the bare symbol as an alias to
+match it without ``$``). The automaton is built once per file content and
+pickled to the cache directory, so later runs only unpickle it. Tagging a
+headline is a single pass over its text whatever the universe size.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import pickle
+from collections import deque
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable
+
+from pydantic import TypeAdapter
+
+from .schemas import NewsItem, TickerConfig
+from .settings import Settings
+
+
+logger = logging.getLogger(__name__)
+
+_TICKER_LIST = TypeAdapter(list[TickerConfig])
+# Bump when the pickled layout changes so stale caches are rebuilt.
+_CACHE_VERSION = 1
+
+
+class TickerMatcher:
+    """Aho-Corasick automaton mapping case-folded patterns to ticker symbols."""
+
+    def __init__(self, patterns: dict[str, set[str]]) -> None:
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        # (pattern length, symbols) emitted at each state, including via fail links.
+        self._output: list[list[tuple[int, tuple[str, ...]]]] = [[]]
+        for pattern, symbols in patterns.items():
+            self._add(pattern, tuple(sorted(symbols)))
+        self._link()
+
+    def __len__(self) -> int:
+        return len(self._goto)
+
+    def _add(self, pattern: str, symbols: tuple[str, ...]) -> None:
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        self._output[state].append((len(pattern), symbols))
+
+    def _link(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._output[next_state].extend(self._output[self._fail[next_state]])
+
+    def match(self, text: str) -> list[str]:
+        """Return the symbols mentioned in ``text``, in order of first mention."""
+
+        folded = " ".join(text.casefold().split())
+        found: dict[str, None] = {}
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        for end, char in enumerate(folded, 1):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for length, symbols in output[state]:
+                start = end - length
+                if (start == 0 or not folded[start - 1].isalnum()) and (
+                    end == len(folded) or not folded[end].isalnum()
+                ):
+                    found.update(dict.fromkeys(symbols))
+        return list(found)
+
+
+def read_tickers_file(path: Path) -> list[TickerConfig]:
+    """Parse a JSON file containing a list of ticker entries."""
+
+    return _TICKER_LIST.validate_python(json.loads(path.read_text(encoding="utf-8")))
+
+
+def _patterns(tickers: Iterable[TickerConfig]) -> dict[str, set[str]]:
+    patterns: dict[str, set[str]] = {}
+    for ticker in tickers:
+        symbol = ticker.symbol.upper()
+        for pattern in (f"${symbol}", *ticker.aliases):
+            pattern = " ".join(pattern.casefold().split())
+            if pattern:
+                patterns.setdefault(pattern, set()).add(symbol)
+    return patterns
+
+
+def build_matcher(path: Path, cache_dir: Path | None = None) -> TickerMatcher:
+    """Load the automaton for ``path`` from ``cache_dir``, building and caching it if needed."""
+
+    content = path.read_bytes()
+    digest = hashlib.sha256(content + f"\0{_CACHE_VERSION}".encode()).hexdigest()[:16]
+    cached = cache_dir / f"tickers-{digest}.pickle" if cache_dir is not None else None
+    if cached is not None and cached.exists():
+        try:
+            with cached.open("rb") as handle:
+                return pickle.load(handle)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError) as exc:
+            logger.warning("Ignoring unreadable ticker cache %s: %s", cached, exc)
+    matcher = TickerMatcher(_patterns(read_tickers_file(path)))
+    if cached is not None:
+        cached.parent.mkdir(parents=True, exist_ok=True)
+        temporary = cached.with_suffix(".tmp")
+        with temporary.open("wb") as handle:
+            pickle.dump(matcher, handle, protocol=pickle.HIGHEST_PROTOCOL)
+        temporary.replace(cached)
+    return matcher
+
+
+@lru_cache
+def get_ticker_matcher(path: Path, cache_dir: Path | None) -> TickerMatcher:
+    """Share one matcher per symbol file across pipeline runs."""
+
+    return build_matcher(path, cache_dir)
+
+
+def tag_tickers(settings: Settings, articles: list[NewsItem]) -> list[NewsItem]:
+    """Set ``tickers`` on each article from its title and summary, in place."""
+
+    if settings.tickers_file is None:
+        return articles
+    matcher = get_ticker_matcher(settings.tickers_file, settings.tickers_cache_dir)
+    for article in articles:
+        text = article.title if not article.summary else f"{article.title}\n{article.summary}"
+        article.tickers = matcher.match(text)
+    return articles
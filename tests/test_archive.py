@@ -0,0 +1,93 @@
+"""Tests for the raw-feed archive and offline replay."""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from news_crawler import bench
+from news_crawler.archive import FeedArchive
+from news_crawler.database import init_db
+from news_crawler.fetcher import fetch_feeds
+from news_crawler.pipeline import replay_archive
+from news_crawler.query import recent_articles
+from news_crawler.schemas import FeedConfig
+from news_crawler.settings import Settings
+
+
+BASE = datetime(2024, 1, 2, 12, 0, tzinfo=timezone.utc)
+
+
+def test_archive_rotates_segments_and_reads_back_by_feed_and_time(tmp_path):
+    archive = FeedArchive(tmp_path / "archive", segment_bytes=1)
+    reuters = FeedConfig(name="Reuters", url="https://example.com/reuters")
+    cnbc = FeedConfig(name="CNBC", url="https://example.com/cnbc")
+
+    first = archive.append(reuters, b"<rss>one</rss>", 200, BASE)
+    archive.append(cnbc, b"<rss>two</rss>", 200, BASE + timedelta(minutes=1))
+    third = archive.append(reuters, b"<rss>three</rss>" * 100, 200, BASE + timedelta(minutes=2))
+
+    assert len(list((tmp_path / "archive").glob("*.seg.gz"))) == 3
+    assert [entry.source for entry in archive.entries()] == ["Reuters", "CNBC", "Reuters"]
+    assert archive.entries(sources={"Reuters"}, since=BASE + timedelta(seconds=1)) == [third]
+    assert archive.entries(until=BASE + timedelta(seconds=1)) == [first]
+    assert archive.read(third) == b"<rss>three</rss>" * 100
+    assert third.length < third.size
+
+    # Payloads are independent gzip members, so a segment is itself a gzip file.
+    assert gzip.decompress((tmp_path / "archive" / first.segment).read_bytes()) == b"<rss>one</rss>"
+
+
+def test_concurrent_appends_from_threads_stay_readable(tmp_path):
+    archive = FeedArchive(tmp_path / "archive", segment_bytes=2048)
+    feed = FeedConfig(name="Reuters", url="https://example.com/reuters")
+    payloads = [f"<rss>{index}</rss>".encode() * (index + 1) for index in range(40)]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda payload: archive.append(feed, payload, 200, BASE), payloads))
+
+    assert sorted(archive.read(entry) for entry in archive.entries()) == sorted(payloads)
+
+
+def test_fetched_feeds_are_archived_and_replayed_offline(tmp_path):
+    entries = bench.synthetic_items(30, seed=3, duplicate_ratio=0.0)
+    payloads = [bench.synthetic_feed(entries[:20]), bench.synthetic_feed(entries[20:], "atom")]
+    archive_dir = tmp_path / "archive"
+
+    async def _crawl() -> int:
+        runner, base_url = await bench._serve(payloads)
+        feeds = [FeedConfig(name=f"Bench{index}", url=f"{base_url}/feed/{index}.xml") for index in range(2)]
+        try:
+            return len(await fetch_feeds(Settings(feeds=feeds, archive_dir=archive_dir)))
+        finally:
+            await runner.cleanup()
+
+    assert asyncio.run(_crawl()) == 30
+    archived = FeedArchive(archive_dir)
+    assert sorted(entry.source for entry in archived.entries()) == ["Bench0", "Bench1"]
+    assert sorted(archived.read(entry) for entry in archived.entries()) == sorted(payloads)
+
+    settings = Settings(
+        archive_dir=archive_dir,
+        sentiment_backend="stub",
+        sentiment_cache_persistent=False,
+        database_url=f"sqlite:///{tmp_path / 'replay.db'}",
+    )
+    replayed = replay_archive(settings)
+
+    assert len(replayed) == 30
+    assert all(item.sentiment_label is not None for item in replayed)
+    with init_db(settings.database_url) as session:
+        assert len(recent_articles(session, limit=100)) == 30
+    # Stored links are skipped, so replaying again is a no-op.
+    assert replay_archive(settings) == []
+    assert replay_archive(settings.model_copy(update={"archive_dir": tmp_path / "missing"})) == []
+
+
+def test_replay_requires_an_archive():
+    with pytest.raises(ValueError):
+        replay_archive(Settings(archive_dir=None))
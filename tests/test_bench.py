@@ -0,0 +1,45 @@
+"""Tests for the offline benchmark harness."""
+
+from __future__ import annotations
+
+import json
+
+from news_crawler import bench
+from news_crawler.fetcher import _parse_rss
+from news_crawler.sentiment import StubSentimentPipeline
+
+
+def test_synthetic_feeds_are_deterministic_and_parseable():
+    items = bench.synthetic_items(200, seed=7, duplicate_ratio=0.0)
+
+    assert items == bench.synthetic_items(200, seed=7, duplicate_ratio=0.0)
+    assert len(_parse_rss(bench.synthetic_feed(items, "rss"), "Bench")) == 200
+    assert len(_parse_rss(bench.synthetic_feed(items, "atom"), "Bench")) == 200
+
+    damaged = bench.synthetic_items(200, seed=7, duplicate_ratio=0.0, malformed_ratio=1.0)
+    parsed = _parse_rss(bench.synthetic_feed(damaged), "Bench")
+    assert 0 < len(parsed) < 200
+
+
+def test_stub_pipeline_scores_deterministically():
+    pipe = StubSentimentPipeline()
+    first = pipe(["Stocks rally", "Oil slumps"])
+
+    assert first == pipe(["Stocks rally", "Oil slumps"])
+    assert all(result["label"] in {"NEGATIVE", "NEUTRAL", "POSITIVE"} for result in first)
+    assert all(0.5 <= result["score"] <= 1.0 for result in first)
+
+
+def test_main_writes_one_result_per_stage_and_size(tmp_path):
+    output = tmp_path / "bench.json"
+
+    bench.main(["--sizes", "40", "80", "--repeat", "1", "--feeds", "2", "--output", str(output)])
+
+    report = json.loads(output.read_text(encoding="utf-8"))
+    assert set(report["environment"]) >= {"timestamp", "python", "platform", "git_revision"}
+    pairs = [(result["benchmark"], result["size"]) for result in report["results"]]
+    assert pairs == [(name, size) for size in (40, 80) for name in bench.BENCHMARKS]
+    fetch = next(result for result in report["results"] if result["benchmark"] == "fetch")
+    assert fetch["feeds"] == 2
+    assert fetch["items"] > 0
+    assert all(result["median_seconds"] >= 0 for result in report["results"])
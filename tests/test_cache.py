@@ -0,0 +1,25 @@
+"""Tests for the in-process caches."""
+
+from __future__ import annotations
+
+from news_crawler.cache import LRUCache, SeenLinks
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache: LRUCache[str, int] = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert "b" not in cache
+    assert cache.get("a") == 1
+    assert len(cache) == 2
+
+
+def test_seen_links_membership_refreshes_recency():
+    seen = SeenLinks(2)
+    seen.update(["https://example.com/1", "https://example.com/2"])
+    assert "https://example.com/1" in seen
+    seen.add("https://example.com/3")
+    assert "https://example.com/1" in seen
+    assert "https://example.com/2" not in seen
@@ -0,0 +1,84 @@
+"""Tests for the command-line entry point and its startup cost."""
+
+from __future__ import annotations
+
+import json
+import re
+import subprocess
+import sys
+from datetime import datetime, timezone
+
+from news_crawler.__main__ import main
+from news_crawler.database import init_db, upsert_articles
+from news_crawler.schemas import NewsItem
+
+
+# Modules that only the crawl path may import.
+HEAVY = ("aiohttp", "bs4", "transformers", "torch", "onnxruntime", "sqlalchemy.ext.asyncio", "news_crawler.fetcher")
+# Generous ceiling for ``import news_crawler.__main__`` itself; it takes a few
+# milliseconds when nothing heavy is imported eagerly.
+IMPORT_BUDGET_SECONDS = 0.25
+
+
+def _imports(*argv: str) -> dict[str, int]:
+    """Run the CLI in a fresh interpreter and return ``-X importtime`` cumulative microseconds per module."""
+
+    code = "import sys; from news_crawler.__main__ import main; main(sys.argv[1:])"
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code, *argv], capture_output=True, text=True
+    )
+    assert completed.returncode == 0, completed.stderr
+    timings: dict[str, int] = {}
+    for line in completed.stderr.splitlines():
+        match = re.match(r"import time:\s+\d+ \|\s+(\d+) \|(\s*)(\S+)$", line)
+        if match:
+            timings[match.group(3)] = int(match.group(1))
+    return timings
+
+
+def test_help_imports_nothing_heavy():
+    timings = _imports("--help")
+
+    assert timings["news_crawler.__main__"] / 1e6 < IMPORT_BUDGET_SECONDS
+    assert not {"sqlalchemy", "pydantic", "news_crawler.settings", *HEAVY} & timings.keys()
+
+
+def test_read_only_commands_skip_the_crawl_stack(tmp_path):
+    database_url = f"sqlite:///{tmp_path / 'news.db'}"
+    with init_db(database_url):
+        pass
+
+    for argv in (("query",), ("search", "fed"), ("stats",), ("export", "--output", str(tmp_path / "out.json"))):
+        timings = _imports(*argv, "--database", database_url)
+        assert "news_crawler.query" in timings
+        assert not set(HEAVY) & timings.keys(), argv
+
+
+def test_export_rewrites_the_output_from_storage(tmp_path, capsys):
+    database_url = f"sqlite:///{tmp_path / 'news.db'}"
+    published = datetime(2024, 1, 2, tzinfo=timezone.utc)
+    with init_db(database_url) as session:
+        upsert_articles(
+            session,
+            [
+                NewsItem(
+                    source=source,
+                    title=f"{source} headline",
+                    link=f"https://example.com/{source}",
+                    published_at=published,
+                    sentiment_label="POSITIVE",
+                    sentiment_score=0.9,
+                )
+                for source in ("Reuters", "CNBC")
+            ],
+        )
+    output = tmp_path / "reuters.ndjson"
+
+    main(["export", "--database", database_url, "--source", "Reuters", "--output", str(output)])
+    main(["stats", "--database", database_url, "--since", "2024-01-01T00:00:00Z"])
+
+    lines = output.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["link"] for line in lines] == ["https://example.com/Reuters"]
+    buckets = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert sorted(bucket["source"] for bucket in buckets) == ["CNBC", "Reuters"]
+    assert all(bucket["resolution"] == "hour" for bucket in buckets)
@@ -0,0 +1,69 @@
+"""Tests for the long-running daemon mode."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+
+import news_crawler.daemon as daemon
+import news_crawler.pipeline as pipeline
+from news_crawler.database import init_db, load_feed_states
+from news_crawler.fetcher import FeedResult
+from news_crawler.schemas import FeedConfig, FeedValidators, NewsItem
+from news_crawler.settings import Settings
+
+
+def test_next_delay_backs_off_and_caps():
+    settings = Settings(poll_interval_seconds=10, poll_jitter_seconds=0, poll_max_backoff_seconds=50)
+    assert daemon._next_delay(settings, 0) == 10
+    assert daemon._next_delay(settings, 2) == 40
+    assert daemon._next_delay(settings, 5) == 50
+    assert daemon._next_delay(settings, 0, interval=3) == 3
+
+
+@pytest.mark.asyncio
+async def test_daemon_polls_feeds_and_persists(monkeypatch, tmp_path):
+    settings = Settings(
+        output_path=tmp_path / "latest.json",
+        database_url=f"sqlite:///{tmp_path / 'news.db'}",
+        poll_interval_seconds=30,
+        poll_jitter_seconds=0,
+    )
+    crawler = daemon.CrawlerDaemon(settings)
+    polled: list[str] = []
+
+    async def fake_fetch_feed(_session, feed, *_args, **_kwargs):
+        polled.append(feed.name)
+        if len(polled) == 2:
+            crawler.stop()
+        article = NewsItem(source=feed.name, title=f"{feed.name} headline", link=feed.url)
+        return FeedResult(
+            feed=feed,
+            articles=[article],
+            validators=FeedValidators(url=feed.url, etag=f'"{feed.name}"'),
+            status=200,
+            changed=True,
+        )
+
+    def fake_annotate_sentiment(_settings, articles):
+        for article in articles:
+            article.sentiment_label, article.sentiment_score = "NEUTRAL", 0.5
+        return list(articles)
+
+    monkeypatch.setattr(daemon, "fetch_feed", fake_fetch_feed)
+    monkeypatch.setattr(daemon, "load_sentiment_backend", lambda _settings: None)
+    monkeypatch.setattr(pipeline, "annotate_sentiment", fake_annotate_sentiment)
+
+    feeds = [
+        FeedConfig(name="A", url="https://example.com/a"),
+        FeedConfig(name="B", url="https://example.com/b", interval_seconds=60),
+    ]
+    await asyncio.wait_for(crawler.run(feeds), timeout=5)
+
+    assert sorted(polled) == ["A", "B"]
+    exported = json.loads(settings.output_path.read_text(encoding="utf-8"))
+    assert {item["source"] for item in exported} <= {"A", "B"}
+    with init_db(settings.database_url) as session:
+        assert set(load_feed_states(session)) == {"https://example.com/a", "https://example.com/b"}
@@ -0,0 +1,103 @@
+"""Tests for database persistence helpers."""
+
+from __future__ import annotations
+
+import pytest
+
+from news_crawler.database import Article, init_db, upsert_articles
+from news_crawler.schemas import NewsItem
+
+
+def _record(link: str, title: str = "Headline") -> NewsItem:
+    return NewsItem(
+        source="Reuters",
+        title=title,
+        link=link,
+        sentiment_label="POSITIVE",
+        sentiment_score=0.9,
+    )
+
+
+def test_upsert_articles_returns_only_new_links(tmp_path):
+    session = init_db(f"sqlite:///{tmp_path / 'news.db'}")
+    try:
+        first = upsert_articles(session, [_record("https://example.com/1"), _record("https://example.com/1")])
+        second = upsert_articles(
+            session,
+            [_record("https://example.com/1", title="Changed"), _record("https://example.com/2")],
+        )
+
+        assert first == ["https://example.com/1"]
+        assert second == ["https://example.com/2"]
+        assert session.query(Article).count() == 2
+        assert session.query(Article).filter_by(link="https://example.com/1").one().title == "Headline"
+    finally:
+        session.close()
+
+
+def test_upsert_articles_maintains_sentiment_aggregates(tmp_path):
+    from datetime import datetime, timezone
+
+    from news_crawler.query import sentiment_aggregates
+
+    def scored(link: str, minute: int, label: str, score: float) -> NewsItem:
+        return NewsItem(
+            source="Reuters",
+            title="Headline",
+            link=link,
+            published_at=datetime(2024, 1, 1, 12, minute, 30, tzinfo=timezone.utc),
+            sentiment_label=label,
+            sentiment_score=score,
+        )
+
+    session = init_db(f"sqlite:///{tmp_path / 'news.db'}")
+    try:
+        upsert_articles(
+            session,
+            [scored("https://example.com/1", 0, "POSITIVE", 0.8), scored("https://example.com/2", 0, "NEGATIVE", 0.4)],
+        )
+        # Duplicates must not be counted twice.
+        upsert_articles(
+            session,
+            [scored("https://example.com/1", 0, "POSITIVE", 0.8), scored("https://example.com/3", 1, "NEUTRAL", 0.5)],
+        )
+
+        minutes = sentiment_aggregates(session, resolution="minute")
+        hours = sentiment_aggregates(session, resolution="hour", source="Reuters")
+    finally:
+        session.close()
+
+    assert [(row.bucket_start.minute, row.count) for row in minutes] == [(0, 2), (1, 1)]
+    assert minutes[0].mean_score == pytest.approx(0.2)
+    assert minutes[0].positive_ratio == 0.5
+    assert minutes[0].negative_ratio == 0.5
+    assert len(hours) == 1
+    assert hours[0].count == 3
+    # EWMA seeded with 0.8, then 0.2 * -0.4 + 0.8 * 0.8, then 0.8 * that for the neutral item.
+    assert hours[0].ewma == pytest.approx(0.8 * (0.2 * -0.4 + 0.8 * 0.8))
+    assert minutes[1].ewma == pytest.approx(hours[0].ewma)
+
+
+@pytest.mark.asyncio
+async def test_run_in_session_stores_batches_on_the_async_engine(tmp_path):
+    from sqlalchemy import text
+
+    from news_crawler.database import get_async_engine, load_feed_states, run_in_session, store_batch
+    from news_crawler.schemas import FeedValidators
+
+    url = f"sqlite:///{tmp_path / 'news.db'}"
+    validators = FeedValidators(url="https://example.com/feed.xml", etag='"v1"')
+    try:
+        first = await run_in_session(url, store_batch, [_record("https://example.com/1")], [], [validators])
+        second = await run_in_session(url, store_batch, [_record("https://example.com/1")])
+        states = await run_in_session(url, load_feed_states)
+        assert get_async_engine(url) is get_async_engine(url)
+    finally:
+        await get_async_engine(url).dispose()
+
+    assert first == ["https://example.com/1"]
+    assert second == []
+    assert states["https://example.com/feed.xml"].etag == '"v1"'
+    with init_db(url) as session:
+        assert session.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert session.query(Article).count() == 1
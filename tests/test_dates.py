@@ -0,0 +1,48 @@
+"""Tests for feed date parsing."""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from news_crawler import dates
+
+
+UTC_NOON = datetime(2024, 1, 2, 12, 0, tzinfo=timezone.utc)
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "Tue, 02 Jan 2024 12:00:00 +0000",
+        "Tue, 02 Jan 2024 07:00:00 EST",
+        " Tue, 02 Jan 2024 12:00:00 GMT ",
+        "2024-01-02T12:00:00Z",
+        "2024-01-02T14:00:00+02:00",
+        "2024-01-02T12:00:00.000Z",
+        "2024-01-02 12:00:00",
+        "2024-01-02 12:00:00+0000",
+        datetime(2024, 1, 2, 12, 0),
+        datetime(2024, 1, 2, 7, 0, tzinfo=timezone(timedelta(hours=-5))),
+    ],
+)
+def test_parse_datetime_normalizes_to_utc(value):
+    parsed = dates.parse_datetime(value)
+    assert parsed == UTC_NOON
+    assert parsed.tzinfo is timezone.utc
+
+
+def test_parse_datetime_remembers_winner_and_rate_limits_misses(monkeypatch, caplog):
+    monkeypatch.setattr(dates, "_winning_parser", {})
+    monkeypatch.setattr(dates, "_misses", {})
+
+    assert dates.parse_datetime("2024-01-02T12:00:00Z", source="Feed") == UTC_NOON
+    assert dates._winning_parser["Feed"] == "iso"
+
+    with caplog.at_level(logging.WARNING, logger="news_crawler.dates"):
+        assert dates.parse_datetime("yesterday", source="Feed") is None
+        assert dates.parse_datetime("last week", source="Feed") is None
+    assert len(caplog.records) == 1
+    assert dates._misses["Feed"][1] == 1
@@ -0,0 +1,170 @@
+"""Tests for URL canonicalization and near-duplicate clustering."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from news_crawler.cache import SeenLinks
+from news_crawler.database import (
+    ArticleCluster,
+    init_db,
+    load_recent_clusters,
+    load_recent_links,
+    store_duplicates,
+    upsert_articles,
+)
+from news_crawler.dedup import NearDuplicateIndex, canonicalize_url
+from news_crawler.parser import parse_feed
+from news_crawler.schemas import NewsItem
+
+
+def _item(title: str, link: str, source: str = "Reuters", published_at: datetime | None = None) -> NewsItem:
+    return NewsItem(source=source, title=title, link=link, published_at=published_at)
+
+
+def test_canonicalize_url_strips_tracking_noise():
+    assert (
+        canonicalize_url("HTTPS://www.Example.com:443/markets/story/?utm_source=rss&id=5&fbclid=abc#top")
+        == "https://www.example.com/markets/story?id=5"
+    )
+    assert canonicalize_url("http://example.com:8080/a?b=2&a=1") == "http://example.com:8080/a?a=1&b=2"
+
+
+def test_links_with_malformed_ports_are_compared_verbatim():
+    for link in ("http://example.com:abc/x", "http://example.com:99999/x"):
+        assert canonicalize_url(link) == link
+
+    index = NearDuplicateIndex(window_seconds=3600)
+    leaders, duplicates = index.partition(
+        [
+            _item("Gold climbs to a record high", "http://example.com:abc/gold"),
+            _item("Gold climbs to a record high", "http://example.com:abc/gold"),
+        ]
+    )
+    assert [item.cluster_id for item in leaders + duplicates] == ["http://example.com:abc/gold"] * 2
+
+
+def test_partition_clusters_syndicated_copies():
+    index = NearDuplicateIndex(window_seconds=3600)
+    leaders, duplicates = index.partition(
+        [
+            _item("Fed raises interest rates by 25 basis points", "https://reuters.com/fed?utm_medium=rss"),
+            _item("Fed raises interest rates by 25 basis points - Reuters", "https://cnbc.com/fed-hike", "CNBC"),
+            _item("Fed raises interest rates by 25 basis points", "https://reuters.com/fed?utm_source=x"),
+            _item("Tesla recalls two million vehicles", "https://cnbc.com/tesla", "CNBC"),
+        ]
+    )
+
+    # Links are matched canonically but kept as published.
+    assert [item.link for item in leaders] == ["https://reuters.com/fed?utm_medium=rss", "https://cnbc.com/tesla"]
+    assert [item.cluster_id for item in duplicates] == ["https://reuters.com/fed", "https://reuters.com/fed"]
+    assert leaders[1].cluster_id == "https://cnbc.com/tesla"
+
+
+def test_distinct_stories_with_similar_headlines_stay_apart():
+    subjects = ["Fed", "ECB", "Apple", "Tesla", "Oil", "Gold", "Nvidia", "Bitcoin"]
+    verbs = ["surges", "slumps", "rallies", "falls", "jumps", "slides", "climbs", "tumbles"]
+    contexts = ["on earnings beat", "after jobs report", "as inflation cools", "amid rate fears", "on merger talk"]
+    headlines = [f"{subject} {verb} {context}" for subject in subjects for verb in verbs for context in contexts]
+    index = NearDuplicateIndex(window_seconds=86400)
+
+    leaders, duplicates = index.partition(
+        _item(title, f"https://example.com/{number}") for number, title in enumerate(headlines)
+    )
+
+    assert len(headlines) == 320
+    assert duplicates == []
+    assert len(leaders) == 320
+
+
+def test_short_or_rewritten_headlines_need_a_link_match():
+    index = NearDuplicateIndex(window_seconds=3600)
+    index.assign(_item("Fed slumps on earnings beat", "https://example.com/fed"), now=0.0)
+    index.assign(_item("Stocks rise", "https://example.com/stocks"), now=0.0)
+
+    assert not index.assign(_item("Fed surges on earnings beat", "https://example.com/fed-2"), now=1.0)
+    assert not index.assign(_item("ECB slumps on earnings beat", "https://example.com/ecb"), now=1.0)
+    assert not index.assign(_item("Stocks rise - CNBC", "https://cnbc.com/stocks"), now=1.0)
+    assert index.assign(_item("Stocks rise", "https://example.com/stocks/?utm_source=rss"), now=1.0)
+
+
+def test_only_publisher_attributions_are_ignored():
+    index = NearDuplicateIndex(window_seconds=3600)
+    leaders, duplicates = index.partition(
+        [
+            _item("Fed holds rates steady for third straight meeting - stocks rally", "https://example.com/rally"),
+            _item("Fed holds rates steady for third straight meeting - stocks slump", "https://example.com/slump"),
+            _item("OPEC cuts output again | live updates", "https://example.com/opec-live"),
+            _item("OPEC cuts output again | analysis", "https://example.com/opec-analysis"),
+            _item("Nvidia unveils its next AI chip - Tech Daily", "https://techdaily.example/nvidia", "Tech Daily"),
+            _item("Nvidia unveils its next AI chip", "https://example.com/nvidia", "Bloomberg"),
+            _item("Nvidia unveils its next AI chip | Bloomberg", "https://cnbc.com/nvidia", "CNBC"),
+        ]
+    )
+
+    assert len(leaders) == 5
+    assert [item.link for item in duplicates] == ["https://example.com/nvidia", "https://cnbc.com/nvidia"]
+
+
+def test_index_forgets_stories_outside_the_window():
+    index = NearDuplicateIndex(window_seconds=60)
+    index.assign(_item("Oil prices fall as OPEC boosts output", "https://example.com/oil"), now=1_000.0)
+
+    assert index.assign(_item("Oil prices fall as OPEC boosts output", "https://example.com/oil-2"), now=1_030.0)
+    assert not index.assign(_item("Oil prices fall as OPEC boosts output", "https://example.com/oil-3"), now=1_100.0)
+
+
+def test_clusters_round_trip_through_the_database(tmp_path):
+    now = datetime.now(timezone.utc)
+    index = NearDuplicateIndex(window_seconds=3600)
+    leaders, duplicates = index.partition(
+        [
+            _item("Apple shares jump after record iPhone sales", "https://example.com/apple", published_at=now),
+            _item("Apple shares jump after record iPhone sales - CNBC", "https://cnbc.com/apple?utm_campaign=x", "CNBC"),
+        ]
+    )
+    for leader in leaders:
+        leader.sentiment_label, leader.sentiment_score = "POSITIVE", 0.9
+
+    session = init_db(f"sqlite:///{tmp_path / 'news.db'}")
+    try:
+        upsert_articles(session, leaders)
+        store_duplicates(session, duplicates)
+        members = load_recent_clusters(session, now - timedelta(hours=1))
+        assert session.query(ArticleCluster).count() == 2
+    finally:
+        session.close()
+
+    assert [item.cluster_id for item in duplicates] == ["https://example.com/apple"]
+    assert [(item.link, cluster_id) for item, cluster_id in members] == [
+        ("https://example.com/apple", "https://example.com/apple")
+    ]
+
+
+def test_seen_index_matches_stored_links_and_duplicates_canonically(tmp_path):
+    now = datetime.now(timezone.utc)
+    index = NearDuplicateIndex(window_seconds=3600)
+    leaders, duplicates = index.partition(
+        [
+            _item("Apple shares jump after record iPhone sales", "https://example.com/apple/", published_at=now),
+            _item("Apple shares jump after record iPhone sales - CNBC", "https://cnbc.com/apple", "CNBC", now),
+        ]
+    )
+    for leader in leaders:
+        leader.sentiment_label, leader.sentiment_score = "POSITIVE", 0.9
+
+    with init_db(f"sqlite:///{tmp_path / 'news.db'}") as session:
+        upsert_articles(session, leaders)
+        store_duplicates(session, duplicates)
+        links = load_recent_links(session, 10)
+    seen = SeenLinks(10)
+    seen.update(links)
+
+    assert links == ["https://cnbc.com/apple", "https://example.com/apple/"]
+    feed = """<rss><channel>
+      <item><title>Apple shares jump after record iPhone sales</title>
+        <link>https://example.com/apple?utm_source=rss</link></item>
+      <item><title>Apple shares jump after record iPhone sales - CNBC</title><link>https://cnbc.com/apple</link></item>
+      <item><title>Tesla recalls two million vehicles</title><link>https://cnbc.com/tesla/</link></item>
+    </channel></rss>"""
+    assert [item.link for item in parse_feed(feed, "Reuters", seen)] == ["https://cnbc.com/tesla/"]
@@ -0,0 +1,62 @@
+"""Tests for the JSON exporters."""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from news_crawler.database import init_db, upsert_articles
+from news_crawler.exporter import append_json, write_json
+from news_crawler.pipeline import export_articles
+from news_crawler.schemas import NewsItem
+from news_crawler.settings import Settings
+
+
+def _item(index: int, published_at: datetime | None = None) -> NewsItem:
+    return NewsItem(
+        source="Reuters",
+        title=f"Headline {index}",
+        link=f"https://example.com/{index}",
+        published_at=published_at,
+        sentiment_label="POSITIVE",
+        sentiment_score=0.5,
+    )
+
+
+def test_write_json_replaces_atomically(tmp_path):
+    path = tmp_path / "out" / "latest.json"
+    assert write_json(path, [_item(1), _item(2)]) == 2
+    assert write_json(path, iter([_item(3)])) == 1
+
+    assert [record["link"] for record in json.loads(path.read_text(encoding="utf-8"))] == ["https://example.com/3"]
+    assert [entry.name for entry in path.parent.iterdir()] == ["latest.json"]
+
+
+def test_append_json_only_adds_new_lines(tmp_path):
+    path = tmp_path / "latest.ndjson"
+    write_json(path, [_item(1)])
+    append_json(path, [_item(2), _item(3)])
+    append_json(path, [])
+
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["title"] for line in lines] == ["Headline 1", "Headline 2", "Headline 3"]
+    with pytest.raises(ValueError):
+        append_json(tmp_path / "latest.json", [_item(4)])
+
+
+def test_export_window_reads_recent_articles_from_database(tmp_path):
+    settings = Settings(
+        database_url=f"sqlite:///{tmp_path / 'news.db'}",
+        output_path=tmp_path / "window.ndjson",
+        export_window_hours=6,
+    )
+    now = datetime.now(timezone.utc)
+    with init_db(settings.database_url) as session:
+        upsert_articles(session, [_item(1, now - timedelta(hours=1)), _item(2, now - timedelta(hours=12)), _item(3)])
+
+    assert export_articles(settings, []) == 1
+    (record,) = [json.loads(line) for line in settings.output_path.read_text(encoding="utf-8").splitlines()]
+    assert record["link"] == "https://example.com/1"
+    assert record["published_at"].endswith("Z")
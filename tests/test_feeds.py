@@ -0,0 +1,40 @@
+"""Tests for the feed registry."""
+
+from __future__ import annotations
+
+import json
+
+from news_crawler.feeds import load_feeds
+from news_crawler.schemas import FeedConfig
+from news_crawler.settings import Settings
+
+
+def test_load_feeds_defaults_to_reuters_and_cnbc():
+    settings = Settings(reuters_feed_url="https://example.com/r", cnbc_feed_url="https://example.com/c")
+    assert [(feed.name, feed.url) for feed in load_feeds(settings)] == [
+        ("Reuters", "https://example.com/r"),
+        ("CNBC", "https://example.com/c"),
+    ]
+
+
+def test_load_feeds_merges_file_and_settings(tmp_path):
+    feeds_file = tmp_path / "feeds.json"
+    feeds_file.write_text(
+        json.dumps(
+            [
+                {"name": "FT", "url": "https://example.com/ft", "interval_seconds": 30},
+                {"name": "Dup", "url": "https://example.com/wsj"},
+                {"name": "Off", "url": "https://example.com/off", "enabled": False},
+            ]
+        ),
+        encoding="utf-8",
+    )
+    settings = Settings(
+        feeds=[FeedConfig(name="WSJ", url="https://example.com/wsj")],
+        feeds_file=feeds_file,
+    )
+
+    feeds = load_feeds(settings)
+
+    assert [feed.name for feed in feeds] == ["WSJ", "FT"]
+    assert feeds[1].interval_seconds == 30
@@ -2,13 +2,14 @@
 
 from __future__ import annotations
 
+import asyncio
 from typing import Iterable
 
 import aiohttp
 import pytest
 
-from news_crawler import fetcher
-from news_crawler.schemas import RawArticle
+from news_crawler import bench, fetcher
+from news_crawler.schemas import FeedConfig, FeedValidators
 from news_crawler.settings import Settings
 
 
@@ -83,3 +84,105 @@ async def test_fetch_feeds_handles_errors(monkeypatch):
     articles = await fetcher.fetch_feeds(settings)
 
     assert len(articles) == 0
+
+
+@pytest.mark.asyncio
+async def test_fetch_skips_unchanged_feeds():
+    class FakeContent:
+        def __init__(self, body: bytes):
+            self._body = body
+
+        async def iter_chunked(self, size: int):
+            for start in range(0, len(self._body), size):
+                yield self._body[start : start + size]
+
+    class FakeResponse:
+        def __init__(self, status: int, body: bytes = b"", headers: dict | None = None):
+            self.status = status
+            self.content = FakeContent(body)
+            self.headers = headers or {}
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, exc_type, exc, tb):
+            return False
+
+        def raise_for_status(self):
+            if self.status >= 400:
+                raise aiohttp.ClientResponseError(None, (), status=self.status)
+
+    class FakeSession:
+        def __init__(self, responses):
+            self.responses = list(responses)
+            self.sent_headers: list[dict] = []
+
+        def get(self, url, headers=None):
+            self.sent_headers.append(headers or {})
+            return self.responses.pop(0)
+
+    body = b"<rss><channel></channel></rss>"
+    session = FakeSession(
+        [
+            FakeResponse(200, body, {"ETag": '"v1"'}),
+            FakeResponse(304),
+            FakeResponse(200, body, {"ETag": '"v2"'}),
+        ]
+    )
+    url = "https://example.com/feed"
+    received: list[bytes] = []
+
+    changed, validators, status = await fetcher._fetch(session, url, None, received.append)
+    assert changed
+    assert b"".join(received) == body
+    assert status == 200
+    assert validators.etag == '"v1"'
+
+    changed, unchanged, status = await fetcher._fetch(session, url, validators, received.append)
+    assert not changed
+    assert unchanged is validators
+    assert status == 304
+    assert session.sent_headers[1] == {"If-None-Match": '"v1"'}
+
+    changed, refreshed, _ = await fetcher._fetch(session, url, validators, received.append)
+    assert not changed
+    assert refreshed == FeedValidators(url=url, etag='"v2"', content_hash=validators.content_hash)
+
+
+@pytest.mark.asyncio
+async def test_identical_body_without_validators_is_never_streamed():
+    payload = bench.synthetic_feed(bench.synthetic_items(5, seed=1, duplicate_ratio=0.0))
+    runner, base_url = await bench._serve([payload])
+    feed = FeedConfig(name="Bench", url=f"{base_url}/feed/0.xml")
+    emitted: list[list] = []
+    try:
+        async with fetcher.create_session(Settings()) as session:
+            first = await fetcher.fetch_feed(session, feed, on_articles=emitted.append)
+            assert first.validators.etag is None and first.validators.last_modified is None
+            streamed = len(emitted)
+            second = await fetcher.fetch_feed(session, feed, first.validators, on_articles=emitted.append)
+    finally:
+        await runner.cleanup()
+
+    assert first.changed and sum(len(batch) for batch in emitted) == 5
+    assert not second.changed
+    assert second.articles == []
+    assert len(emitted) == streamed
+
+
+@pytest.mark.asyncio
+async def test_fetch_limiter_bounds_per_host_concurrency():
+    limiter = fetcher.FetchLimiter(max_concurrent=10, max_per_host=2)
+    active: dict[str, int] = {"a.example": 0, "b.example": 0}
+    peak: dict[str, int] = {"a.example": 0, "b.example": 0}
+
+    async def hit(host: str) -> None:
+        async with limiter.slot(f"https://{host}/feed"):
+            active[host] += 1
+            peak[host] = max(peak[host], active[host])
+            await asyncio.sleep(0.01)
+            active[host] -= 1
+
+    await asyncio.gather(*(hit(host) for host in ["a.example"] * 5 + ["b.example"] * 5))
+
+    assert peak == {"a.example": 2, "b.example": 2}
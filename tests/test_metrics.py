@@ -0,0 +1,52 @@
+"""Tests for per-stage instrumentation."""
+
+from __future__ import annotations
+
+import aiohttp
+import pytest
+
+from news_crawler.metrics import Metrics, serve_metrics
+
+
+def test_metrics_summarise_stages_feeds_and_dedup():
+    metrics = Metrics()
+    metrics.observe("fetch", 0.5, items=10, size=2048, feed="Reuters")
+    metrics.observe("fetch", 1.5, items=5, size=1024, feed="CNBC")
+    metrics.observe_dedup(seen=15, kept=12, seconds=0.01)
+    with metrics.timed("sentiment") as span:
+        span.items = 12
+
+    summary = metrics.summary()
+
+    assert summary["stages"]["fetch"]["calls"] == 2
+    assert summary["stages"]["fetch"]["bytes"] == 3072
+    assert summary["stages"]["fetch"]["max_seconds"] == 1.5
+    assert summary["stages"]["fetch"]["items_per_second"] == 7.5
+    assert summary["stages"]["sentiment"]["items"] == 12
+    assert summary["feeds"]["CNBC"]["items"] == 5
+    assert summary["dedup"] == {"seen": 15, "duplicates": 3, "hit_rate": 0.2}
+
+    metrics.reset()
+    assert metrics.summary()["stages"]["fetch"]["calls"] == 0
+
+
+@pytest.mark.asyncio
+async def test_serve_metrics_exposes_prometheus_text():
+    metrics = Metrics()
+    metrics.observe("fetch", 0.25, items=3, size=512, feed='Say "hi"')
+    runner = await serve_metrics("127.0.0.1", 0, metrics)
+    try:
+        host, port = runner.addresses[0][:2]
+        async with aiohttp.ClientSession() as session:
+            async with session.get(f"http://{host}:{port}/metrics") as response:
+                assert response.status == 200
+                body = await response.text()
+            async with session.get(f"http://{host}:{port}/other") as response:
+                assert response.status == 404
+    finally:
+        await runner.cleanup()
+
+    assert "# TYPE news_crawler_stage_seconds_total counter" in body
+    assert 'news_crawler_stage_bytes_total{stage="fetch"} 512' in body
+    assert 'news_crawler_feed_items_total{feed="Say \\"hi\\""} 3' in body
+    assert "news_crawler_dedup_hits_total 0" in body
@@ -0,0 +1,78 @@
+"""Tests for the incremental feed parser."""
+
+from __future__ import annotations
+
+from news_crawler.parser import StreamingFeedParser, parse_feed
+
+
+ATOM = b"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <entry>
+    <title>Entry One</title>
+    <link href="https://example.com/1"/>
+    <updated>2024-01-02T03:04:05Z</updated>
+  </entry>
+  <entry>
+    <title>Entry Two</title>
+    <link href="https://example.com/2"/>
+  </entry>
+</feed>
+"""
+
+
+def test_streaming_parser_emits_items_as_they_close():
+    parser = StreamingFeedParser("Atom")
+    split = ATOM.index(b"<entry>", ATOM.index(b"</entry>"))
+
+    first = parser.feed(ATOM[:split])
+    second = parser.feed(ATOM[split:])
+    rest = parser.close()
+
+    assert [article.title for article in first] == ["Entry One"]
+    assert [article.title for article in second] == ["Entry Two"]
+    assert rest == []
+    assert first[0].published_at is not None
+
+
+def test_malformed_feed_falls_back_to_lenient_parser():
+    xml = """<rss><channel>
+        <item><title>Good</title><link>https://example.com/good</link></item>
+        <item><title>Broken &nbsp; entity</title><link>https://example.com/broken</link>
+        <pubDate>Tue, 02 Jan 2024 03:04:05 +0000</pubDate></item>
+    </channel></rss>"""
+
+    articles = parse_feed(xml, "Broken")
+
+    assert [str(article.link) for article in articles] == [
+        "https://example.com/good",
+        "https://example.com/broken",
+    ]
+    assert articles[1].published_at is not None
+
+
+def test_parser_skips_seen_links_before_validation():
+    parser = StreamingFeedParser("Atom", seen={"https://example.com/1"})
+
+    articles = parser.feed(ATOM) + parser.close()
+
+    assert [str(article.link) for article in articles] == ["https://example.com/2"]
+    assert parser.skipped == 1
+
+
+def test_parser_rejects_links_the_record_contract_would_reject():
+    links = [
+        "http://exa mple.com/x",
+        "http://example.com:abc/x",
+        "http://example.com:99999/x",
+        "ftp://example.com/x",
+        "https://example.com/ok",
+    ]
+    items = "".join(
+        f"<item><title>Headline {index}</title><link>{link}</link></item>" for index, link in enumerate(links)
+    )
+
+    articles = parse_feed(f"<rss><channel>{items}</channel></rss>", "Reuters")
+
+    assert [article.link for article in articles] == ["https://example.com/ok"]
+    articles[0].sentiment_label, articles[0].sentiment_score = "POSITIVE", 0.9
+    assert str(articles[0].to_record().link) == "https://example.com/ok"
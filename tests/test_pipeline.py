@@ -2,10 +2,16 @@
 
 from __future__ import annotations
 
+import asyncio
+import threading
+import json
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
 import news_crawler.pipeline as pipeline
-from news_crawler.schemas import ArticleRecord, ArticleSentiment, RawArticle
+from news_crawler.database import init_db, upsert_articles
+from news_crawler.dedup import NearDuplicateIndex
+from news_crawler.schemas import ArticleRecord, NewsItem, RawArticle
 from news_crawler.settings import Settings
 
 
@@ -16,13 +22,25 @@ def test_deduplicate_removes_duplicate_links():
         link="https://example.com/a",
         summary=None,
         published_at=None,
-    )
-    article_b = article_a.model_copy()
+    ).to_item()
+    article_b = NewsItem(source="CNBC", title="Stocks rally", link=article_a.link)
     deduped = pipeline._deduplicate([article_a, article_b])
     assert len(deduped) == 1
     assert deduped[0].link == article_a.link
 
 
+def test_news_item_json_matches_record_contract():
+    item = NewsItem(
+        source="Reuters",
+        title="Stocks rally",
+        link="https://example.com/a",
+        published_at=datetime(2024, 1, 2, 12, 0, tzinfo=timezone.utc),
+        sentiment_label="POSITIVE",
+        sentiment_score=0.9,
+    )
+    assert item.to_json() == item.to_record().model_dump(mode="json")
+
+
 def test_run_pipeline_happy_path(monkeypatch, tmp_path):
     settings = Settings(
         reuters_feed_url="https://example.com/reuters.xml",
@@ -32,14 +50,14 @@ def test_run_pipeline_happy_path(monkeypatch, tmp_path):
     )
 
     sample_articles = [
-        RawArticle(
+        NewsItem(
             source="Reuters",
             title="Markets open higher",
             link="https://example.com/1",
             summary="Summary",
             published_at=None,
         ),
-        RawArticle(
+        NewsItem(
             source="CNBC",
             title="Markets open higher",
             link="https://example.com/1",
@@ -48,28 +66,32 @@ def test_run_pipeline_happy_path(monkeypatch, tmp_path):
         ),
     ]
 
-    async def fake_fetch_feeds(_settings):
+    async def fake_fetch_feeds(_settings, *_args, on_articles=None):
+        on_articles(sample_articles[:1])
+        await asyncio.sleep(0)
+        on_articles(sample_articles[1:])
         return sample_articles
 
     def fake_annotate_sentiment(_settings, articles):
-        return [
-            (
-                article,
-                ArticleSentiment(label="POSITIVE", score=0.9),
-            )
-            for article in articles
-        ]
+        articles = list(articles)
+        for article in articles:
+            article.sentiment_label = "POSITIVE"
+            article.sentiment_score = 0.9
+        return articles
 
-    persisted: dict[str, list[ArticleRecord]] = {}
+    persisted: dict[str, list[NewsItem]] = {}
 
-    def fake_persist(_settings, records):
+    async def fake_persist(_settings, records, duplicates=()):
         persisted["records"] = list(records)
+        persisted["duplicates"] = list(duplicates)
+        return [record.link for record in persisted["records"]]
 
-    exported: dict[str, Path | list[ArticleRecord]] = {}
+    exported: dict[str, Path | list[NewsItem]] = {}
 
     def fake_write_json(path, records):
         exported["path"] = path
         exported["records"] = list(records)
+        return len(exported["records"])
 
     monkeypatch.setattr(pipeline, "fetch_feeds", fake_fetch_feeds)
     monkeypatch.setattr(pipeline, "annotate_sentiment", fake_annotate_sentiment)
@@ -84,4 +106,108 @@ def test_run_pipeline_happy_path(monkeypatch, tmp_path):
     assert record.sentiment_label == "POSITIVE"
     assert exported["path"] == settings.output_path
     assert len(exported["records"]) == 1
-    assert persisted["records"][0].link == record.link
+    assert persisted["records"][0].link == str(record.link)
+
+
+def _stub_scoring(monkeypatch, scored_batches: list[list[str]]):
+    def fake_annotate_sentiment(_settings, articles):
+        articles = list(articles)
+        scored_batches.append([article.link for article in articles])
+        for article in articles:
+            article.sentiment_label, article.sentiment_score = "POSITIVE", 0.9
+        return articles
+
+    async def fake_persist(_settings, records, duplicates=()):
+        return [record.link for record in records]
+
+    monkeypatch.setattr(pipeline, "annotate_sentiment", fake_annotate_sentiment)
+    monkeypatch.setattr(pipeline, "_persist", fake_persist)
+
+
+def test_queue_is_drained_in_bounded_micro_batches_across_which_links_are_deduplicated(monkeypatch):
+    scored_batches: list[list[str]] = []
+    _stub_scoring(monkeypatch, scored_batches)
+    settings = Settings(sentiment_micro_batch_size=3)
+    items = [
+        NewsItem(source="Reuters", title=f"Story number {index} for markets", link=f"https://example.com/{index}")
+        for index in range(7)
+    ]
+    repeat = NewsItem(source="CNBC", title="Something else entirely here", link=items[0].link)
+
+    async def _run():
+        queue: asyncio.Queue = asyncio.Queue()
+        for item in [*items, repeat]:
+            queue.put_nowait([item])
+        queue.put_nowait(None)
+        with pipeline.sentiment_executor() as executor:
+            return await pipeline._annotate_from_queue(settings, queue, executor, NearDuplicateIndex(3600))
+
+    records, duplicates = asyncio.run(_run())
+
+    assert [len(batch) for batch in scored_batches] == [3, 3, 1]
+    assert [record.link for record in records] == [item.link for item in items]
+    assert duplicates == []
+
+
+def test_scoring_starts_before_the_slowest_feed_finishes(monkeypatch, tmp_path):
+    scored_batches: list[list[str]] = []
+    _stub_scoring(monkeypatch, scored_batches)
+    fast = NewsItem(source="Reuters", title="Fast feed headline about stocks", link="https://example.com/fast")
+    slow = NewsItem(source="CNBC", title="Slow feed headline about bonds", link="https://example.com/slow")
+    scored = threading.Event()
+    original = pipeline.annotate_sentiment
+
+    def annotate_and_signal(settings, articles):
+        result = original(settings, articles)
+        scored.set()
+        return result
+
+    monkeypatch.setattr(pipeline, "annotate_sentiment", annotate_and_signal)
+
+    async def fake_fetch_feeds(_settings, *_args, on_articles=None):
+        on_articles([fast])
+        # The slow feed only finishes once the fast one has been scored.
+        assert await asyncio.to_thread(scored.wait, 5)
+        on_articles([slow])
+        return [fast, slow]
+
+    monkeypatch.setattr(pipeline, "fetch_feeds", fake_fetch_feeds)
+
+    settings = Settings(database_url=f"sqlite:///{tmp_path / 'news.db'}")
+    records, _ = asyncio.run(pipeline._run_async(settings, {}, None, NearDuplicateIndex(3600)))
+
+    assert scored_batches == [[fast.link], [slow.link]]
+    assert [record.link for record in records] == [fast.link, slow.link]
+
+
+def test_window_export_is_rebuilt_when_nothing_new_is_stored(monkeypatch, tmp_path):
+    settings = Settings(
+        feeds=[],
+        output_path=tmp_path / "latest.json",
+        database_url=f"sqlite:///{tmp_path / 'news.db'}",
+        export_window_hours=1,
+    )
+    now = datetime.now(timezone.utc)
+    stored = [
+        NewsItem(
+            source="Reuters",
+            title=title,
+            link=f"https://example.com/{title}",
+            published_at=published_at,
+            sentiment_label="POSITIVE",
+            sentiment_score=0.9,
+        )
+        for title, published_at in (("fresh", now - timedelta(minutes=5)), ("stale", now - timedelta(hours=2)))
+    ]
+    with init_db(settings.database_url) as session:
+        upsert_articles(session, stored)
+    settings.output_path.write_text(json.dumps([item.to_json() for item in stored]), encoding="utf-8")
+
+    async def fake_fetch_feeds(_settings, *_args, on_articles=None):
+        return []
+
+    monkeypatch.setattr(pipeline, "fetch_feeds", fake_fetch_feeds)
+
+    assert pipeline.run_pipeline(settings) == []
+    exported = json.loads(settings.output_path.read_text(encoding="utf-8"))
+    assert [record["title"] for record in exported] == ["fresh"]
@@ -0,0 +1,130 @@
+"""Tests for the read-side query API."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import inspect, text
+
+from news_crawler.database import get_engine, init_db, upsert_articles
+from news_crawler.query import iter_articles, parse_since, recent_articles, search_articles
+from news_crawler.schemas import NewsItem
+
+
+BASE = datetime(2024, 1, 2, 12, 0, tzinfo=timezone.utc)
+
+
+def _seed(database_url: str) -> None:
+    items = [
+        NewsItem(
+            source="Reuters" if index % 2 else "CNBC",
+            title=f"Headline {index}",
+            link=f"https://example.com/{index}",
+            # Pairs share a timestamp to exercise the id tie-breaker.
+            published_at=BASE - timedelta(minutes=index // 2),
+            sentiment_label="NEGATIVE" if index % 3 == 0 else "POSITIVE",
+            sentiment_score=0.5,
+        )
+        for index in range(10)
+    ]
+    with init_db(database_url) as session:
+        upsert_articles(session, items)
+
+
+def test_recent_articles_filters_and_uses_indexes(tmp_path):
+    database_url = f"sqlite:///{tmp_path / 'news.db'}"
+    _seed(database_url)
+    index_names = {index["name"] for index in inspect(get_engine(database_url)).get_indexes("articles")}
+    assert {"ix_articles_source_published_at", "ix_articles_sentiment_label_published_at"} <= index_names
+
+    with init_db(database_url) as session:
+        reuters = recent_articles(session, source="Reuters", limit=3)
+        negative = recent_articles(session, since=BASE - timedelta(minutes=2), label="NEGATIVE")
+
+    assert [item.title for item in reuters] == ["Headline 1", "Headline 3", "Headline 5"]
+    assert [item.title for item in negative] == ["Headline 0", "Headline 3"]
+    assert reuters[0].published_at.tzinfo is not None
+
+
+def test_iter_articles_keyset_pages_cover_everything_once(tmp_path):
+    database_url = f"sqlite:///{tmp_path / 'news.db'}"
+    _seed(database_url)
+
+    with init_db(database_url) as session:
+        paged = [item.link for item in iter_articles(session, page_size=3)]
+        whole = [item.link for item in recent_articles(session, limit=100)]
+
+    assert paged == whole
+    assert len(set(paged)) == 10
+
+
+def test_stored_articles_carry_their_tickers_and_cluster(tmp_path):
+    database_url = f"sqlite:///{tmp_path / 'news.db'}"
+    item = NewsItem(
+        source="Reuters",
+        title="Apple and Microsoft rally",
+        link="https://example.com/tech",
+        published_at=BASE,
+        sentiment_label="POSITIVE",
+        sentiment_score=0.9,
+        cluster_id="https://example.com/tech",
+        tickers=["MSFT", "AAPL"],
+    )
+    with init_db(database_url) as session:
+        upsert_articles(session, [item])
+        results = [
+            recent_articles(session, ticker="AAPL"),
+            list(iter_articles(session)),
+            search_articles(session, "apple"),
+        ]
+
+    for found in results:
+        assert [(result.tickers, result.cluster_id) for result in found] == [
+            (["AAPL", "MSFT"], "https://example.com/tech")
+        ]
+
+
+def test_parse_since_accepts_durations_and_timestamps():
+    now = BASE
+    assert parse_since("24h", now=now) == now - timedelta(hours=24)
+    assert parse_since("90m", now=now) == now - timedelta(minutes=90)
+    assert parse_since("2024-01-01T00:00:00Z") == datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def test_search_articles_ranks_matches_and_applies_filters(tmp_path):
+    database_url = f"sqlite:///{tmp_path / 'news.db'}"
+    items = [
+        NewsItem(source="Reuters", title="Fed signals rate hike", link="https://example.com/a", summary="Markets slide"),
+        NewsItem(source="CNBC", title="Stocks slide", link="https://example.com/b", summary="Traders fear a rate hike"),
+        NewsItem(source="CNBC", title="Oil refiners", link="https://example.com/c", summary="Rates and hikes weigh"),
+        NewsItem(source="CNBC", title="Oil steady", link="https://example.com/d", summary="No change"),
+    ]
+    for minutes, item in enumerate(items):
+        item.published_at = BASE - timedelta(minutes=minutes)
+        item.sentiment_label, item.sentiment_score = ("NEGATIVE", 0.9) if minutes < 2 else ("NEUTRAL", 0.5)
+    with init_db(database_url) as session:
+        upsert_articles(session, items)
+
+        ranked = [item.link[-1] for item in search_articles(session, "rate hike")]
+        cnbc = [item.link[-1] for item in search_articles(session, "rate hike", source="CNBC", label="NEGATIVE")]
+        phrase = [item.link[-1] for item in search_articles(session, '"rate hike" NOT fed', raw=True)]
+        quoted = search_articles(session, 'hike" OR (')
+
+    # Porter stemming matches "rates"/"hikes"; a title hit outranks summary hits.
+    assert ranked[0] == "a" and set(ranked) == {"a", "b", "c"}
+    assert cnbc == ["b"]
+    assert phrase == ["b"]
+    assert [item.link[-1] for item in quoted] == []
+
+
+def test_search_index_is_backfilled_for_existing_databases(tmp_path):
+    database_url = f"sqlite:///{tmp_path / 'news.db'}"
+    _seed(database_url)
+    with get_engine(database_url).begin() as connection:
+        connection.execute(text("DROP TABLE articles_fts"))
+    get_engine.cache_clear()
+    try:
+        with init_db(database_url) as session:
+            assert len(search_articles(session, "headline", limit=100)) == 10
+    finally:
+        get_engine(database_url).dispose()
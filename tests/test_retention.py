@@ -0,0 +1,134 @@
+"""Tests for monthly partitioning, retention and compaction."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import func, select
+
+from news_crawler.database import (
+    Article,
+    ArticleCluster,
+    ArticleTicker,
+    init_db,
+    list_partitions,
+    SentimentCacheEntry,
+    store_cached_sentiments,
+    store_duplicates,
+    upsert_articles,
+)
+from news_crawler.query import iter_articles, recent_articles, search_articles, sentiment_aggregates
+from news_crawler.retention import run_retention
+from news_crawler.sentiment import _cache_for
+from news_crawler.schemas import NewsItem
+from news_crawler.settings import Settings
+
+
+NOW = datetime(2024, 1, 20, 12, 0, tzinfo=timezone.utc)
+
+
+def _items() -> list[NewsItem]:
+    items = []
+    for index in range(18):
+        published = NOW - timedelta(days=5 * index, hours=index)
+        items.append(
+            NewsItem(
+                source="Reuters" if index % 2 else "CNBC",
+                title=f"Fed decision {index}" if index % 3 == 0 else f"Oil update {index}",
+                link=f"https://example.com/{index}",
+                published_at=published,
+                sentiment_label="NEGATIVE",
+                sentiment_score=0.8,
+                tickers=["AAPL"] if index % 4 == 0 else [],
+                cluster_id=f"https://example.com/{index}",
+            )
+        )
+    return items
+
+
+def _seed(database_url: str) -> list[str]:
+    """Store one article every five days from late October to now; return their links newest first."""
+
+    items = _items()
+    with init_db(database_url) as session:
+        upsert_articles(session, items)
+    return [item.link for item in items]
+
+
+def test_rolled_partitions_are_queried_transparently(tmp_path):
+    database_url = f"sqlite:///{tmp_path / 'news.db'}"
+    links = _seed(database_url)
+    settings = Settings(database_url=database_url, retention_hot_days=10)
+
+    summary = run_retention(settings, now=NOW)
+
+    assert set(summary["rolled"]) == {"2023-10", "2023-11", "2023-12", "2024-01"}
+    assert sum(summary["rolled"].values()) == 16
+    assert summary["compacted"][0] == database_url
+    assert [partition.month for partition in list_partitions(database_url)] == ["2024-01", "2023-12", "2023-11", "2023-10"]
+    with init_db(database_url) as session:
+        assert session.scalar(select(func.count()).select_from(Article)) == 2
+        assert session.scalar(select(func.count()).select_from(ArticleCluster)) == 2
+        assert session.scalar(select(func.count()).select_from(ArticleTicker)) == 1
+
+        assert [item.link for item in recent_articles(session, limit=100)] == links
+        assert [item.link for item in recent_articles(session, limit=4)] == links[:4]
+        assert [item.link for item in iter_articles(session, page_size=4)] == links
+        november = recent_articles(
+            session, since=datetime(2023, 11, 1, tzinfo=timezone.utc), until=datetime(2023, 12, 1, tzinfo=timezone.utc)
+        )
+        assert [item.link for item in november] == links[11:16]
+        assert [item.link for item in recent_articles(session, ticker="AAPL", source="CNBC")] == links[0:18:4]
+        assert {item.link for item in search_articles(session, "fed decision")} == set(links[0:18:3])
+
+    # Running again moves nothing and leaves the partitions intact.
+    assert run_retention(settings, now=NOW, vacuum=False)["rolled"] == {}
+    assert len(list_partitions(database_url)) == 4
+
+
+def test_expired_partitions_are_dropped(tmp_path):
+    database_url = f"sqlite:///{tmp_path / 'news.db'}"
+    links = _seed(database_url)
+    settings = Settings(database_url=database_url, retention_hot_days=10, retention_months=2)
+
+    summary = run_retention(settings, now=NOW, vacuum=False)
+
+    assert summary["dropped"] == ["2023-10"]
+    assert [partition.month for partition in list_partitions(database_url)] == ["2024-01", "2023-12", "2023-11"]
+    assert not list(tmp_path.glob("news-2023-10.db*"))
+    with init_db(database_url) as session:
+        assert [item.link for item in recent_articles(session, limit=100)] == links[:16]
+
+
+def test_rolled_articles_still_in_their_feed_are_not_stored_again(tmp_path):
+    database_url = f"sqlite:///{tmp_path / 'news.db'}"
+    links = _seed(database_url)
+    run_retention(Settings(database_url=database_url, retention_hot_days=10), now=NOW, vacuum=False)
+
+    with init_db(database_url) as session:
+        counts = [row.count for row in sentiment_aggregates(session, resolution="hour")]
+        assert upsert_articles(session, _items()) == []
+        store_duplicates(session, _items()[5:])
+
+        assert [item.link for item in recent_articles(session, limit=100)] == links
+        assert [row.count for row in sentiment_aggregates(session, resolution="hour")] == counts
+        assert session.scalar(select(func.count()).select_from(Article)) == 2
+        assert session.scalar(select(func.count()).select_from(ArticleCluster)) == 2
+
+
+def test_minute_buckets_and_cached_sentiments_follow_the_hot_window(tmp_path):
+    database_url = f"sqlite:///{tmp_path / 'news.db'}"
+    _seed(database_url)
+    settings = Settings(database_url=database_url, retention_hot_days=10)
+    cache = _cache_for(settings)
+    with init_db(database_url) as session:
+        store_cached_sentiments(session, {cache.key(item.title): ("NEGATIVE", 0.8) for item in _items()})
+
+    summary = run_retention(settings, now=NOW, vacuum=False)
+
+    assert summary["pruned"] == {"sentiment_aggregates": 16, "sentiment_cache": 16}
+    with init_db(database_url) as session:
+        assert len(sentiment_aggregates(session, resolution="minute")) == 2
+        assert len(sentiment_aggregates(session, resolution="hour")) == 18
+        kept = set(session.scalars(select(SentimentCacheEntry.key)))
+    assert kept == {cache.key(item.title) for item in _items()[:2]}
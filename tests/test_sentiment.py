@@ -0,0 +1,119 @@
+"""Tests for sentiment annotation and caching."""
+
+from __future__ import annotations
+
+import pytest
+from pydantic import ValidationError
+
+import news_crawler.sentiment as sentiment
+from news_crawler.schemas import NewsItem
+from news_crawler.settings import Settings
+
+
+def _article(title: str, link: str) -> NewsItem:
+    return NewsItem(source="Reuters", title=title, link=link)
+
+
+def test_annotate_sentiment_only_scores_cache_misses(monkeypatch, tmp_path):
+    scored: list[list[str]] = []
+
+    def fake_pipe(titles, **_kwargs):
+        scored.append(list(titles))
+        return [{"label": "POSITIVE", "score": 0.75} for _ in titles]
+
+    monkeypatch.setattr(sentiment, "get_sentiment_pipeline", lambda **_kwargs: fake_pipe)
+    settings = Settings(database_url=f"sqlite:///{tmp_path / 'news.db'}")
+
+    first = sentiment.annotate_sentiment(
+        settings,
+        [_article("Stocks  rally", "https://example.com/1"), _article("stocks rally", "https://example.com/2")],
+    )
+    sentiment.get_sentiment_cache.cache_clear()  # force the database layer to answer
+    second = sentiment.annotate_sentiment(
+        settings,
+        [_article("STOCKS RALLY", "https://example.com/3"), _article("Bonds slide", "https://example.com/4")],
+    )
+
+    assert scored == [["Stocks  rally"], ["Bonds slide"]]
+    assert [article.sentiment_label for article in first + second] == ["POSITIVE"] * 4
+    assert second[0].link == "https://example.com/3"
+
+
+def test_run_batched_sorts_by_length_and_restores_order():
+    batches: list[list[str]] = []
+
+    def fake_pipe(texts, batch_size, truncation, max_length):
+        batches.append(list(texts))
+        assert batch_size == len(texts) and truncation and max_length == 16
+        return [{"label": "LEN", "score": float(len(text))} for text in texts]
+
+    texts = ["a much longer headline", "short", "mid length", "tiny"]
+    results = sentiment.run_batched(fake_pipe, texts, batch_size=2, max_length=16)
+
+    assert batches == [["tiny", "short"], ["mid length", "a much longer headline"]]
+    assert [result["score"] for result in results] == [float(len(text)) for text in texts]
+
+
+def test_load_sentiment_backend_selects_onnx(monkeypatch, tmp_path):
+    calls: list[tuple] = []
+    monkeypatch.setattr(
+        sentiment,
+        "get_onnx_pipeline",
+        lambda model_dir, quantize, num_threads: calls.append((model_dir, quantize, num_threads)) or "onnx",
+    )
+    settings = Settings(
+        sentiment_backend="onnx",
+        sentiment_onnx_path=tmp_path,
+        sentiment_onnx_quantize=True,
+        sentiment_num_threads=2,
+    )
+
+    assert sentiment.load_sentiment_backend(settings) == "onnx"
+    assert calls == [(tmp_path, True, 2)]
+    with pytest.raises(ValidationError):
+        Settings(sentiment_backend="onnx")
+
+
+def test_onnx_cache_is_keyed_by_the_exported_model(tmp_path):
+    def model_id(path, quantize=False):
+        settings = Settings(
+            sentiment_backend="onnx",
+            sentiment_onnx_path=path,
+            sentiment_onnx_quantize=quantize,
+            sentiment_cache_persistent=False,
+        )
+        return sentiment._cache_for(settings).model_name
+
+    assert model_id(tmp_path / "finbert") != model_id(tmp_path / "distilbert")
+    assert model_id(tmp_path / "finbert") != model_id(tmp_path / "finbert", quantize=True)
+    assert model_id(tmp_path / "finbert") == model_id(tmp_path / "other" / ".." / "finbert")
+
+
+def test_onnx_pipeline_feeds_model_inputs_and_maps_softmax_to_labels():
+    np = pytest.importorskip("numpy")
+    fed: list[dict] = []
+
+    class FakeSession:
+        def run(self, _outputs, inputs):
+            fed.append(inputs)
+            return [np.array([[2.0, 0.0], [-1.0, 1.0]])]
+
+    def fake_tokenizer(texts, **kwargs):
+        assert kwargs["padding"] and kwargs["return_tensors"] == "np"
+        ids = np.ones((len(texts), 3), dtype=np.int32)
+        return {"input_ids": ids, "attention_mask": ids, "token_type_ids": ids}
+
+    pipe = sentiment.OnnxSentimentPipeline.__new__(sentiment.OnnxSentimentPipeline)
+    pipe.session = FakeSession()
+    pipe.tokenizer = fake_tokenizer
+    pipe.id2label = {0: "NEGATIVE", 1: "POSITIVE"}
+    pipe._input_names = ["input_ids", "attention_mask"]
+
+    results = pipe(["Stocks slump", "Stocks soar"], max_length=16)
+
+    assert sorted(fed[0]) == ["attention_mask", "input_ids"]
+    assert all(array.dtype == np.int64 for array in fed[0].values())
+    assert [result["label"] for result in results] == ["NEGATIVE", "POSITIVE"]
+    expected = 1 / (1 + np.exp(-2.0))
+    assert results[0]["score"] == pytest.approx(expected)
+    assert results[1]["score"] == pytest.approx(expected)
@@ -0,0 +1,83 @@
+"""Tests for sharded multi-process crawling."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+
+from news_crawler import bench
+from news_crawler.database import Article, claim_links, init_db, upsert_articles
+from news_crawler.metrics import get_metrics
+from news_crawler.pipeline import run_pipeline
+from news_crawler.schemas import FeedConfig, NewsItem
+from news_crawler.settings import Settings
+from news_crawler.sharding import shard_feeds, shard_of
+
+
+def test_shard_feeds_partitions_stably():
+    feeds = [FeedConfig(name=f"F{index}", url=f"https://example.com/{index}.xml") for index in range(20)]
+    shards = [shard_feeds(feeds, 3, index) for index in range(3)]
+
+    assert sorted(feed.url for shard in shards for feed in shard) == sorted(feed.url for feed in feeds)
+    assert all(shard_of(feed.url, 3) == index for index, shard in enumerate(shards) for feed in shard)
+
+
+def test_claim_links_hands_each_link_out_once(tmp_path):
+    session = init_db(f"sqlite:///{tmp_path / 'news.db'}")
+    try:
+        upsert_articles(
+            session,
+            [NewsItem(source="A", title="Stored", link="https://example.com/0", sentiment_label="NEUTRAL", sentiment_score=0.5)],
+        )
+        links = [f"https://example.com/{index}" for index in range(4)]
+        first = claim_links(session, links, "worker-a", ttl_seconds=60)
+        second = claim_links(session, links + ["https://example.com/4"], "worker-b", ttl_seconds=60)
+        expired = claim_links(session, ["https://example.com/5"], "worker-c", ttl_seconds=-1)
+        retaken = claim_links(session, ["https://example.com/5"], "worker-d", ttl_seconds=60)
+    finally:
+        session.close()
+
+    assert first == links[1:]
+    assert second == ["https://example.com/4"]
+    assert expired == retaken == ["https://example.com/5"]
+
+
+def _feed_in_shard(url: str, shard: int) -> FeedConfig:
+    # Ports vary between runs, so pick a (server-ignored) query string landing in ``shard``.
+    candidate = next(f"{url}?v={tag}" for tag in range(100) if shard_of(f"{url}?v={tag}", 2) == shard)
+    return FeedConfig(name=url.rsplit("/", 1)[-1], url=candidate)
+
+
+def test_sharded_run_scores_and_stores_each_article_once(tmp_path):
+    # Feeds overlap: every link appears in two feeds, which land in different shards.
+    entries = bench.synthetic_items(60, duplicate_ratio=0.0)
+    payloads = [bench.synthetic_feed(entries[start : start + 40]) for start in (0, 20)]
+    payloads.append(bench.synthetic_feed(entries[:20] + entries[40:]))
+
+    loop = asyncio.new_event_loop()
+    runner, base_url = loop.run_until_complete(bench._serve(payloads))
+    server = threading.Thread(target=loop.run_forever, daemon=True)
+    server.start()
+    try:
+        feeds = [_feed_in_shard(f"{base_url}/feed/{index}.xml", index % 2) for index in range(3)]
+        settings = Settings(
+            feeds=feeds,
+            shard_workers=2,
+            sentiment_backend="stub",
+            output_path=tmp_path / "latest.json",
+            database_url=f"sqlite:///{tmp_path / 'news.db'}",
+        )
+        records = run_pipeline(settings)
+    finally:
+        asyncio.run_coroutine_threadsafe(runner.cleanup(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        server.join()
+        loop.close()
+
+    assert len(records) == 60
+    assert len({str(record.link) for record in records}) == 60
+    with init_db(settings.database_url) as session:
+        assert session.query(Article).count() == 60
+    stats = get_metrics().summary()
+    assert stats["stages"]["fetch"]["calls"] == 3
+    assert stats["stages"]["sentiment"]["items"] == 60
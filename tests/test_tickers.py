@@ -0,0 +1,77 @@
+"""Tests for ticker tagging."""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime, timezone
+
+from news_crawler.database import init_db, upsert_articles
+from news_crawler.query import recent_articles
+from news_crawler.schemas import NewsItem
+from news_crawler.settings import Settings
+from news_crawler.tickers import TickerMatcher, build_matcher, tag_tickers
+
+
+def _write_universe(path):
+    path.write_text(
+        json.dumps(
+            [
+                {"symbol": "AAPL", "aliases": ["Apple", "Apple Inc"]},
+                {"symbol": "MSFT", "aliases": ["Microsoft"]},
+                {"symbol": "META", "aliases": ["Meta Platforms", "Facebook"]},
+                {"symbol": "F", "aliases": ["Ford Motor"]},
+            ]
+        ),
+        encoding="utf-8",
+    )
+    return path
+
+
+def test_matcher_respects_word_boundaries_and_overlaps():
+    matcher = TickerMatcher({"apple": {"AAPL"}, "apple inc": {"AAPL"}, "pineapple": {"PINE"}, "$msft": {"MSFT"}})
+
+    assert matcher.match("Apple Inc. beats; $MSFT slips") == ["AAPL", "MSFT"]
+    assert matcher.match("Pineapple prices soar") == ["PINE"]
+    assert matcher.match("Applesauce makers rally") == []
+    assert matcher.match("$MSFTX is not Microsoft") == []
+
+
+def test_build_matcher_caches_the_compiled_automaton(tmp_path):
+    universe = _write_universe(tmp_path / "tickers.json")
+    cache_dir = tmp_path / "cache"
+
+    built = build_matcher(universe, cache_dir)
+    cached_files = list(cache_dir.glob("tickers-*.pickle"))
+    loaded = build_matcher(universe, cache_dir)
+
+    assert len(cached_files) == 1
+    assert loaded is not built
+    assert loaded.match("Meta Platforms and Ford Motor report") == ["META", "F"]
+
+
+def test_tagged_articles_are_queryable_by_ticker(tmp_path):
+    settings = Settings(tickers_file=_write_universe(tmp_path / "tickers.json"), tickers_cache_dir=None)
+    articles = tag_tickers(
+        settings,
+        [
+            NewsItem(source="Reuters", title="Apple and Microsoft lead gains", link="https://example.com/1"),
+            NewsItem(source="CNBC", title="Facebook owner faces probe", link="https://example.com/2", summary="$AAPL flat"),
+            NewsItem(source="CNBC", title="Oil slips", link="https://example.com/3"),
+        ],
+    )
+    assert [article.tickers for article in articles] == [["AAPL", "MSFT"], ["META", "AAPL"], []]
+
+    for hour, article in enumerate(articles):
+        article.sentiment_label, article.sentiment_score = "NEUTRAL", 0.5
+        article.published_at = datetime(2024, 1, 1, hour, tzinfo=timezone.utc)
+    session = init_db(f"sqlite:///{tmp_path / 'news.db'}")
+    try:
+        upsert_articles(session, articles)
+
+        assert [item.link for item in recent_articles(session, ticker="aapl")] == [
+            "https://example.com/2",
+            "https://example.com/1",
+        ]
+        assert [item.link for item in recent_articles(session, ticker="MSFT")] == ["https://example.com/1"]
+    finally:
+        session.close()